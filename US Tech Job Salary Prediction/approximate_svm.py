@@ -0,0 +1,96 @@
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin, ClassifierMixin
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.kernel_approximation import Nystroem
+from sklearn.svm import LinearSVR, LinearSVC
+
+
+class _ApproximateSVMBase(BaseEstimator):
+    """Linear SVM on a Nyström approximation of the RBF kernel, or on the raw features
+
+    Training cost grows linearly with the rows instead of quadratically, and
+    prediction no longer depends on the number of support vectors. C, kernel and
+    gamma mean the same as for SVR/SVC, so the same search spaces apply.
+    """
+
+    def _gamma(self, X):
+        if self.gamma == 'scale':
+            # Same rule as SVR/SVC(gamma='scale')
+            variance = X.var()
+            return 1.0 / (X.shape[1] * variance) if variance > 0 else 1.0
+        return self.gamma
+
+    def _fit_features(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        self.n_features_in_ = X.shape[1]
+        if self.kernel == 'linear':
+            self.feature_map_ = None
+            return X
+        if self.kernel != 'rbf':
+            raise ValueError(f"Unsupported kernel '{self.kernel}'; use 'rbf' or 'linear'")
+        n_components = min(self.n_components, len(X))
+        self.feature_map_ = Nystroem(gamma=self._gamma(X), n_components=n_components,
+                                     random_state=self.random_state).fit(X)
+        return self.feature_map_.transform(X)
+
+    def _features(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        return X if self.feature_map_ is None else self.feature_map_.transform(X)
+
+
+class ApproximateSVR(RegressorMixin, _ApproximateSVMBase):
+    """Near-linear-time stand-in for SVR"""
+
+    def __init__(self, kernel='rbf', C=1.0, gamma='scale', epsilon=0.0, n_components=100,
+                 max_iter=2000, random_state=42):
+        self.kernel = kernel
+        self.C = C
+        self.gamma = gamma
+        self.epsilon = epsilon
+        self.n_components = n_components
+        self.max_iter = max_iter
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        Z = self._fit_features(X)
+        y = np.asarray(y, dtype=np.float64)
+        # Salaries are fitted in standard units; the solver converges poorly on raw dollars
+        self.y_mean_, self.y_scale_ = y.mean(), y.std() or 1.0
+        self.svr_ = LinearSVR(C=self.C, epsilon=self.epsilon, loss='squared_epsilon_insensitive', dual=False,
+                              max_iter=self.max_iter, random_state=self.random_state)
+        self.svr_.fit(Z, (y - self.y_mean_) / self.y_scale_)
+        return self
+
+    def predict(self, X):
+        return self.svr_.predict(self._features(X)) * self.y_scale_ + self.y_mean_
+
+
+class ApproximateSVC(ClassifierMixin, _ApproximateSVMBase):
+    """Near-linear-time stand-in for SVC(probability=True)
+
+    Probabilities come from sigmoid calibration over calibration_folds folds
+    of the linear SVM, instead of SVC's internal 5-fold Platt scaling.
+    """
+
+    def __init__(self, kernel='rbf', C=1.0, gamma='scale', n_components=100, calibration_folds=3,
+                 max_iter=2000, random_state=42):
+        self.kernel = kernel
+        self.C = C
+        self.gamma = gamma
+        self.n_components = n_components
+        self.calibration_folds = calibration_folds
+        self.max_iter = max_iter
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        Z = self._fit_features(X)
+        svc = LinearSVC(C=self.C, dual=False, max_iter=self.max_iter, random_state=self.random_state)
+        self.calibrated_ = CalibratedClassifierCV(svc, method='sigmoid', cv=self.calibration_folds).fit(Z, np.asarray(y))
+        self.classes_ = self.calibrated_.classes_
+        return self
+
+    def predict_proba(self, X):
+        return self.calibrated_.predict_proba(self._features(X))
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
@@ -0,0 +1,374 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.neighbors import KNeighborsRegressor, KNeighborsClassifier
+from feature_encoding import native_categorical_mask, native_categorical_model, NATIVE_CATEGORICAL_LIMIT
+from neighbor_index import IVFNeighborsRegressor, IVFNeighborsClassifier
+from salary_predictor import SalaryPredictor, INPUT_COLS, FEATURE_COLS, LABEL_ENCODED_COLS, needs_scaling
+
+# 1000x (about 3.7M rows, a multi-GB temporary CSV) is opt-in through --scales
+DEFAULT_SCALES = '1,10,100'
+
+# Tree models compared across feature encodings
+ENCODING_MODELS = ['Random Forest', 'Extra Trees', 'Gradient Boosting',
+                   'Random Forest Classifier', 'Extra Trees Classifier']
+# Labels seen fewer times than this are bucketed in the bucketed encodings
+ENCODING_MIN_COUNT = 5
+
+def make_synthetic_dataset(source_path, scale, output_path, seed=42):
+    """Write a dataset with scale x the rows of source_path, resampled with salary noise"""
+    source = pd.read_csv(source_path)
+    if scale == 1:
+        data = source
+    else:
+        rng = np.random.default_rng(seed)
+        data = source.iloc[rng.integers(0, len(source), size=len(source) * scale)].reset_index(drop=True)
+        noise = rng.lognormal(mean=0.0, sigma=0.05, size=len(data))
+        data['salary_in_usd'] = (data['salary_in_usd'] * noise).round().astype('int64')
+    data.to_csv(output_path, index=False)
+    return len(data)
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the predictor's progress printing while timing"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+def timed(func, *args, repeat=1, **kwargs):
+    """Run func repeat times and return (best wall-clock seconds, last result)"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with quiet():
+            result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def peak_memory_mb(func, *args, **kwargs):
+    """Run func once under tracemalloc and return its peak allocation in MB"""
+    tracemalloc.start()
+    try:
+        with quiet():
+            func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+def record(section, name, scale, rows, seconds, **extra):
+    entry = {'section': section, 'name': name, 'scale': scale, 'rows': rows, 'seconds': round(seconds, 6)}
+    entry.update(extra)
+    memory = f" {extra['peak_mb']:>9.1f} MB peak" if 'peak_mb' in extra else ''
+    if 'recall' in extra:
+        memory = f"  recall {extra['recall']:.3f}, score loss {extra['score_loss']:+.4f}, {extra['speedup']:.1f}x"
+    print(f"  {section:<10} {name:<34} x{scale:<5} {seconds:>10.4f}s{memory}")
+    return entry
+
+def _import_profile(module):
+    """Parse `python -X importtime -c 'import module'` into {module: cumulative seconds}"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    profile = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative, name = line.split('|')
+            if cumulative.strip().isdigit():
+                profile[name.strip()] = int(cumulative) / 1e6
+    return profile
+
+def bench_startup(repeat=3):
+    """Measure cold import time and how long the CLI takes to show its menu"""
+    results = []
+    for module in ('salary_predictor', 'salary_runtime'):
+        profile = min((_import_profile(module) for _ in range(repeat)), key=lambda p: p.get(module, float('inf')))
+        heaviest = sorted(((name, t) for name, t in profile.items() if name != module), key=lambda x: -x[1])[:5]
+        results.append(record('startup', f'import {module}', 1, 0, profile.get(module, 0.0),
+                              heaviest={name: round(t * 1000, 1) for name, t in heaviest}))
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'salary_predictor.py')
+    best = float('inf')
+    for _ in range(repeat):
+        # Choosing 0 at the menu exits right away
+        start = time.perf_counter()
+        subprocess.run([sys.executable, script], input='0\n', capture_output=True, text=True,
+                       cwd=os.path.dirname(script))
+        best = min(best, time.perf_counter() - start)
+    results.append(record('startup', 'time_to_menu', 1, 0, best))
+    return results
+
+def bench_pipeline(predictor, scale, repeat):
+    """Time the data stages of the pipeline on one dataset and measure their peak memory"""
+    results = []
+    stages = [predictor.load_and_explore_data, predictor.create_salary_classification, predictor.preprocess_data]
+    for stage in stages:
+        # Timed runs first; tracing allocations slows the stage down
+        seconds, _ = timed(stage, repeat=repeat)
+        peak_mb = peak_memory_mb(stage)
+        results.append(record('pipeline', stage.__name__, scale, len(predictor.data), seconds,
+                              peak_mb=round(peak_mb, 2)))
+    return results
+
+def bench_cube(predictor, scale, repeat):
+    """Time building the aggregate cube, then the summary and a roll-up answered from it"""
+    results = []
+    predictor.cube = None
+    with quiet():
+        start = time.perf_counter()
+        cube = predictor.load_cube()
+        build_seconds = time.perf_counter() - start
+    results.append(record('cube', 'build_cube', scale, len(predictor.data), build_seconds, cells=len(cube.cells)))
+    seconds, _ = timed(predictor.print_comprehensive_summary, repeat=repeat)
+    results.append(record('cube', 'summary_from_cube', scale, len(predictor.data), seconds))
+    seconds, _ = timed(cube.crosstab, 'job_title', repeat=repeat)
+    results.append(record('cube', 'crosstab_job_title', scale, len(predictor.data), seconds))
+    return results
+
+def _model_inputs(predictor, name):
+    if needs_scaling(name):
+        return predictor.X_train_scaled, predictor.X_test_scaled
+    return predictor.X_train, predictor.X_test
+
+def bench_models(predictor, scale, model_names=None):
+    """Time fit and predict of every model in the zoo"""
+    results = []
+    with quiet():
+        predictor.define_models()
+    zoos = [('regression', predictor.regression_models, predictor.y_train, predictor.y_test),
+            ('classification', predictor.classification_models, predictor.y_train_class, predictor.y_test_class)]
+    rows = len(predictor.X_train)
+    for task, models, y_train, y_test in zoos:
+        for name, model in models.items():
+            if model_names and name not in model_names:
+                continue
+            X_train, X_test = _model_inputs(predictor, name)
+            fit_seconds, _ = timed(model.fit, X_train, y_train)
+            predict_seconds, y_pred = timed(model.predict, X_test)
+            if task == 'regression':
+                score = float(1 - ((y_test - y_pred) ** 2).sum() / ((y_test - y_test.mean()) ** 2).sum())
+            else:
+                score = float((y_pred == y_test).mean())
+            results.append(record('fit', name, scale, rows, fit_seconds, task=task, score=round(score, 4)))
+            results.append(record('predict', name, scale, len(X_test), predict_seconds, task=task))
+            # Let the last fitted model of each track serve the prediction benchmarks
+            if task == 'regression':
+                predictor.best_regression_model, predictor.best_regression_name = model, name
+            else:
+                predictor.best_classification_model, predictor.best_classification_name = model, name
+    return results
+
+def _mean_depth(model):
+    estimators = getattr(model, 'estimators_', None)
+    if estimators is None:
+        return None
+    trees = np.ravel(estimators)
+    return round(float(np.mean([tree.get_depth() for tree in trees])), 2)
+
+def bench_encodings(path, scale):
+    """Compare label codes, bucketing, out-of-fold target encoding and native categorical HistGradientBoosting"""
+    results = []
+    configs = [
+        ('label', {}),
+        ('label+bucketed', {'min_category_count': ENCODING_MIN_COUNT}),
+        ('target+bucketed', {'encoding': 'target', 'min_category_count': ENCODING_MIN_COUNT}),
+        ('native+bucketed', {'min_category_count': ENCODING_MIN_COUNT,
+                             'max_categories': NATIVE_CATEGORICAL_LIMIT})
+    ]
+    for config, options in configs:
+        predictor = SalaryPredictor(data_path=path, tuned_params_path=None, **options)
+        with quiet():
+            predictor.load_and_explore_data()
+            predictor.create_salary_classification()
+        encode_seconds, _ = timed(predictor.preprocess_data)
+        rows = len(predictor.X_train)
+        if config.startswith('native'):
+            # Label codes stay as they are; the model splits them as unordered sets
+            mask = native_categorical_mask(FEATURE_COLS, LABEL_ENCODED_COLS)
+            models = [('regression', 'HistGradientBoosting', native_categorical_model('regression', mask)),
+                      ('classification', 'HistGradientBoosting Classifier',
+                       native_categorical_model('classification', mask))]
+        else:
+            with quiet():
+                predictor.define_models()
+            zoo = {**predictor.regression_models, **predictor.classification_models}
+            models = [('regression' if name in predictor.regression_models else 'classification', name, zoo[name])
+                      for name in ENCODING_MODELS]
+            models += [('regression', 'HistGradientBoosting', native_categorical_model('regression', None)),
+                       ('classification', 'HistGradientBoosting Classifier',
+                        native_categorical_model('classification', None))]
+        for task, name, model in models:
+            y_train, y_test = (predictor.y_train, predictor.y_test) if task == 'regression' else \
+                (predictor.y_train_class, predictor.y_test_class)
+            fit_seconds, _ = timed(model.fit, predictor.X_train, y_train)
+            predict_seconds, _ = timed(model.predict, predictor.X_test)
+            results.append(record('encoding', f'{config} {name}', scale, rows, fit_seconds, task=task,
+                                  score=round(float(model.score(predictor.X_test, y_test)), 4),
+                                  predict_seconds=round(predict_seconds, 6), depth=_mean_depth(model),
+                                  encode_seconds=round(encode_seconds, 6)))
+    return results
+
+def bench_neighbors(predictor, scale, probes, n_neighbors=5):
+    """Compare exact K-Neighbors models with the IVF index: prediction time, score and recall"""
+    results = []
+    X_train, X_test = predictor.X_train_scaled, predictor.X_test_scaled
+    tracks = [('regression', KNeighborsRegressor, IVFNeighborsRegressor, predictor.y_train, predictor.y_test),
+              ('classification', KNeighborsClassifier, IVFNeighborsClassifier,
+               predictor.y_train_class, predictor.y_test_class)]
+    for task, exact_type, ivf_type, y_train, y_test in tracks:
+        exact = exact_type(n_neighbors=n_neighbors).fit(X_train, y_train)
+        exact_seconds, _ = timed(exact.predict, X_test)
+        exact_score = float(exact.score(X_test, y_test))
+        # Distance to the true k-th neighbour; duplicate rows make index-based recall meaningless
+        kth_distance = exact.kneighbors(X_test)[0][:, -1]
+        results.append(record('neighbors', f'{task} exact', scale, len(X_test), exact_seconds,
+                              task=task, score=round(exact_score, 4)))
+        for n_probe in probes:
+            ivf = ivf_type(n_neighbors=n_neighbors, n_probe=n_probe)
+            build_seconds, _ = timed(ivf.fit, X_train, y_train)
+            seconds, _ = timed(ivf.predict, X_test)
+            # Exact float64 distances of the returned rows, so float32 rounding doesn't count as a miss
+            indices = ivf.kneighbors(X_test)[1]
+            distances = np.sqrt(((X_test[:, None, :].astype(np.float64) - X_train[indices]) ** 2).sum(axis=2))
+            recall = float((distances <= kth_distance[:, None] + 1e-9).mean())
+            results.append(record('neighbors', f'{task} IVF n_probe={n_probe}', scale, len(X_test), seconds,
+                                  task=task, score=round(float(ivf.score(X_test, y_test)), 4),
+                                  score_loss=round(exact_score - float(ivf.score(X_test, y_test)), 4),
+                                  recall=round(recall, 4), speedup=round(exact_seconds / seconds, 2),
+                                  build_seconds=round(build_seconds, 4)))
+    return results
+
+def bench_prediction(predictor, scale, single_rows=200):
+    """Compare single-row prediction calls against one predict_batch call"""
+    results = []
+    models = f"{predictor.best_regression_name} + {predictor.best_classification_name}"
+    profiles = predictor.data[INPUT_COLS].iloc[:single_rows]
+    records = profiles.to_dict('records')
+
+    def single():
+        for profile in records:
+            predictor.predict_salary_and_classification(**profile)
+    seconds, _ = timed(single)
+    results.append(record('inference', 'single_row', scale, len(records), seconds,
+                          per_row_ms=round(seconds / len(records) * 1000, 4), models=models))
+
+    seconds, _ = timed(predictor.predict_batch, profiles)
+    results.append(record('inference', 'batch_same_rows', scale, len(records), seconds,
+                          per_row_ms=round(seconds / len(records) * 1000, 4), models=models))
+
+    seconds, _ = timed(predictor.predict_batch, predictor.data[INPUT_COLS])
+    results.append(record('inference', 'batch_full_dataset', scale, len(predictor.data), seconds,
+                          per_row_ms=round(seconds / len(predictor.data) * 1000, 6), models=models))
+    return results
+
+def environment():
+    """Describe where the benchmark ran so results can be compared across commits"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'commit': commit or 'unknown',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__
+    }
+
+def compare(current, baseline_path, threshold):
+    """Print per-benchmark ratios against a previous run; return the regressions"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    # Inference timings are only comparable when the same models were used
+    previous = {(r['section'], r['name'], r['scale'], r.get('models')): r['seconds'] for r in baseline['results']}
+
+    print(f"\n📊 Compared with {baseline_path} (commit {baseline['environment'].get('commit')})")
+    regressions = []
+    for r in current['results']:
+        key = (r['section'], r['name'], r['scale'], r.get('models'))
+        if key not in previous or previous[key] <= 0:
+            continue
+        ratio = r['seconds'] / previous[key]
+        flag = '🔴' if ratio > threshold else ('🟢' if ratio < 1 / threshold else '  ')
+        print(f"{flag} {r['section']:<10} {r['name']:<34} x{r['scale']:<5} {previous[key]:>9.4f}s -> {r['seconds']:>9.4f}s ({ratio:.2f}x)")
+        if ratio > threshold:
+            regressions.append(r)
+    return regressions
+
+def main():
+    """Run the benchmark suite on synthetic datasets and write JSON results"""
+    parser = argparse.ArgumentParser(description='Salary pipeline benchmark suite')
+    parser.add_argument('--data', default='ds_salaries.csv', help='source dataset to scale up')
+    parser.add_argument('--scales', default=DEFAULT_SCALES, help='dataset multipliers for the pipeline stages')
+    parser.add_argument('--fit-scales', default='1', help='multipliers at which every model is fitted')
+    parser.add_argument('--neighbor-scales', default='1,10',
+                        help='multipliers at which exact K-Neighbors is compared with the IVF index')
+    parser.add_argument('--encoding-scales', default='1',
+                        help='multipliers at which the feature encodings are compared')
+    parser.add_argument('--probes', default='1,2,4,8,16', help='IVF n_probe settings to benchmark')
+    parser.add_argument('--models', help='comma-separated model names to fit (default: all)')
+    parser.add_argument('--kernel-approximation', default='',
+                        help="SVM models to fit as kernel approximations: comma-separated names or 'all'")
+    parser.add_argument('--repeat', type=int, default=1, help='repetitions per pipeline stage (best is kept)')
+    parser.add_argument('--output', help='result file (default: benchmarks/<timestamp>-<commit>.json)')
+    parser.add_argument('--compare', help='previous result file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2, help='slowdown ratio reported as a regression')
+    args = parser.parse_args()
+
+    fit_scales = {int(s) for s in args.fit_scales.split(',')}
+    neighbor_scales = {int(s) for s in args.neighbor_scales.split(',')} if args.neighbor_scales else set()
+    encoding_scales = {int(s) for s in args.encoding_scales.split(',')} if args.encoding_scales else set()
+    scales = sorted({int(s) for s in args.scales.split(',')} | fit_scales | neighbor_scales | encoding_scales)
+    probes = [int(p) for p in args.probes.split(',')]
+    model_names = [m.strip() for m in args.models.split(',')] if args.models else None
+    approximated = 'all' if args.kernel_approximation == 'all' else \
+        [m.strip() for m in args.kernel_approximation.split(',') if m.strip()]
+    current = {'environment': environment(), 'results': []}
+
+    print("\n⏱️  Startup")
+    current['results'] += bench_startup()
+
+    with tempfile.TemporaryDirectory(prefix='salary_bench_') as workdir:
+        for scale in scales:
+            path = os.path.join(workdir, f'salaries_x{scale}.csv')
+            rows = make_synthetic_dataset(args.data, scale, path)
+            print(f"\n⏱️  Scale x{scale} ({rows:,} rows)")
+            predictor = SalaryPredictor(data_path=path, tuned_params_path=None, kernel_approximation=approximated)
+            current['results'] += bench_pipeline(predictor, scale, args.repeat)
+            current['results'] += bench_cube(predictor, scale, args.repeat)
+            if scale in fit_scales:
+                current['results'] += bench_models(predictor, scale, model_names)
+                if predictor.best_regression_model is not None and predictor.best_classification_model is not None:
+                    current['results'] += bench_prediction(predictor, scale)
+            if scale in neighbor_scales:
+                current['results'] += bench_neighbors(predictor, scale, probes)
+            if scale in encoding_scales:
+                current['results'] += bench_encodings(path, scale)
+
+    output = args.output or os.path.join(
+        'benchmarks', f"{time.strftime('%Y%m%d-%H%M%S')}-{current['environment']['commit']}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(current, f, indent=2)
+    print(f"\n✅ Wrote benchmark results to '{output}'")
+
+    if args.compare:
+        regressions = compare(current, args.compare, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} benchmark(s) slower than {args.threshold:.2f}x the baseline")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
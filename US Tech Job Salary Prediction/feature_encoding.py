@@ -0,0 +1,66 @@
+import numpy as np
+from lazy_imports import LazyModule
+
+pd = LazyModule('pandas')
+
+# Encodings of the high-cardinality columns: 'label' codes or out-of-fold 'target' means
+ENCODINGS = ('label', 'target')
+
+# Label that rare categories are bucketed into
+OTHER_CATEGORY = 'Other'
+
+# HistGradientBoosting treats a categorical feature natively only up to max_bins - 1 categories
+NATIVE_CATEGORICAL_LIMIT = 254
+
+
+def bucket_rare_labels(values, min_count=1, max_categories=None):
+    """Replace labels seen fewer than min_count times, or beyond the max_categories most frequent, with OTHER_CATEGORY
+
+    Returns (object array of bucketed labels, number of distinct labels bucketed).
+    When anything is bucketed, OTHER_CATEGORY counts towards max_categories.
+    """
+    values = pd.Series(np.asarray(values, dtype=object))
+    counts = values.value_counts()
+    kept = counts[counts >= min_count]
+    needs_other = len(kept) < len(counts)
+    if max_categories is not None and len(kept) + needs_other > max_categories:
+        kept = kept.head(max_categories - 1)
+    keep = values.isin(kept.index).to_numpy()
+    return np.where(keep, values.to_numpy(), OTHER_CATEGORY), len(counts) - len(kept)
+
+def default_position(classes):
+    """Position unseen labels fall back to: the OTHER_CATEGORY bucket if there is one, else -1"""
+    matches = np.flatnonzero(np.asarray(classes) == OTHER_CATEGORY)
+    return int(matches[0]) if len(matches) else -1
+
+
+def fit_target_encoder(codes, y, cv=5, random_state=42):
+    """Fit a smoothed target encoder on label-code columns of the training rows
+
+    Returns (encoder, out-of-fold encodings of the same rows): every training row is
+    encoded by a model that did not see it, so its own salary cannot leak into the feature.
+    """
+    from sklearn.preprocessing import TargetEncoder
+    encoder = TargetEncoder(categories='auto', target_type='continuous', smooth='auto', cv=cv,
+                            shuffle=True, random_state=random_state)
+    encoded = encoder.fit_transform(codes, y)
+    return encoder, encoded
+
+def target_values(encoder, j, n_classes):
+    """Encoded value of every label code 0..n_classes-1 of column j; codes absent from training get the global mean"""
+    values = np.full(n_classes, encoder.target_mean_, dtype=np.float64)
+    categories = np.asarray(encoder.categories_[j], dtype=np.int64)
+    values[categories] = encoder.encodings_[j]
+    return values
+
+
+def native_categorical_mask(feature_cols, categorical_cols):
+    """Boolean mask over feature_cols marking the label-encoded columns for native categorical splits"""
+    return np.array([col.removesuffix('_encoded') in categorical_cols for col in feature_cols])
+
+def native_categorical_model(task, categorical_features, **params):
+    """HistGradientBoosting that splits the label-encoded columns as unordered categories"""
+    from sklearn.ensemble import HistGradientBoostingRegressor, HistGradientBoostingClassifier
+    estimator = HistGradientBoostingRegressor if task == 'regression' else HistGradientBoostingClassifier
+    params.setdefault('random_state', 42)
+    return estimator(categorical_features=categorical_features, **params)
@@ -0,0 +1,240 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+import numpy as np
+import joblib
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.model_selection import ParameterSampler, cross_val_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from salary_predictor import SalaryPredictor, needs_scaling
+
+# Search spaces per model name, as used in SalaryPredictor.define_models
+TREE_SPACE = {
+    'max_depth': [6, 10, 16, 24, None],
+    'min_samples_leaf': [1, 2, 5, 10],
+    'max_features': [1.0, 0.5, 'sqrt']
+}
+FOREST_SPACE = dict(TREE_SPACE, n_estimators=[50, 100, 200, 400])
+KNN_SPACE = {'n_neighbors': [3, 5, 10, 15, 25, 50], 'weights': ['uniform', 'distance']}
+IVF_SPACE = dict(KNN_SPACE, n_probe=[2, 4, 8, 16])
+HIST_SPACE = {
+    'learning_rate': [0.03, 0.05, 0.1, 0.2],
+    'max_leaf_nodes': [15, 31, 63],
+    'min_samples_leaf': [5, 20, 50],
+    'l2_regularization': [0.0, 0.1, 1.0]
+}
+
+SEARCH_SPACES = {
+    'regression': {
+        'Ridge Regression': {'alpha': [0.01, 0.1, 1.0, 10.0, 100.0]},
+        'Lasso Regression': {'alpha': [0.01, 0.1, 1.0, 10.0, 100.0]},
+        'Elastic Net': {'alpha': [0.001, 0.01, 0.1, 1.0], 'l1_ratio': [0.1, 0.5, 0.9]},
+        'Decision Tree': TREE_SPACE,
+        'Random Forest': FOREST_SPACE,
+        'Extra Trees': FOREST_SPACE,
+        'Gradient Boosting': {
+            'n_estimators': [100, 200, 400],
+            'learning_rate': [0.03, 0.05, 0.1, 0.2],
+            'max_depth': [2, 3, 4, 5],
+            'subsample': [0.7, 0.85, 1.0]
+        },
+        'Hist Gradient Boosting': HIST_SPACE,
+        'K-Neighbors': KNN_SPACE,
+        'K-Neighbors (IVF)': IVF_SPACE,
+        'SVR (RBF)': {'C': [100, 1000, 10000, 100000], 'gamma': ['scale', 0.01, 0.1]},
+        'SVR (Linear)': {'C': [100, 1000, 10000]}
+    },
+    'classification': {
+        'Logistic Regression': {'C': [0.01, 0.1, 1.0, 10.0]},
+        'Decision Tree Classifier': TREE_SPACE,
+        'Random Forest Classifier': FOREST_SPACE,
+        'Extra Trees Classifier': FOREST_SPACE,
+        'Hist Gradient Boosting Classifier': HIST_SPACE,
+        'K-Neighbors Classifier': KNN_SPACE,
+        'K-Neighbors Classifier (IVF)': IVF_SPACE,
+        'SVC (RBF)': {'C': [0.1, 1, 10, 100], 'gamma': ['scale', 0.01, 0.1]},
+        'SVC (Linear)': {'C': [0.1, 1, 10, 100]}
+    }
+}
+
+SCORING = {'regression': 'r2', 'classification': 'accuracy'}
+
+
+class TrialCache:
+    """Append-only JSON-lines cache of (model, params, data hash, row subsample, budget) -> score"""
+
+    def __init__(self, path='search_cache.jsonl'):
+        self.path = path
+        self.scores = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # tolerate a truncated last line
+                    self.scores[record['key']] = record['score']
+
+    @staticmethod
+    def make_key(estimator, params, data_hash, n_resources, cv, rows_hash, random_state):
+        # The subsample's rows and their order decide the CV folds, so the same budget
+        # drawn with another random_state is a different trial
+        trial = {
+            'estimator': type(estimator).__name__,
+            'params': clone(estimator).set_params(**params).get_params(deep=False),
+            'data': data_hash,
+            'n_resources': n_resources,
+            'cv': cv,
+            'rows': rows_hash,
+            'random_state': random_state
+        }
+        return hashlib.sha256(json.dumps(trial, sort_keys=True, default=repr).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        return self.scores.get(key)
+
+    def add(self, key, name, params, n_resources, score):
+        self.scores[key] = score
+        with open(self.path, 'a') as f:
+            f.write(json.dumps({'key': key, 'model': name, 'params': params,
+                                'n_resources': n_resources, 'score': score}, default=repr) + '\n')
+
+
+def _evaluate_trial(task, name, estimator, params, X, y, cv):
+    """Cross-validate one parameter setting on a row subsample"""
+    model = clone(estimator).set_params(**params)
+    if needs_scaling(name):
+        model = make_pipeline(StandardScaler(), model)
+    return float(np.mean(cross_val_score(model, X, y, cv=cv, scoring=SCORING[task])))
+
+
+def search_hyperparameters(predictor, model_names=None, n_candidates=16, factor=3, min_resources=200,
+                           cv=3, n_jobs=-1, cache_path='search_cache.jsonl', random_state=42):
+    """Successive-halving random search over SEARCH_SPACES for the predictor's model zoo
+
+    Every model starts with n_candidates sampled settings (plus its current one) on a
+    small row subsample; after each round the best 1/factor survive and get factor
+    times more rows, until the survivors are scored on the full training set. The
+    current setting always survives, as the baseline the winner is compared with.
+    Trials already in the cache are not recomputed. Returns {task: {name: params}}.
+    """
+    X = np.asarray(predictor.X_train)
+    targets = {'regression': np.asarray(predictor.y_train),
+               'classification': np.asarray(predictor.y_train_class)}
+    zoos = {'regression': predictor.regression_models,
+            'classification': predictor.classification_models}
+    data_hash = joblib.hash((X, targets['regression'], targets['classification']))
+    cache = TrialCache(cache_path)
+    order = np.random.RandomState(random_state).permutation(len(X))
+
+    # Candidate settings per (task, model); {} is the model's current configuration
+    candidates = {}
+    for task, spaces in SEARCH_SPACES.items():
+        for name, space in spaces.items():
+            if name not in zoos[task] or (model_names and name not in model_names):
+                continue
+            sampled = list(ParameterSampler(space, n_iter=n_candidates, random_state=random_state))
+            unique = [{}] + [dict(p) for p in {json.dumps(p, sort_keys=True): p for p in sampled}.values()]
+            candidates[(task, name)] = unique
+
+    n_rounds = max(1, math.ceil(math.log(max(len(c) for c in candidates.values()), factor))) if candidates else 0
+    best = {'regression': {}, 'classification': {}}
+    stats = {'trials': 0, 'cached': 0}
+    start = time.perf_counter()
+
+    for round_index in range(n_rounds):
+        n_resources = len(X) if round_index == n_rounds - 1 else \
+            max(min_resources, len(X) // factor ** (n_rounds - 1 - round_index))
+        n_resources = min(n_resources, len(X))
+        rows = order[:n_resources]
+        rows_hash = joblib.hash(rows)
+
+        pending, scores = [], {}
+        for (task, name), settings in candidates.items():
+            for i, params in enumerate(settings):
+                key = TrialCache.make_key(zoos[task][name], params, data_hash, n_resources, cv, rows_hash,
+                                          random_state)
+                cached = cache.get(key)
+                if cached is not None:
+                    scores[(task, name, i)] = cached
+                    stats['cached'] += 1
+                else:
+                    pending.append((task, name, i, params, key))
+
+        print(f"Round {round_index + 1}/{n_rounds}: {n_resources} rows, "
+              f"{len(pending)} new trials, {len(scores)} from cache")
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_evaluate_trial)(task, name, zoos[task][name], params, X[rows], targets[task][rows], cv)
+            for task, name, i, params, key in pending
+        )
+        for (task, name, i, params, key), score in zip(pending, results):
+            cache.add(key, name, params, n_resources, score)
+            scores[(task, name, i)] = score
+        stats['trials'] += len(pending)
+
+        # Keep the top 1/factor of each model's candidates for the next round, plus the current
+        # configuration so that the final round scores it as the baseline on the same rows
+        for (task, name), settings in candidates.items():
+            ranked = sorted(range(len(settings)), key=lambda i: scores[(task, name, i)], reverse=True)
+            default = settings.index({})
+            if round_index == n_rounds - 1:
+                best[task][name] = {'params': settings[ranked[0]], 'score': scores[(task, name, ranked[0])],
+                                    'baseline': scores[(task, name, default)]}
+            else:
+                keep = ranked[:max(1, math.ceil(len(settings) / factor))]
+                if default not in keep:
+                    keep.append(default)
+                candidates[(task, name)] = [settings[i] for i in keep]
+
+    print(f"\nSearch finished in {time.perf_counter() - start:.1f}s "
+          f"({stats['trials']} trials run, {stats['cached']} reused from cache)")
+    return best
+
+
+def save_best_params(best, path='best_params.json'):
+    """Write the winning settings in the format SalaryPredictor.define_models reads"""
+    payload = {task: {name: entry['params'] for name, entry in models.items()}
+               for task, models in best.items()}
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+    return path
+
+
+def main():
+    """Tune the salary model zoo and feed the winners back into define_models"""
+    parser = argparse.ArgumentParser(description='Successive-halving hyperparameter search')
+    parser.add_argument('--models', help='comma-separated model names (default: all with a search space)')
+    parser.add_argument('--n-candidates', type=int, default=16)
+    parser.add_argument('--factor', type=int, default=3)
+    parser.add_argument('--cv', type=int, default=3)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--cache', default='search_cache.jsonl')
+    parser.add_argument('--output', default='best_params.json')
+    args = parser.parse_args()
+
+    # Search from the untuned defaults so the spaces are explored from a fixed starting point
+    predictor = SalaryPredictor(tuned_params_path=None)
+    predictor.load_and_explore_data()
+    predictor.create_salary_classification()
+    predictor.preprocess_data()
+    predictor.define_models()
+
+    model_names = [m.strip() for m in args.models.split(',')] if args.models else None
+    best = search_hyperparameters(predictor, model_names, args.n_candidates, args.factor,
+                                  cv=args.cv, n_jobs=args.n_jobs, cache_path=args.cache)
+
+    for task, metric in (('regression', 'R²'), ('classification', 'Accuracy')):
+        print(f"\n{'Model':<28} {'Tuned ' + metric:>14} {'Default':>9}  Params")
+        for name, entry in best[task].items():
+            print(f"{name:<28} {entry['score']:>14.3f} {entry['baseline']:>9.3f}  {entry['params'] or '(default)'}")
+
+    save_best_params(best, args.output)
+    print(f"\n✅ Saved tuned hyperparameters to '{args.output}'; define_models will pick them up")
+
+if __name__ == "__main__":
+    main()
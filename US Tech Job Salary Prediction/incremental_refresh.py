@@ -0,0 +1,285 @@
+import argparse
+import hashlib
+import io
+import os
+import time
+import joblib
+import pandas as pd
+from model_store import ModelArtifactStore
+from salary_data import MODEL_COLUMNS, SALARY_SCHEMA
+from salary_predictor import (SalaryPredictor, LABEL_ENCODED_COLS, SALARY_CLASSES, JOINT_FAMILIES, needs_scaling,
+                              salary_class_codes, evaluate_model)
+
+# Bumped when the layout of the refresh state changes
+REFRESH_STATE_VERSION = 2
+
+# Bytes before the recorded offset that must be unchanged for an append-only refresh
+TAIL_BYTES = 4096
+
+# Ensemble models that can add estimators to an existing fit, and the parameter that counts them
+WARM_START_TYPES = {'RandomForest': 'n_estimators', 'ExtraTrees': 'n_estimators',
+                    'GradientBoosting': 'n_estimators', 'HistGradientBoosting': 'max_iter'}
+
+# Fewest new held-out rows R² can be computed on; below it the drift check is skipped
+MIN_DRIFT_ROWS = 2
+
+SCORE_KEYS = {'regression': 'R2', 'classification': 'Accuracy'}
+
+
+def tail_digest(csv_path, offset):
+    """Hash of the bytes just before offset, used to detect rewrites of the already-seen rows"""
+    with open(csv_path, 'rb') as f:
+        f.seek(max(0, offset - TAIL_BYTES))
+        return hashlib.sha256(f.read(offset - max(0, offset - TAIL_BYTES))).hexdigest()
+
+def read_appended_rows(csv_path, offset):
+    """Read the complete CSV lines after offset; returns (frame, new offset)"""
+    with open(csv_path, 'rb') as f:
+        header = f.readline().decode('utf-8').strip().split(',')
+        f.seek(offset)
+        data = f.read()
+    # A partially written last line is left for the next refresh
+    end = data.rfind(b'\n') + 1
+    if end == 0:
+        return pd.DataFrame(columns=MODEL_COLUMNS), offset
+    frame = pd.read_csv(io.BytesIO(data[:end]), names=header, header=None,
+                        dtype={col: SALARY_SCHEMA[col] for col in header if col in SALARY_SCHEMA})
+    return frame[MODEL_COLUMNS], offset + end
+
+def extend_vocabulary(predictor, frame):
+    """Give unseen labels the next free codes in predictor.appended_labels; existing codes keep their value
+
+    The LabelEncoders are not touched: appending to classes_ would leave it unsorted
+    and break their binary-search transform.
+    """
+    added = {}
+    tables = predictor._get_lookup_tables()
+    for col in LABEL_ENCODED_COLS:
+        labels = tables[col][0]
+        new_labels = pd.Index(frame[col].dropna().unique()).difference(labels)
+        if len(new_labels):
+            appended = predictor.appended_labels.setdefault(col, {})
+            appended.update({label: len(labels) + i for i, label in enumerate(new_labels)})
+            added[col] = list(new_labels)
+    predictor._lookup_tables = None
+    return added
+
+
+def save_refresh_state(predictor, path, csv_offset, rows, config):
+    """Persist everything an incremental refresh needs: all fitted models, data splits and offset"""
+    state = {
+        'version': REFRESH_STATE_VERSION,
+        'csv_offset': csv_offset,
+        'rows': rows,
+        'tail_digest': tail_digest(predictor.data_path, csv_offset),
+        # Artifacts are always stored under the configuration the models were defined with
+        'config': config,
+        'label_encoders': predictor.label_encoders,
+        'appended_labels': predictor.appended_labels,
+        'scaler': predictor.scaler,
+        'salary_thresholds': predictor.salary_thresholds,
+        # Only fitted models: cross-validated selection leaves the pruned ones unfitted
+        'regression_models': {name: model for name, model in predictor.regression_models.items()
+                              if name in predictor.regression_results},
+        'classification_models': {name: model for name, model in predictor.classification_models.items()
+                                  if name in predictor.classification_results},
+        'baseline': {
+            'regression': {name: r['R2'] for name, r in predictor.regression_results.items()},
+            'classification': {name: r['Accuracy'] for name, r in predictor.classification_results.items()}
+        },
+        'splits': (predictor.X_train, predictor.X_test, predictor.y_train, predictor.y_test,
+                   predictor.y_train_class, predictor.y_test_class)
+    }
+    tmp_path = path + '.tmp'
+    joblib.dump(state, tmp_path)
+    os.replace(tmp_path, path)
+
+def load_refresh_state(predictor, path):
+    """Restore a saved refresh state into the predictor; None if missing or outdated"""
+    if not os.path.exists(path):
+        return None
+    state = joblib.load(path)
+    if state.get('version') != REFRESH_STATE_VERSION:
+        return None
+    predictor.label_encoders = state['label_encoders']
+    predictor.appended_labels = state['appended_labels']
+    predictor.scaler = state['scaler']
+    predictor.salary_thresholds = state['salary_thresholds']
+    predictor.regression_models = state['regression_models']
+    predictor.classification_models = state['classification_models']
+    (predictor.X_train, predictor.X_test, predictor.y_train, predictor.y_test,
+     predictor.y_train_class, predictor.y_test_class) = state['splits']
+    predictor._lookup_tables = None
+    return state
+
+
+def full_training(predictor, store, state_path):
+    """Train every model from scratch and record the CSV offset for later refreshes"""
+    csv_offset = os.path.getsize(predictor.data_path)
+    predictor.load_and_explore_data(MODEL_COLUMNS)
+    predictor.create_salary_classification()
+    predictor.preprocess_data()
+    predictor.define_models()
+    config = predictor.model_config()
+    predictor.train_all_models()
+    predictor.save_artifacts(store)
+    save_refresh_state(predictor, state_path, csv_offset, len(predictor.data), config)
+
+
+def _model_input(predictor, name, X):
+    return predictor.scaler.transform(X) if needs_scaling(name) else X
+
+def _refit(predictor, name, model, X, y, add_estimators):
+    """Warm-start ensembles with extra estimators; refit every other model on X, y
+
+    Histogram boosting keeps its bins, so labels added since its first fit are split as missing values.
+    """
+    count = next((param for prefix, param in WARM_START_TYPES.items() if type(model).__name__.startswith(prefix)), None)
+    if count is not None:
+        # Histogram boosting may have stopped early, below max_iter
+        fitted = model.n_iter_ if count == 'max_iter' else getattr(model, count)
+        model.set_params(warm_start=True, **{count: fitted + add_estimators})
+        model.fit(X, y)
+        return 'warm-started'
+    model.fit(_model_input(predictor, name, X), y)
+    return 'refitted'
+
+def refresh_models(predictor, store, state_path='refresh_state.joblib', drift_threshold=0.02,
+                   add_estimators=20, holdout_every=5):
+    """Update the trained models with the rows appended to the CSV since the last run
+
+    Only the new lines are read. Unseen job titles and countries are appended to
+    the label vocabularies, so existing codes stay valid. Every 5th new row is
+    held out; models whose score on those rows falls more than drift_threshold
+    below their recorded score are updated. Forests and (histogram) gradient
+    boosting add estimators with warm_start; other models are refitted. Joint classifiers are
+    updated through their regressor, and stacked ensembles are rebuilt from the
+    re-scored models, so the saved artifacts match the configuration they are
+    stored under. Falls back to a full training run when there is no state or the
+    already-seen rows changed.
+    """
+    start = time.perf_counter()
+    state = load_refresh_state(predictor, state_path)
+    if state is None:
+        print("🆕 No refresh state found; training all models from scratch")
+        return full_training(predictor, store, state_path)
+
+    csv_offset = state['csv_offset']
+    if os.path.getsize(predictor.data_path) < csv_offset or \
+            tail_digest(predictor.data_path, csv_offset) != state['tail_digest']:
+        print("⚠️  Existing rows of the CSV changed; training all models from scratch")
+        return full_training(predictor, store, state_path)
+
+    new_rows, new_offset = read_appended_rows(predictor.data_path, csv_offset)
+    if new_rows.empty:
+        print("✅ No new rows since the last refresh; models are up to date")
+        return None
+    new_rows.index = pd.RangeIndex(state['rows'], state['rows'] + len(new_rows))
+    print(f"📥 {len(new_rows):,} new rows appended since the last refresh")
+
+    # Class cut-offs stay those of the original training run so the labels remain comparable
+    low, high, by = predictor._resolve_scheme(predictor.salary_scheme)
+    if by is not None:
+        raise ValueError("Incremental refresh needs a salary_scheme without per-group thresholds")
+    if predictor.encoding != 'label' or predictor.buckets_rare_labels:
+        raise ValueError("Incremental refresh needs plain label encoding; new labels cannot extend a target encoding or bucketed vocabulary")
+    low, high = predictor.salary_thresholds['Low'], predictor.salary_thresholds['Medium']
+    predictor.salary_thresholds['High'] = max(predictor.salary_thresholds['High'], int(new_rows['salary_in_usd'].max()))
+
+    added = extend_vocabulary(predictor, new_rows)
+    for col, labels in added.items():
+        print(f"   New {col} values: {', '.join(map(str, labels))}")
+
+    # Same dtype as the stored splits, so concatenating them does not upcast the training matrix
+    X_new = predictor.encode_features(new_rows).astype(predictor.X_train.dtypes.to_dict())
+    y_new = new_rows['salary_in_usd'].astype(predictor.y_train.dtype)
+    y_new_class = pd.Series(pd.Categorical.from_codes(salary_class_codes(y_new, low, high), categories=SALARY_CLASSES),
+                            index=new_rows.index, name='salary_class')
+    holdout = (new_rows.index.to_numpy() % holdout_every) == 0
+
+    # Drift check on the new held-out rows, before they are mixed into the test set
+    drifted = {'regression': [], 'classification': []}
+    if holdout.sum() < MIN_DRIFT_ROWS:
+        print(f"⚠️  {holdout.sum()} new held-out rows; drift check skipped until at least {MIN_DRIFT_ROWS} arrive")
+    else:
+        print(f"\n{'Model':<28} {'Recorded':>9} {'New rows':>9}")
+        for task, models, y in (('regression', predictor.regression_models, y_new),
+                                ('classification', predictor.classification_models, y_new_class)):
+            for name, model in models.items():
+                score = evaluate_model(task, model, _model_input(predictor, name, X_new[holdout]), y[holdout])[SCORE_KEYS[task]]
+                recorded = state['baseline'][task][name]
+                flag = '🔴' if recorded - score > drift_threshold else '  '
+                print(f"{flag} {name:<25} {recorded:>9.3f} {score:>9.3f}")
+                if recorded - score > drift_threshold:
+                    drifted[task].append(name)
+
+    # A joint classifier only thresholds its regressor's salaries: updating the regressor updates it
+    for name in list(drifted['classification']):
+        regressor_name = JOINT_FAMILIES.get(name)
+        regressor = predictor.regression_models.get(regressor_name)
+        if regressor is not None and getattr(predictor.classification_models[name], 'regressor', None) is regressor:
+            drifted['classification'].remove(name)
+            if regressor_name not in drifted['regression']:
+                drifted['regression'].append(regressor_name)
+
+    predictor.X_train = pd.concat([predictor.X_train, X_new[~holdout]])
+    predictor.X_test = pd.concat([predictor.X_test, X_new[holdout]])
+    predictor.y_train = pd.concat([predictor.y_train, y_new[~holdout]])
+    predictor.y_test = pd.concat([predictor.y_test, y_new[holdout]])
+    predictor.y_train_class = pd.concat([predictor.y_train_class, y_new_class[~holdout]])
+    predictor.y_test_class = pd.concat([predictor.y_test_class, y_new_class[holdout]])
+
+    for task, models, y in (('regression', predictor.regression_models, predictor.y_train),
+                            ('classification', predictor.classification_models, predictor.y_train_class)):
+        for name in drifted[task]:
+            action = _refit(predictor, name, models[name], predictor.X_train, y, add_estimators)
+            print(f"🔁 {name}: {action}")
+
+    # Re-score everything on the extended test set
+    predictor.regression_results = {
+        name: evaluate_model('regression', model, _model_input(predictor, name, predictor.X_test), predictor.y_test)
+        for name, model in predictor.regression_models.items()
+    }
+    predictor.classification_results = {
+        name: evaluate_model('classification', model, _model_input(predictor, name, predictor.X_test), predictor.y_test_class)
+        for name, model in predictor.classification_models.items()
+    }
+    # The stacked ensembles are not in the model dicts; rebuild them from the new holdout predictions
+    ensemble = state['config'].get('ensemble')
+    if ensemble is not None:
+        predictor.ensemble = True
+        predictor.ensemble_latency_budget_ms = ensemble['latency_budget_ms']
+        predictor.ensemble_max_members = ensemble['max_members']
+        predictor.build_ensembles()
+    predictor.select_best_models()
+
+    predictor.save_artifacts(store, config=state['config'])
+    save_refresh_state(predictor, state_path, new_offset, state['rows'] + len(new_rows), state['config'])
+    n_drifted = len(drifted['regression']) + len(drifted['classification'])
+    print(f"\n✅ Refresh finished in {time.perf_counter() - start:.1f}s "
+          f"({n_drifted} of {len(predictor.regression_models) + len(predictor.classification_models)} models updated)")
+    return drifted
+
+
+def main():
+    """Bring the trained models up to date with rows appended to the salary CSV"""
+    parser = argparse.ArgumentParser(description='Incremental model refresh')
+    parser.add_argument('--data', default='ds_salaries.csv')
+    parser.add_argument('--artifacts', default='model_artifacts')
+    parser.add_argument('--state', default='refresh_state.joblib')
+    parser.add_argument('--drift-threshold', type=float, default=0.02,
+                        help='score drop on the new rows (R² or accuracy) that triggers an update')
+    parser.add_argument('--add-estimators', type=int, default=20,
+                        help='estimators added to warm-started forests and boosting models')
+    parser.add_argument('--full', action='store_true', help='ignore the saved state and retrain everything')
+    args = parser.parse_args()
+
+    predictor = SalaryPredictor(data_path=args.data, n_jobs=-1)
+    store = ModelArtifactStore(args.artifacts)
+    if args.full:
+        full_training(predictor, store, args.state)
+    else:
+        refresh_models(predictor, store, args.state, args.drift_threshold, args.add_estimators)
+
+if __name__ == "__main__":
+    main()
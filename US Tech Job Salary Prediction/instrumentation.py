@@ -0,0 +1,244 @@
+import argparse
+import contextlib
+import functools
+import json
+import os
+import time
+import tracemalloc
+from lazy_imports import module_available
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILERS = ('cprofile', 'pyinstrument')
+
+# SalaryPredictor methods timed as stages when instrumentation is enabled
+INSTRUMENTED_METHODS = [
+    'load_and_explore_data', 'create_salary_classification', 'preprocess_data', 'define_models',
+    'train_all_models', 'cross_validate_models', 'save_artifacts', 'load_artifacts', 'load_cube',
+    'print_comprehensive_summary', 'run_example_predictions', 'predict_salary_and_classification',
+    'predict_batch'
+]
+
+
+def _current_rss_mb():
+    """Resident set size of this process, or None where /proc is unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _max_rss_mb():
+    """Process high-water RSS (ru_maxrss is KB on Linux, bytes on macOS)"""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / 1024 / 1024 if os.uname().sysname == 'Darwin' else maxrss / 1024
+
+
+class Instrumentation:
+    """Opt-in timers, memory peaks and profiles around predictor stages
+
+    Every stage produces one record: wall and CPU seconds, the tracemalloc peak above
+    the stage's starting allocation, current and high-water RSS, and the profile file
+    if one was captured. Records are kept in memory and appended to a JSON-lines file.
+    """
+
+    def __init__(self, path=None, memory=True, profile=None, profile_dir='profiles', profile_stages=None):
+        self.path = path
+        self.memory = memory
+        if profile is not None and profile not in PROFILERS:
+            raise ValueError(f"profile must be one of {PROFILERS}, not '{profile}'")
+        if profile == 'pyinstrument' and not module_available('pyinstrument'):
+            print("⚠️  pyinstrument is not installed; profiling with cProfile instead")
+            profile = 'cprofile'
+        self.profile = profile
+        self.profile_dir = profile_dir
+        # Stage names to profile; by default every stage not nested in a profiled one
+        self.profile_stages = set(profile_stages) if profile_stages else None
+        self.records = []
+        self._stack = []
+        self._profiling = False
+        self._started_tracing = False
+
+    def config(self):
+        """Constructor arguments for an equivalent collector in a worker process (records stay in memory)"""
+        return {'memory': self.memory, 'profile': self.profile, 'profile_dir': self.profile_dir,
+                'profile_stages': sorted(self.profile_stages) if self.profile_stages else None}
+
+    def _start_profiler(self, name):
+        if self.profile is None or self._profiling or \
+                (self.profile_stages is not None and name not in self.profile_stages):
+            return None
+        self._profiling = True
+        if self.profile == 'pyinstrument':
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            profiler.start()
+        else:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return profiler
+
+    def _stop_profiler(self, profiler, name, fields):
+        self._profiling = False
+        os.makedirs(self.profile_dir, exist_ok=True)
+        label = '-'.join(str(v) for v in [name, fields.get('model')] if v).replace(' ', '_').replace('/', '_')
+        stem = os.path.join(self.profile_dir, f"{os.getpid()}-{len(self.records):04d}-{label}")
+        if self.profile == 'pyinstrument':
+            profiler.stop()
+            path = stem + '.html'
+            with open(path, 'w') as f:
+                f.write(profiler.output_html())
+        else:
+            profiler.disable()
+            path = stem + '.prof'
+            profiler.dump_stats(path)
+        return path
+
+    @contextlib.contextmanager
+    def stage(self, name, **fields):
+        """Measure the enclosed block as one stage; fields (model, task, ...) are added to its record"""
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            # Keep the enclosing stage's peak before resetting it for this one
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+        else:
+            current = 0
+        frame = {'base': current, 'peak': current}
+        self._stack.append(frame)
+        profiler = self._start_profiler(name)
+        record = {'stage': name, **fields}
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        except BaseException as e:
+            record['error'] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record['seconds'] = round(time.perf_counter() - start, 6)
+            record['cpu_seconds'] = round(time.process_time() - cpu_start, 6)
+            if profiler is not None:
+                record['profile'] = self._stop_profiler(profiler, name, fields)
+            self._stack.pop()
+            if self.memory:
+                frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                record['peak_mb'] = round((frame['peak'] - frame['base']) / 1024 / 1024, 3)
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], frame['peak'])
+                elif self._started_tracing:
+                    tracemalloc.stop()
+                    self._started_tracing = False
+            record['rss_mb'] = _current_rss_mb()
+            record['max_rss_mb'] = _max_rss_mb()
+            record['pid'] = os.getpid()
+            record['timestamp'] = time.time()
+            self.add_records([record])
+
+    def add_records(self, records):
+        """Keep records (also those measured in worker processes) and append them to the output file"""
+        self.records.extend(records)
+        if self.path and records:
+            with open(self.path, 'a') as f:
+                for record in records:
+                    f.write(json.dumps(record, default=float) + '\n')
+
+    def wrap(self, obj, method_names=INSTRUMENTED_METHODS):
+        """Replace bound methods of obj with versions that run as stages"""
+        for method_name in method_names:
+            method = getattr(obj, method_name, None)
+            if method is None:
+                continue
+
+            @functools.wraps(method)
+            def wrapper(*args, _method=method, _name=method_name, **kwargs):
+                with self.stage(_name):
+                    return _method(*args, **kwargs)
+            setattr(obj, method_name, wrapper)
+        return obj
+
+    def print_summary(self, records=None):
+        print_summary(self.records if records is None else records)
+
+
+def instrumented(instrumentation, name, **fields):
+    """instrumentation.stage(name, ...), or a no-op context when instrumentation is None"""
+    if instrumentation is None:
+        return contextlib.nullcontext({})
+    return instrumentation.stage(name, **fields)
+
+
+def print_summary(records):
+    """Table of stages (per model for fit/predict) ordered by total wall time"""
+    groups = {}
+    for record in records:
+        key = (record['stage'], record.get('model') or '')
+        group = groups.setdefault(key, {'calls': 0, 'seconds': 0.0, 'cpu_seconds': 0.0, 'peak_mb': None})
+        group['calls'] += 1
+        group['seconds'] += record['seconds']
+        group['cpu_seconds'] += record['cpu_seconds']
+        if record.get('peak_mb') is not None:
+            group['peak_mb'] = max(group['peak_mb'] or 0.0, record['peak_mb'])
+    if not groups:
+        return
+    max_rss = max((r['max_rss_mb'] for r in records if r.get('max_rss_mb') is not None), default=None)
+
+    print("\n⏱️  STAGE SUMMARY")
+    print("-" * 92)
+    print(f"{'Stage':<30} {'Model':<28} {'Calls':>5} {'Wall s':>9} {'CPU s':>9} {'Peak MB':>7}")
+    print("-" * 92)
+    for (stage, model), group in sorted(groups.items(), key=lambda item: -item[1]['seconds']):
+        peak = f"{group['peak_mb']:>7.1f}" if group['peak_mb'] is not None else f"{'-':>7}"
+        print(f"{stage[:30]:<30} {model[:28]:<28} {group['calls']:>5} {group['seconds']:>9.3f} "
+              f"{group['cpu_seconds']:>9.3f} {peak}")
+    print("-" * 92)
+    if max_rss is not None:
+        print(f"Process high-water RSS: {max_rss:,.0f} MB")
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    """Run the training pipeline with instrumentation, or summarize a previous run"""
+    parser = argparse.ArgumentParser(description='Time and profile the SalaryPredictor stages')
+    parser.add_argument('--data', default='ds_salaries.csv')
+    parser.add_argument('--output', default='stages.jsonl', help='JSON-lines file the stage records are appended to')
+    parser.add_argument('--jobs', type=int, default=-1, help='worker processes for model training (-1 for all cores)')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc (it slows allocation-heavy stages)')
+    parser.add_argument('--profile', choices=PROFILERS, help='capture a profile per stage')
+    parser.add_argument('--profile-dir', default='profiles')
+    parser.add_argument('--profile-stages', help='comma-separated stage names to profile (default: top-level stages)')
+    parser.add_argument('--summarize', metavar='JSONL', help='only print the summary table of an existing file')
+    args = parser.parse_args()
+
+    if args.summarize:
+        print_summary(read_records(args.summarize))
+        return
+
+    from salary_predictor import SalaryPredictor
+    from salary_data import MODEL_COLUMNS
+    instrumentation = Instrumentation(
+        args.output, memory=not args.no_memory, profile=args.profile, profile_dir=args.profile_dir,
+        profile_stages=args.profile_stages.split(',') if args.profile_stages else None)
+    predictor = SalaryPredictor(data_path=args.data, n_jobs=args.jobs, instrumentation=instrumentation)
+    predictor.load_and_explore_data(MODEL_COLUMNS)
+    predictor.create_salary_classification()
+    predictor.preprocess_data()
+    predictor.define_models()
+    predictor.train_all_models()
+    predictor.run_example_predictions()
+    print(f"\n✅ Wrote {len(instrumentation.records)} stage records to '{args.output}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.utils.validation import check_is_fitted
+from salary_data import SALARY_CLASSES, salary_class_codes
+
+
+class SalaryThresholdClassifier(ClassifierMixin, BaseEstimator):
+    """Salary class of a fitted regressor's predicted salary: Low < low <= Medium <= high < High
+
+    fit only checks the regressor and records the classes and thresholds, so the
+    class track costs no training of its own. The thresholds come from the data,
+    not the configuration, so they are fit parameters; a refit without them keeps
+    the previous ones. Forest regressors also give probabilities, as the share of
+    trees whose salary falls in each class; other regressors give 0/1.
+    """
+
+    # predict follows the regressor's salary while predict_proba counts tree votes, so the two can disagree
+    predict_overrides_proba = True
+
+    def __init__(self, regressor):
+        self.regressor = regressor
+
+    def fit(self, X, y, low=None, high=None):
+        check_is_fitted(self.regressor)
+        if low is None or high is None:
+            if not hasattr(self, 'low_'):
+                raise ValueError("SalaryThresholdClassifier needs the low and high salary thresholds on its first fit")
+        else:
+            self.low_, self.high_ = low, high
+        self.classes_ = np.unique(np.asarray(y))
+        missing = [label for label in SALARY_CLASSES if label not in self.classes_]
+        unknown = [label for label in self.classes_ if label not in SALARY_CLASSES]
+        if missing or unknown:
+            raise ValueError(f"SalaryThresholdClassifier needs y with exactly the classes {SALARY_CLASSES}; "
+                             f"missing {missing}, unknown {unknown}")
+        self.n_features_in_ = self.regressor.n_features_in_
+        # Column of each SALARY_CLASSES code in classes_
+        self.class_columns_ = np.array([np.flatnonzero(self.classes_ == label)[0] for label in SALARY_CLASSES])
+        return self
+
+    def _proportions(self, codes):
+        """(rows, classes_) shares of each class among codes of shape (votes, rows)"""
+        proportions = np.zeros((codes.shape[1], len(self.classes_)))
+        for code, column in enumerate(self.class_columns_):
+            proportions[:, column] = (codes == code).mean(axis=0)
+        return proportions
+
+    def predict(self, X):
+        codes = salary_class_codes(self.regressor.predict(X), self.low_, self.high_)
+        return np.asarray(SALARY_CLASSES, dtype=object)[codes]
+
+    def predict_proba(self, X):
+        from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor
+        if isinstance(self.regressor, (RandomForestRegressor, ExtraTreesRegressor)):
+            X = np.asarray(X, dtype=np.float32)
+            salaries = np.stack([tree.predict(X) for tree in self.regressor.estimators_])
+        else:
+            salaries = self.regressor.predict(X)[None, :]
+        return self._proportions(salary_class_codes(salaries, self.low_, self.high_))
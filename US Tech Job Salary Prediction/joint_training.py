@@ -0,0 +1,77 @@
+import argparse
+import contextlib
+import io
+import time
+from salary_predictor import SalaryPredictor, JOINT_FAMILIES
+from salary_data import MODEL_COLUMNS
+from instrumentation import Instrumentation
+
+
+def train_mode(data_path, joint, n_jobs=1):
+    """Train the JOINT_FAMILIES in one mode; returns the predictor, per-model and total CPU seconds"""
+    instrumentation = Instrumentation(memory=False)
+    predictor = SalaryPredictor(data_path=data_path, n_jobs=n_jobs, joint_training=joint,
+                                instrumentation=instrumentation)
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.load_and_explore_data(MODEL_COLUMNS)
+        predictor.create_salary_classification()
+        predictor.preprocess_data()
+        predictor.define_models()
+        predictor.regression_models = {name: predictor.regression_models[name] for name in JOINT_FAMILIES.values()}
+        predictor.classification_models = {name: predictor.classification_models[name] for name in JOINT_FAMILIES}
+        start = time.process_time()
+        predictor.train_all_models()
+        total = time.process_time() - start
+    cpu = {}
+    for record in instrumentation.records:
+        if record['stage'] in ('fit', 'predict'):
+            key = (record['task'], record['model'])
+            cpu[key] = cpu.get(key, 0.0) + record['cpu_seconds']
+    return predictor, cpu, total
+
+def compare_training_modes(data_path='ds_salaries.csv', n_jobs=1):
+    """Accuracy and CPU time of the JOINT_FAMILIES classifiers, trained separately vs derived"""
+    separate, separate_cpu, separate_total = train_mode(data_path, joint=False, n_jobs=n_jobs)
+    joint, joint_cpu, joint_total = train_mode(data_path, joint=True, n_jobs=n_jobs)
+
+    print("\n🔗 SEPARATE vs JOINT CLASSIFICATION (classes from the regressor's predicted salary)")
+    print("-" * 96)
+    print(f"{'Classifier':<36} {'Separate acc':>12} {'Joint acc':>10} {'Δ acc':>7} "
+          f"{'Separate CPU s':>14} {'Joint CPU s':>11}")
+    print("-" * 96)
+    rows = []
+    for name in JOINT_FAMILIES:
+        if name not in separate.classification_results:
+            continue
+        row = {
+            'model': name,
+            'separate_accuracy': float(separate.classification_results[name]['Accuracy']),
+            'joint_accuracy': float(joint.classification_results[name]['Accuracy']),
+            'separate_cpu': separate_cpu.get(('classification', name), 0.0),
+            'joint_cpu': joint_cpu.get(('classification', name), 0.0)
+        }
+        rows.append(row)
+        print(f"{name[:36]:<36} {row['separate_accuracy']:>12.3f} {row['joint_accuracy']:>10.3f} "
+              f"{row['joint_accuracy'] - row['separate_accuracy']:>+7.3f} "
+              f"{row['separate_cpu']:>14.3f} {row['joint_cpu']:>11.3f}")
+    print("-" * 96)
+    saved = sum(row['separate_cpu'] - row['joint_cpu'] for row in rows)
+    print(f"Classifier CPU time saved: {saved:.2f}s; training both tracks took "
+          f"{separate_total:.2f}s → {joint_total:.2f}s CPU")
+    print(f"Best classifier: {separate.best_classification_name} "
+          f"({separate.best_model_scores['Accuracy']:.3f}) separate, "
+          f"{joint.best_classification_name} ({joint.best_model_scores['Accuracy']:.3f}) joint")
+    return rows
+
+
+def main():
+    """Compare separate and joint training of the tree families"""
+    parser = argparse.ArgumentParser(description='Compare separate and joint regression/classification training')
+    parser.add_argument('--data', default='ds_salaries.csv')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='worker processes for model training (-1 for all cores)')
+    args = parser.parse_args()
+    compare_training_modes(args.data, args.jobs)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import csv
+import json
+import random
+import time
+from salary_data import INPUT_COLS
+
+def load_profiles(data_path, limit=1000, seed=42):
+    """Sample request payloads from the salary dataset"""
+    with open(data_path, newline='') as f:
+        rows = [{field: row[field] for field in INPUT_COLS} for row in csv.DictReader(f)]
+    random.Random(seed).shuffle(rows)
+    for row in rows:
+        row['work_year'] = int(row['work_year'])
+        row['remote_ratio'] = int(row['remote_ratio'])
+    return rows[:limit]
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return float('nan')
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+async def worker(host, port, profiles, deadline, latencies, errors):
+    """Send requests back to back over one keep-alive connection until the deadline
+
+    When the server closes the connection (Connection: close, or end of stream), the
+    worker reconnects and carries on.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            body = json.dumps(profiles[i % len(profiles)]).encode('utf-8')
+            i += 1
+            request = (f"POST /predict HTTP/1.1\r\nHost: {host}\r\n"
+                       f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+
+            status_line = await reader.readline()
+            length, keep_alive = 0, bool(status_line)
+            while status_line:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.strip().lower() == 'content-length':
+                    length = int(value)
+                elif name.strip().lower() == 'connection':
+                    keep_alive = value.strip().lower() != 'close'
+            if status_line:
+                await reader.readexactly(length)
+            elapsed = time.perf_counter() - start
+
+            if b' 200 ' in status_line:
+                latencies.append(elapsed)
+            else:
+                errors.append(status_line.decode('latin-1').strip() or 'connection closed without a response')
+            if not keep_alive:
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+    finally:
+        writer.close()
+
+async def run_load(host, port, profiles, concurrency, duration):
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + duration
+    # A failed worker (refused or reset connection) is reported; the others' results are kept
+    outcomes = await asyncio.gather(*(worker(host, port, profiles[i::concurrency] or profiles, deadline,
+                                             latencies, errors) for i in range(concurrency)),
+                                    return_exceptions=True)
+    errors += [f"worker stopped: {outcome!r}" for outcome in outcomes if isinstance(outcome, Exception)]
+    return latencies, errors, time.perf_counter() - start
+
+def main():
+    """Drive a local prediction server and report latency percentiles and throughput"""
+    parser = argparse.ArgumentParser(description='Load generator for prediction_server.py')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--concurrency', type=int, default=32, help='number of concurrent connections')
+    parser.add_argument('--duration', type=float, default=10.0, help='test length in seconds')
+    parser.add_argument('--data', default='ds_salaries.csv')
+    args = parser.parse_args()
+
+    profiles = load_profiles(args.data)
+    print(f"🔥 {args.concurrency} connections for {args.duration:.0f}s against http://{args.host}:{args.port}/predict")
+    latencies, errors, elapsed = asyncio.run(run_load(args.host, args.port, profiles, args.concurrency, args.duration))
+
+    latencies.sort()
+    print("\n" + "="*40)
+    print("LOAD TEST RESULTS")
+    print("="*40)
+    print(f"Requests:     {len(latencies):,} ok, {len(errors):,} failed")
+    print(f"Throughput:   {len(latencies) / elapsed:,.1f} requests/sec")
+    if latencies:
+        print(f"Latency p50:  {percentile(latencies, 50) * 1000:.2f} ms")
+        print(f"Latency p99:  {percentile(latencies, 99) * 1000:.2f} ms")
+        print(f"Latency max:  {latencies[-1] * 1000:.2f} ms")
+    if errors:
+        print(f"First error:  {errors[0]}")
+    print("="*40)
+
+if __name__ == "__main__":
+    main()
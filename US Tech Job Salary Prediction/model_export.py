@@ -0,0 +1,291 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+import numpy as np
+from sklearn.ensemble import (RandomForestRegressor, RandomForestClassifier, ExtraTreesRegressor, ExtraTreesClassifier,
+                              GradientBoostingRegressor, GradientBoostingClassifier,
+                              HistGradientBoostingRegressor, HistGradientBoostingClassifier)
+from sklearn.linear_model import (LinearRegression, Ridge, Lasso, ElasticNet, SGDRegressor,
+                                  LogisticRegression, SGDClassifier)
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeRegressor, DecisionTreeClassifier
+from model_store import ModelArtifactStore
+from salary_data import load_salaries
+from salary_predictor import (SalaryPredictor, FEATURE_COLS, INPUT_COLS, needs_scaling,
+                              ensure_trained_models)
+from salary_runtime import SalaryRuntime, CompiledModel
+
+LINEAR_REGRESSORS = (LinearRegression, Ridge, Lasso, ElasticNet, SGDRegressor)
+LINEAR_CLASSIFIERS = (LogisticRegression, SGDClassifier)
+FORESTS = (RandomForestRegressor, RandomForestClassifier, ExtraTreesRegressor, ExtraTreesClassifier)
+TREES = (DecisionTreeRegressor, DecisionTreeClassifier)
+BOOSTING = (GradientBoostingRegressor, GradientBoostingClassifier)
+HIST_BOOSTING = (HistGradientBoostingRegressor, HistGradientBoostingClassifier)
+
+
+def _linear_spec(model, scaler=None):
+    coef = np.atleast_2d(model.coef_).astype(np.float64)
+    intercept = np.atleast_1d(model.intercept_).astype(np.float64)
+    if scaler is not None:
+        # Fold the standardization into the coefficients: w.(x - m)/s + b = (w/s).x + (b - w.m/s)
+        coef = coef / scaler.scale_
+        intercept = intercept - coef @ scaler.mean_
+    if isinstance(model, LINEAR_REGRESSORS):
+        output = 'identity'
+    elif coef.shape[0] == 1:
+        output = 'sigmoid'
+    else:
+        output = 'softmax' if isinstance(model, LogisticRegression) else 'ovr'
+    return {'kind': 'linear', 'output': output}, {'coef': coef, 'intercept': intercept}
+
+def _flatten_trees(trees_and_values):
+    """Concatenate (tree, leaf value rows) pairs into one node table with global child indices"""
+    left, right, feature, threshold, value, roots = [], [], [], [], [], []
+    offset, depth = 0, 0
+    for tree, values in trees_and_values:
+        nodes = np.arange(tree.node_count)
+        leaf = tree.children_left == -1
+        left.append(np.where(leaf, nodes, tree.children_left) + offset)
+        right.append(np.where(leaf, nodes, tree.children_right) + offset)
+        feature.append(np.where(leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        value.append(values)
+        roots.append(offset)
+        offset += tree.node_count
+        depth = max(depth, tree.max_depth)
+    return depth, {
+        'left': np.concatenate(left).astype(np.int32),
+        'right': np.concatenate(right).astype(np.int32),
+        'feature': np.concatenate(feature).astype(np.int32),
+        'threshold': np.concatenate(threshold).astype(np.float64),
+        'value': np.concatenate(value).astype(np.float64),
+        'roots': np.array(roots, dtype=np.int32)
+    }
+
+def _class_fractions(tree):
+    values = tree.value[:, 0, :]
+    return values / values.sum(axis=1, keepdims=True)
+
+def _bitset_rows(bitsets):
+    """(n, 256) booleans of 8-word uint32 category bitsets; bit c % 32 of word c // 32 is category c"""
+    return np.unpackbits(np.ascontiguousarray(bitsets, dtype='<u4').view(np.uint8), axis=1, bitorder='little').astype(bool)
+
+def _hist_tree_spec(model):
+    """Flatten HistGradientBoosting's per-iteration tree predictors into the runtime's node table
+
+    scikit-learn ordinal-encodes the categorical columns and moves them first before
+    growing the trees, so node features are mapped back to the original columns and
+    each categorical split becomes a row of left_categories over the raw label codes.
+    Codes unknown at training time go where the node sends missing values, as in
+    scikit-learn.
+    """
+    n_outputs = model.n_trees_per_iteration_
+    if model._preprocessor is None:
+        columns, categories = np.arange(model.n_features_in_), []
+    else:
+        columns = np.r_[np.flatnonzero(model.is_categorical_), np.flatnonzero(~model.is_categorical_)]
+        categories = model._preprocessor.named_transformers_['encoder'].categories_
+    for raw in categories:
+        if len(raw) and (raw.min() < 0 or np.any(raw != np.round(raw))):
+            raise ValueError("categorical features must be non-negative integer codes to be exported")
+    width = max((int(raw.max()) + 1 for raw in categories if len(raw)), default=1)
+    known, feature_rows = model._bin_mapper.make_known_categories_bitsets()
+    known = _bitset_rows(known)
+
+    left, right, feature, threshold, value, missing_left, category, roots = [], [], [], [], [], [], [], []
+    # Row 0 is a placeholder for the numeric nodes
+    left_categories = [np.zeros((1, width), dtype=bool)]
+    offset = 0
+    for iteration in model._predictors:
+        for k, tree in enumerate(iteration):
+            nodes = tree.nodes
+            n = len(nodes)
+            index = np.arange(n)
+            leaf = nodes['is_leaf'].astype(bool)
+            categorical = nodes['is_categorical'].astype(bool) & ~leaf
+            left.append(np.where(leaf, index, nodes['left']) + offset)
+            right.append(np.where(leaf, index, nodes['right']) + offset)
+            feature.append(np.where(leaf, 0, columns[nodes['feature_idx']]))
+            threshold.append(nodes['num_threshold'])
+            values = np.zeros((n, n_outputs))
+            values[:, k] = np.where(leaf, nodes['value'], 0.0)
+            value.append(values)
+            missing_left.append(nodes['missing_go_to_left'].astype(bool))
+            rows = np.zeros(n, dtype=np.int32)
+            if categorical.any():
+                goes_left = _bitset_rows(tree.raw_left_cat_bitsets)
+                for i in np.flatnonzero(categorical):
+                    # Ordinal code j of the feature stands for raw label code raw[j]
+                    f = nodes['feature_idx'][i]
+                    raw = categories[f].astype(np.intp)
+                    codes = np.arange(len(raw))
+                    goes = goes_left[nodes['bitset_idx'][i], codes] & known[feature_rows[f], codes]
+                    missing = bool(nodes['missing_go_to_left'][i])
+                    row = np.full(width, missing)
+                    row[raw] = np.where(known[feature_rows[f], codes], goes, missing)
+                    rows[i] = sum(len(table) for table in left_categories)
+                    left_categories.append(row[None, :])
+            category.append(rows)
+            roots.append(offset)
+            offset += n
+    arrays = {
+        'left': np.concatenate(left).astype(np.int32),
+        'right': np.concatenate(right).astype(np.int32),
+        'feature': np.concatenate(feature).astype(np.int32),
+        'threshold': np.concatenate(threshold).astype(np.float64),
+        'value': np.concatenate(value).astype(np.float64),
+        'roots': np.array(roots, dtype=np.int32),
+        'missing_left': np.concatenate(missing_left),
+        'category': np.concatenate(category),
+        'left_categories': np.concatenate(left_categories),
+        'weight': np.float64(1.0),
+        'base': np.asarray(model._baseline_prediction, dtype=np.float64).reshape(n_outputs)
+    }
+    if isinstance(model, HistGradientBoostingRegressor):
+        output = 'identity'
+    else:
+        output = 'sigmoid' if n_outputs == 1 else 'softmax'
+    depth = max(int(tree.nodes['depth'].max()) for iteration in model._predictors for tree in iteration)
+    # Thresholds sit between float64 feature values, so the features are not rounded to float32
+    return {'kind': 'trees', 'output': output, 'depth': depth, 'dtype': 'float64'}, arrays
+
+def _tree_spec(model, n_features):
+    if isinstance(model, BOOSTING):
+        n_outputs = model.estimators_.shape[1]
+        pairs = []
+        for stage in model.estimators_:
+            for k, estimator in enumerate(stage):
+                # Each class has its own trees; their leaf value goes to that class's column
+                values = np.zeros((estimator.tree_.node_count, n_outputs))
+                values[:, k] = estimator.tree_.value[:, 0, 0]
+                pairs.append((estimator.tree_, values))
+        depth, arrays = _flatten_trees(pairs)
+        arrays.update(weight=np.float64(model.learning_rate), base=np.zeros(n_outputs))
+        if isinstance(model, GradientBoostingRegressor):
+            spec, truth = {'output': 'identity'}, model.predict
+        else:
+            spec, truth = {'output': 'sigmoid' if n_outputs == 1 else 'softmax'}, model.decision_function
+        spec.update(kind='trees', depth=depth)
+        # The initial estimator's constant offset: model output minus the summed trees, at any point
+        x0 = np.zeros((1, n_features))
+        compiled = CompiledModel(spec, arrays)
+        arrays['base'] = np.asarray(truth(x0), dtype=np.float64).reshape(n_outputs) - compiled.raw(x0)[0]
+        return spec, arrays
+
+    estimators = model.estimators_ if isinstance(model, FORESTS) else [model]
+    classifier = hasattr(model, 'classes_')
+    pairs = [(e.tree_, _class_fractions(e.tree_) if classifier else e.tree_.value[:, 0, :]) for e in estimators]
+    depth, arrays = _flatten_trees(pairs)
+    arrays.update(weight=np.float64(1.0 / len(estimators)), base=np.zeros(arrays['value'].shape[1]))
+    return {'kind': 'trees', 'output': 'identity', 'depth': depth}, arrays
+
+def compile_model(name, model, scaler):
+    """Reduce a fitted model to the arrays CompiledModel evaluates; ValueError if unsupported"""
+    input_scaler = scaler if needs_scaling(name) else None
+    if isinstance(model, Pipeline) and len(model.steps) == 2 and isinstance(model.steps[0][1], StandardScaler):
+        if input_scaler is not None:
+            raise ValueError(f"'{name}': a scaling pipeline on scaled inputs cannot be exported")
+        input_scaler, model = model.steps[0][1], model.steps[1][1]
+    if isinstance(model, LINEAR_REGRESSORS + LINEAR_CLASSIFIERS):
+        return _linear_spec(model, input_scaler)
+    if input_scaler is None and isinstance(model, HIST_BOOSTING):
+        return _hist_tree_spec(model)
+    if input_scaler is None and isinstance(model, FORESTS + TREES + BOOSTING):
+        return _tree_spec(model, len(FEATURE_COLS))
+    raise ValueError(f"'{name}' ({type(model).__name__}) cannot be exported; supported are linear models, "
+                     "decision trees, forests, gradient boosting and histogram gradient boosting")
+
+
+def export_runtime(predictor, path='salary_runtime.npz'):
+    """Write the best models and encoders as a NumPy archive that salary_runtime.SalaryRuntime loads"""
+    # The predictor's own lookup tables, so bucketing and target encoding carry over
+    encoders, defaults = {}, {}
+    for col, (labels, values, unseen) in predictor._get_lookup_tables().items():
+        encoders[f'{col}_encoded'] = dict(zip(map(str, labels), values.tolist()))
+        defaults[f'{col}_encoded'] = float(unseen)
+
+    metadata = {
+        'features': FEATURE_COLS,
+        'encoders': encoders,
+        'defaults': defaults,
+        'classes': [str(c) for c in predictor.best_classification_model.classes_],
+        'model_names': {'regression': predictor.best_regression_name,
+                        'classification': predictor.best_classification_name},
+        'intervals': predictor.prediction_intervals.to_dict() if predictor.prediction_intervals is not None else None,
+        'models': {}
+    }
+    arrays = {}
+    for task, name, model in (('regression', predictor.best_regression_name, predictor.best_regression_model),
+                              ('classification', predictor.best_classification_name,
+                               predictor.best_classification_model)):
+        spec, model_arrays = compile_model(name, model, predictor.scaler)
+        metadata['models'][task] = spec
+        arrays.update({f'{task}/{key}': value for key, value in model_arrays.items()})
+
+    np.savez(path, metadata=np.array(json.dumps(metadata)), **arrays)
+    return path
+
+
+def _import_seconds(module):
+    """Cold-start time of importing a module in a fresh interpreter"""
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    return float(subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout)
+
+def check_runtime(predictor, path, n_rows=1000, n_single=200):
+    """Compare the runtime against the predictor on real rows: agreement, latency and import time"""
+    profiles = load_salaries(predictor.data_path, INPUT_COLS).head(n_rows)
+    runtime = SalaryRuntime(path)
+    expected_salary, expected_class, expected_probs = predictor._predict_frame(profiles)
+    results = runtime.predict_many(profiles.astype(object).to_dict('records'))
+    salary_diff = np.abs(np.array([r['predicted_salary'] for r in results]) - expected_salary).max()
+    class_match = np.mean([r['predicted_class'] == str(c) for r, c in zip(results, expected_class)])
+    probs = np.array([[r['class_probabilities'][str(c)] for c in predictor.best_classification_model.classes_]
+                      for r in results])
+    print(f"Agreement on {len(profiles)} rows: max salary difference ${salary_diff:.6f}, "
+          f"class match {class_match:.1%}, max probability difference {np.abs(probs - expected_probs).max():.2e}")
+
+    records = profiles.head(n_single).to_dict('records')
+    start = time.perf_counter()
+    for profile in records:
+        predictor.predict_salary_and_classification(**profile)
+    predictor_ms = (time.perf_counter() - start) / len(records) * 1000
+    start = time.perf_counter()
+    for profile in records:
+        runtime.predict(**profile)
+    runtime_ms = (time.perf_counter() - start) / len(records) * 1000
+    print(f"Per-row latency: predictor {predictor_ms:.3f} ms, runtime {runtime_ms:.3f} ms "
+          f"({predictor_ms / runtime_ms:.0f}x faster)")
+
+    predictor_import, runtime_import = _import_seconds('salary_predictor'), _import_seconds('salary_runtime')
+    print(f"Cold import: salary_predictor {predictor_import * 1000:.0f} ms, salary_runtime {runtime_import * 1000:.0f} ms "
+          f"({predictor_import / runtime_import:.0f}x faster)")
+
+
+def main():
+    """Export the best trained models to the NumPy-only salary runtime"""
+    parser = argparse.ArgumentParser(description='Export the best models for salary_runtime.py')
+    parser.add_argument('--data', default='ds_salaries.csv')
+    parser.add_argument('--artifacts', default='model_artifacts')
+    parser.add_argument('--streamed', action='store_true',
+                        help='export the models saved by streaming_training.py instead of the in-memory fit')
+    parser.add_argument('--output', default='salary_runtime.npz')
+    parser.add_argument('--check', action='store_true', help='verify agreement and compare latency after exporting')
+    args = parser.parse_args()
+
+    predictor = SalaryPredictor(data_path=args.data, n_jobs=-1,
+                                training_mode='streaming' if args.streamed else 'in-memory')
+    ensure_trained_models(predictor, ModelArtifactStore(args.artifacts))
+    try:
+        export_runtime(predictor, args.output)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Exported {predictor.best_regression_name} and {predictor.best_classification_name} to '{args.output}'")
+    if args.check:
+        check_runtime(predictor, args.output)
+
+if __name__ == "__main__":
+    main()
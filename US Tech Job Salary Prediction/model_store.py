@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from lazy_imports import LazyModule
+
+joblib = LazyModule('joblib')
+
+# Bump when the layout of a stored artifact set changes
+STORE_VERSION = 1
+
+# Digests of the files hashed in this process, keyed by (path, size, mtime)
+_file_digests = {}
+
+def file_digest(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file, read in chunks
+
+    The file is only read again once its size or modification time changes.
+    """
+    stat = os.stat(path)
+    signature = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if signature not in _file_digests:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        _file_digests[signature] = digest.hexdigest()
+    return _file_digests[signature]
+
+def config_digest(config):
+    """Return a stable SHA-256 hex digest of a JSON-like configuration"""
+    payload = json.dumps(config, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LazyArtifacts:
+    """Read-only mapping that loads each artifact from disk on first access"""
+
+    def __init__(self, directory, manifest):
+        self.directory = directory
+        self.manifest = manifest
+        self._loaded = {}
+
+    def __getitem__(self, name):
+        if name not in self._loaded:
+            if name not in self.manifest['artifacts']:
+                raise KeyError(name)
+            path = os.path.join(self.directory, self.manifest['artifacts'][name])
+            # Numeric arrays are memory-mapped instead of being read into memory
+            self._loaded[name] = joblib.load(path, mmap_mode='r')
+        return self._loaded[name]
+
+    def __contains__(self, name):
+        return name in self.manifest['artifacts']
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    @property
+    def metadata(self):
+        return self.manifest.get('metadata', {})
+
+
+class ModelArtifactStore:
+    """Versioned on-disk store of trained models keyed by data and config hashes"""
+
+    def __init__(self, root='model_artifacts', keep=3):
+        self.root = root
+        self.keep = keep
+
+    def make_key(self, data_path, config):
+        """Build the artifact key for a dataset file and a model configuration"""
+        return f"v{STORE_VERSION}-{file_digest(data_path)[:16]}-{config_digest(config)[:16]}"
+
+    def _directory(self, key):
+        return os.path.join(self.root, key)
+
+    def exists(self, key):
+        return os.path.isfile(os.path.join(self._directory(key), 'manifest.json'))
+
+    def save(self, key, artifacts, metadata=None):
+        """Persist a set of artifacts under the given key"""
+        os.makedirs(self.root, exist_ok=True)
+        staging = self._directory(key) + f'.tmp-{os.getpid()}'
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        manifest = {
+            'version': STORE_VERSION,
+            'key': key,
+            'created': time.time(),
+            'artifacts': {},
+            'metadata': metadata or {}
+        }
+        for name, obj in artifacts.items():
+            filename = f'{name}.joblib'
+            # Uncompressed so that numpy arrays can be memory-mapped on load
+            joblib.dump(obj, os.path.join(staging, filename))
+            manifest['artifacts'][name] = filename
+        with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2, default=str)
+
+        # Swap the finished directory in so readers never see a partial set
+        target = self._directory(key)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+        self.prune()
+        return target
+
+    def load(self, key):
+        """Open the artifacts stored under key; nothing is read until accessed"""
+        with open(os.path.join(self._directory(key), 'manifest.json')) as f:
+            manifest = json.load(f)
+        if manifest.get('version') != STORE_VERSION:
+            raise ValueError(f"Artifact store version {manifest.get('version')} is not supported")
+        return LazyArtifacts(self._directory(key), manifest)
+
+    def prune(self):
+        """Remove all but the most recent `keep` artifact sets"""
+        if not os.path.isdir(self.root):
+            return
+        entries = [os.path.join(self.root, name) for name in os.listdir(self.root)
+                   if os.path.isfile(os.path.join(self.root, name, 'manifest.json'))]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[self.keep:]:
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,187 @@
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin, ClassifierMixin
+
+# Queries scored against the inverted lists at a time, bounding the distance block size
+QUERY_BATCH_SIZE = 4096
+
+
+def _squared_distances(A, B):
+    """Pairwise squared Euclidean distances between the rows of A and B"""
+    d = (A * A).sum(axis=1)[:, None] - 2.0 * A @ B.T + (B * B).sum(axis=1)[None, :]
+    return np.maximum(d, 0.0, out=d)
+
+def nearest_centroid(X, centroids):
+    """Index of the closest centroid for each row, computed in bounded blocks"""
+    return np.concatenate([
+        _squared_distances(X[start:start + QUERY_BATCH_SIZE], centroids).argmin(axis=1)
+        for start in range(0, len(X), QUERY_BATCH_SIZE)
+    ]) if len(X) else np.empty(0, dtype=np.int64)
+
+def kmeans(X, n_clusters, n_iter=10, rng=None):
+    """Plain Lloyd k-means; returns the centroids"""
+    rng = rng or np.random.default_rng()
+    centroids = X[rng.choice(len(X), n_clusters, replace=False)].copy()
+    for _ in range(n_iter):
+        assignment = nearest_centroid(X, centroids)
+        counts = np.bincount(assignment, minlength=n_clusters)
+        sums = np.stack([np.bincount(assignment, weights=X[:, j], minlength=n_clusters)
+                         for j in range(X.shape[1])], axis=1).astype(centroids.dtype)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        # Re-seed empty clusters with random points so every list stays usable
+        centroids[empty] = X[rng.choice(len(X), int(empty.sum()))]
+    return centroids
+
+
+class IVFIndex:
+    """Inverted-file index: points bucketed by their nearest k-means centroid
+
+    A query only scans the n_probe lists whose centroids are closest to it, so
+    n_probe trades recall for speed; n_probe == n_lists is an exact search.
+    """
+
+    def __init__(self, n_lists, n_iter=10, max_train_points=256, random_state=None):
+        self.n_lists = n_lists
+        self.n_iter = n_iter
+        # k-means is trained on at most max_train_points points per list
+        self.max_train_points = max_train_points
+        self.random_state = random_state
+
+    def build(self, X):
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        rng = np.random.default_rng(self.random_state)
+        n_lists = min(self.n_lists, len(X))
+        sample = X
+        if len(X) > n_lists * self.max_train_points:
+            sample = X[rng.choice(len(X), n_lists * self.max_train_points, replace=False)]
+        self.centroids = kmeans(sample, n_lists, self.n_iter, rng)
+
+        assignment = nearest_centroid(X, self.centroids)
+        # Store the points list by list so each list is one contiguous slice
+        self.order = np.argsort(assignment, kind='stable')
+        self.points = X[self.order]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=n_lists))])
+        return self
+
+    def _nearest_lists(self, X, n_probe):
+        d = _squared_distances(X, self.centroids)
+        if n_probe >= d.shape[1]:
+            return np.argsort(d, axis=1)
+        return np.argpartition(d, n_probe - 1, axis=1)[:, :n_probe]
+
+    def search(self, X, k, n_probe):
+        """Return (distances, training-row indices) of the approximate k nearest neighbours"""
+        if not 0 < k <= len(self.points):
+            # Fewer points than k would leave unfilled (-1) neighbours, as scikit-learn refuses too
+            raise ValueError(f"Expected 0 < k <= {len(self.points)} indexed points, got k={k}")
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        distances = np.empty((len(X), k), dtype=np.float32)
+        indices = np.empty((len(X), k), dtype=np.int64)
+        for start in range(0, len(X), QUERY_BATCH_SIZE):
+            batch = slice(start, start + QUERY_BATCH_SIZE)
+            distances[batch], indices[batch] = self._search_batch(X[batch], k, n_probe)
+        return distances, indices
+
+    def _search_batch(self, Q, k, n_probe):
+        best_d, best_i = self._scan(Q, k, n_probe)
+        # Probed lists holding fewer than k points in total: widen the probe for those queries
+        short = best_i[:, -1] < 0
+        while short.any() and n_probe < len(self.centroids):
+            n_probe = min(2 * n_probe, len(self.centroids))
+            rows = np.flatnonzero(short)
+            best_d[rows], best_i[rows] = self._scan(Q[rows], k, n_probe)
+            short[rows] = best_i[rows, -1] < 0
+        order = np.argsort(best_d, axis=1)
+        return np.sqrt(np.take_along_axis(best_d, order, axis=1)), np.take_along_axis(best_i, order, axis=1)
+
+    def _scan(self, Q, k, n_probe):
+        """Unsorted squared distances and indices of the k best points in the probed lists"""
+        best_d = np.full((len(Q), k), np.inf, dtype=np.float32)
+        best_i = np.full((len(Q), k), -1, dtype=np.int64)
+        probes = self._nearest_lists(Q, n_probe)
+        # Visit each list once with every query that probes it, merging into the running top k
+        query_ids = np.repeat(np.arange(len(Q)), probes.shape[1])
+        list_ids = probes.ravel()
+        by_list = np.argsort(list_ids, kind='stable')
+        bounds = np.searchsorted(list_ids[by_list], np.arange(len(self.centroids) + 1))
+        for lst in range(len(self.centroids)):
+            start, end = self.offsets[lst], self.offsets[lst + 1]
+            if bounds[lst] == bounds[lst + 1] or start == end:
+                continue
+            q = query_ids[by_list[bounds[lst]:bounds[lst + 1]]]
+            d = _squared_distances(Q[q], self.points[start:end])
+            if d.shape[1] > k:
+                top = np.argpartition(d, k - 1, axis=1)[:, :k]
+                d = np.take_along_axis(d, top, axis=1)
+            else:
+                top = np.broadcast_to(np.arange(d.shape[1]), d.shape)
+            merged_d = np.concatenate([best_d[q], d], axis=1)
+            merged_i = np.concatenate([best_i[q], self.order[start + top]], axis=1)
+            keep = np.argpartition(merged_d, k - 1, axis=1)[:, :k]
+            best_d[q] = np.take_along_axis(merged_d, keep, axis=1)
+            best_i[q] = np.take_along_axis(merged_i, keep, axis=1)
+        return best_d, best_i
+
+
+class _IVFNeighborsBase(BaseEstimator):
+    def __init__(self, n_neighbors=5, weights='uniform', n_lists=None, n_probe=8, random_state=42):
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        # Defaults to about sqrt(n_samples) lists
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.random_state = random_state
+
+    def _fit_index(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        n_lists = self.n_lists or max(1, int(np.sqrt(len(X))))
+        self.index_ = IVFIndex(n_lists, random_state=self.random_state).build(X)
+        self.n_features_in_ = X.shape[1]
+
+    def kneighbors(self, X):
+        """Approximate (distances, indices) of the n_neighbors nearest training rows"""
+        return self.index_.search(np.asarray(X, dtype=np.float32), self.n_neighbors, self.n_probe)
+
+    def _neighbor_weights(self, distances):
+        if self.weights == 'uniform':
+            return np.ones_like(distances)
+        # As in scikit-learn: exact matches take all the weight when present
+        with np.errstate(divide='ignore'):
+            weights = 1.0 / distances
+        exact = np.isinf(weights)
+        rows = exact.any(axis=1)
+        weights[rows] = exact[rows]
+        return weights
+
+
+class IVFNeighborsRegressor(RegressorMixin, _IVFNeighborsBase):
+    """K-nearest-neighbours regression over an approximate IVF index"""
+
+    def fit(self, X, y):
+        self._fit_index(X)
+        self._y = np.asarray(y, dtype=np.float64)
+        return self
+
+    def predict(self, X):
+        distances, indices = self.kneighbors(X)
+        weights = self._neighbor_weights(distances)
+        return (self._y[indices] * weights).sum(axis=1) / weights.sum(axis=1)
+
+
+class IVFNeighborsClassifier(ClassifierMixin, _IVFNeighborsBase):
+    """K-nearest-neighbours classification over an approximate IVF index"""
+
+    def fit(self, X, y):
+        self._fit_index(X)
+        self.classes_, self._y = np.unique(np.asarray(y), return_inverse=True)
+        return self
+
+    def predict_proba(self, X):
+        distances, indices = self.kneighbors(X)
+        weights = self._neighbor_weights(distances)
+        proba = np.zeros((len(indices), len(self.classes_)))
+        np.add.at(proba, (np.arange(len(indices))[:, None], self._y[indices]), weights)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
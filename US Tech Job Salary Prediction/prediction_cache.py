@@ -0,0 +1,108 @@
+import json
+import os
+import time
+from collections import OrderedDict
+import numpy as np
+
+# Bump when the layout of the persisted cache file changes
+CACHE_FILE_VERSION = 1
+
+
+class PredictionCache:
+    """Bounded LRU cache of single-profile predictions, with optional TTL and persistence
+
+    Entries belong to one model_version; when the predictor's best models change,
+    the whole cache is dropped on the next lookup.
+    """
+
+    def __init__(self, max_size=10000, ttl_seconds=None, path=None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.model_version = None
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _check_version(self, model_version):
+        if model_version != self.model_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.model_version = model_version
+
+    def get(self, key, model_version):
+        """Cached (salary, class, probabilities) for key, or None"""
+        self._check_version(model_version)
+        entry = self._entries.get(key)
+        if entry is not None and self.ttl_seconds is not None and time.time() - entry[1] > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, model_version):
+        self._check_version(model_version)
+        self._entries[key] = (value, time.time())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'invalidations': self.invalidations
+        }
+
+    def save(self, path=None):
+        """Write the entries, least recently used first, to a JSON file"""
+        path = path or self.path
+        payload = {
+            'version': CACHE_FILE_VERSION,
+            'model_version': self.model_version,
+            'entries': [[list(key), [float(salary), str(label), [float(p) for p in probs]], stamp]
+                        for key, ((salary, label, probs), stamp) in self._entries.items()]
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        """Read entries saved by save(); an unreadable or outdated file is ignored"""
+        path = path or self.path
+        try:
+            with open(path) as f:
+                payload = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if payload.get('version') != CACHE_FILE_VERSION:
+            return
+        self.model_version = payload['model_version']
+        self._entries.clear()
+        for key, (salary, label, probs), stamp in payload['entries'][-self.max_size:]:
+            self._entries[tuple(key)] = ((np.float64(salary), label, np.array(probs)), stamp)
@@ -0,0 +1,76 @@
+import numpy as np
+
+
+def _residual_quantiles(residuals, coverage):
+    """Lower and upper conformal residual quantiles, (1 - coverage) / 2 in each tail"""
+    ordered = np.sort(residuals)
+    n = len(ordered)
+    # ceil((n + 1)(1 - alpha))-th smallest residual, and its mirror for the lower tail
+    k = min(n, int(np.ceil((n + 1) * (1 - (1 - coverage) / 2))))
+    return ordered[n - k], ordered[k - 1]
+
+
+class ConformalIntervals:
+    """Split-conformal salary intervals, calibrated separately per bin of predicted salary
+
+    Salary errors grow with the salary, so one global width would be too wide for
+    juniors and too narrow for executives. The calibration rows are split into
+    bins by predicted salary (Mondrian conformal prediction), and each bin keeps
+    the lower and upper quantiles of its residuals. An interval is then the point
+    prediction plus the offsets of its bin: one searchsorted and two lookups.
+    """
+
+    def __init__(self, edges, lower_offsets, upper_offsets, coverage, bin_sizes=None):
+        # Inner bin edges over predicted salary (len(offsets) - 1 of them)
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.lower_offsets = np.asarray(lower_offsets, dtype=np.float64)
+        self.upper_offsets = np.asarray(upper_offsets, dtype=np.float64)
+        self.coverage = coverage
+        self.bin_sizes = bin_sizes
+
+    @classmethod
+    def calibrate(cls, predicted, actual, coverage=0.9, n_bins=5, min_bin_size=50):
+        """Fit the per-bin residual quantiles on held-out (predicted, actual) salaries
+
+        Each tail gets (1 - coverage) / 2 with the finite-sample correction of split
+        conformal prediction, so a new row from the same distribution falls inside its
+        bin's interval with probability at least coverage. Bins are predicted-salary
+        quantiles with at least min_bin_size rows each.
+        """
+        predicted = np.asarray(predicted, dtype=np.float64)
+        residuals = np.asarray(actual, dtype=np.float64) - predicted
+        n_bins = max(1, min(n_bins, len(predicted) // min_bin_size))
+        edges = np.quantile(predicted, np.linspace(0, 1, n_bins + 1)[1:-1]) if n_bins > 1 else np.empty(0)
+        # Move each edge between two distinct predictions, so that tree models' repeated
+        # predictions never sit on an edge where rounding noise could flip their bin
+        distinct = np.unique(predicted)
+        above = np.minimum(np.searchsorted(distinct, edges, side='right'), len(distinct) - 1)
+        edges = np.unique((distinct[above - 1] + distinct[above]) / 2)
+        bins = np.searchsorted(edges, predicted, side='right')
+
+        lower, upper, sizes = [], [], []
+        for b in range(len(edges) + 1):
+            in_bin = residuals[bins == b]
+            sizes.append(len(in_bin))
+            # Ties in the predictions can leave a bin empty; it falls back to all residuals
+            low, high = _residual_quantiles(in_bin if len(in_bin) else residuals, coverage)
+            lower.append(low)
+            upper.append(high)
+        return cls(edges, lower, upper, coverage, sizes)
+
+    def interval(self, predicted):
+        """(low, high) arrays for predicted salaries; low is clipped at zero"""
+        predicted = np.asarray(predicted, dtype=np.float64)
+        bins = np.searchsorted(self.edges, predicted, side='right')
+        return np.maximum(predicted + self.lower_offsets[bins], 0.0), predicted + self.upper_offsets[bins]
+
+    def coverage_on(self, predicted, actual):
+        """Fraction of actual salaries inside their intervals"""
+        low, high = self.interval(predicted)
+        actual = np.asarray(actual, dtype=np.float64)
+        return float(((actual >= low) & (actual <= high)).mean())
+
+    def to_dict(self):
+        """JSON-serializable form, for the exported runtime"""
+        return {'edges': self.edges.tolist(), 'lower_offsets': self.lower_offsets.tolist(),
+                'upper_offsets': self.upper_offsets.tolist(), 'coverage': self.coverage}
@@ -0,0 +1,253 @@
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from model_store import ModelArtifactStore
+from salary_predictor import SalaryPredictor, INPUT_COLS, ensure_trained_models
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+MAX_BODY_BYTES = 1 << 20
+
+def validate_profile(profile):
+    """Check a JSON profile and coerce its numeric fields; raises ValueError"""
+    if not isinstance(profile, dict):
+        raise ValueError("Each profile must be a JSON object")
+    missing = [col for col in INPUT_COLS if col not in profile]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    clean = {col: profile[col] for col in INPUT_COLS}
+    try:
+        clean['work_year'] = int(clean['work_year'])
+        clean['remote_ratio'] = int(clean['remote_ratio'])
+    except (TypeError, ValueError):
+        raise ValueError("work_year and remote_ratio must be integers")
+    for col in INPUT_COLS:
+        if col not in ('work_year', 'remote_ratio'):
+            clean[col] = str(clean[col])
+    return clean
+
+
+class MicroBatcher:
+    """Coalesce concurrent prediction requests into batched model calls"""
+
+    def __init__(self, predictor, max_batch_size=64, max_wait_ms=5.0):
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        # One model call at a time; requests arriving meanwhile form the next batch
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batches = 0
+        self.rows = 0
+
+    async def submit(self, profile):
+        """Queue one validated profile and wait for its prediction"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((profile, future))
+        return await future
+
+    def _predict(self, profiles):
+        predicted_salary, predicted_class, class_probs = self.predictor._predict_frame(pd.DataFrame(profiles))
+        classes = [str(c) for c in self.predictor.best_classification_model.classes_]
+        results = [
+            {
+                'predicted_salary': float(salary),
+                'predicted_class': str(label),
+                'class_probabilities': dict(zip(classes, map(float, probs)))
+            }
+            for salary, label, probs in zip(predicted_salary, predicted_class, class_probs)
+        ]
+        interval = self.predictor.salary_interval(predicted_salary)
+        if interval is not None:
+            for result, low, high in zip(results, *interval):
+                result['salary_interval'] = [float(low), float(high)]
+        return results
+
+    async def _predict_one(self, profile):
+        """Prediction for a single profile, or the exception scoring it raised"""
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, self._predict, [profile])
+        except Exception as e:
+            return e
+        return results[0]
+
+    async def run(self):
+        """Collect batches until max_batch_size or max_wait is reached, then score them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            profiles = [profile for profile, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self._predict, profiles)
+            except Exception as e:
+                # Score the rows one at a time so only the request with the bad row fails
+                results = [e] if len(batch) == 1 else [await self._predict_one(profile) for profile in profiles]
+            self.batches += 1
+            self.rows += len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+
+class PredictionServer:
+    """Minimal HTTP/1.1 server exposing /predict and /health"""
+
+    def __init__(self, batcher, host='127.0.0.1', port=8000):
+        self.batcher = batcher
+        self.host = host
+        self.port = port
+        self.started = time.time()
+
+    async def handle_predict(self, body):
+        try:
+            payload = json.loads(body or b'null')
+        except json.JSONDecodeError:
+            return 400, {'error': 'Request body must be JSON'}
+        try:
+            if isinstance(payload, list):
+                profiles = [validate_profile(p) for p in payload]
+            else:
+                profiles = [validate_profile(payload)]
+        except ValueError as e:
+            return 400, {'error': str(e)}
+
+        results = await asyncio.gather(*(self.batcher.submit(p) for p in profiles))
+        return 200, results if isinstance(payload, list) else results[0]
+
+    def health(self):
+        predictor = self.batcher.predictor
+        return {
+            'status': 'ok',
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'regression_model': predictor.best_regression_name,
+            'classification_model': predictor.best_classification_name,
+            'batches': self.batcher.batches,
+            'rows': self.batcher.rows,
+            'mean_batch_size': round(self.batcher.rows / self.batcher.batches, 2) if self.batcher.batches else 0.0
+        }
+
+    async def route(self, method, path, body):
+        path = path.split('?', 1)[0]
+        if path == '/predict':
+            if method != 'POST':
+                return 405, {'error': 'Use POST /predict'}
+            return await self.handle_predict(body)
+        if path == '/health':
+            return 200, self.health()
+        return 404, {'error': f'Unknown path {path}'}
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one keep-alive connection"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get('content-length', 0) or 0)
+                except ValueError:
+                    length = -1
+                # The body cannot be skipped without a valid length, so these close the connection
+                if length < 0:
+                    status, payload = 400, {'error': 'Invalid Content-Length'}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, payload = 413, {'error': 'Request body too large'}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, payload = await self.route(method.upper(), path, body)
+                    except Exception as e:
+                        status, payload = 500, {'error': str(e)}
+                    keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+
+                data = json.dumps(payload).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        batch_task = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        print(f"🚀 Serving predictions on http://{self.host}:{self.port}/predict "
+              f"(max batch {self.batcher.max_batch_size}, max wait {self.batcher.max_wait * 1000:.1f} ms)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batch_task.cancel()
+
+
+def main():
+    """Load the persisted best models once and serve them over HTTP"""
+    parser = argparse.ArgumentParser(description='Salary prediction HTTP service')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--max-batch-size', type=int, default=64,
+                        help='maximum number of profiles scored in one model call')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help='how long the first request in a batch waits for others to join')
+    parser.add_argument('--data', default='ds_salaries.csv')
+    parser.add_argument('--artifacts', default='model_artifacts')
+    parser.add_argument('--streamed', action='store_true',
+                        help='serve the models saved by streaming_training.py instead of the in-memory fit')
+    args = parser.parse_args()
+
+    predictor = SalaryPredictor(data_path=args.data, n_jobs=-1,
+                                training_mode='streaming' if args.streamed else 'in-memory')
+    ensure_trained_models(predictor, ModelArtifactStore(args.artifacts))
+
+    server = PredictionServer(MicroBatcher(predictor, args.max_batch_size, args.max_wait_ms),
+                              args.host, args.port)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import json
+import os
+import numpy as np
+from lazy_imports import LazyModule
+from salary_data import HAVE_ARROW, _csv_signature
+
+pd = LazyModule('pandas')
+pa = LazyModule('pyarrow')
+feather = LazyModule('pyarrow.feather')
+
+# Group-by dimensions of the cube; every summary and plot is a roll-up over some of them
+CUBE_DIMS = [
+    'employee_residence', 'job_title', 'experience_level', 'company_size',
+    'remote_ratio', 'work_year', 'salary_class'
+]
+
+# Bins of the per-class salary histograms (the overview plot's distribution panel)
+HISTOGRAM_BINS = 30
+
+CUBE_FORMAT_VERSION = '1'
+
+def cube_path_for(csv_path):
+    """Cube file stored alongside the CSV"""
+    return os.path.splitext(csv_path)[0] + '.cube.arrow'
+
+def cube_signature(csv_path, salary_scheme):
+    """Identifies the CSV contents and the salary scheme the cube was built for"""
+    scheme = json.dumps(salary_scheme, sort_keys=True)
+    return f"{CUBE_FORMAT_VERSION}:{_csv_signature(csv_path)}:{scheme}"
+
+
+class SalaryCube:
+    """count/sum/min/max/sum-of-squares of salary_in_usd per combination of CUBE_DIMS
+
+    Built in one pass over the data; roll-ups then only touch the (much smaller) cells.
+    """
+
+    def __init__(self, cells, meta):
+        self.cells = cells
+        # Statistics that cannot be rolled up from the cells: median, histograms, thresholds
+        self.meta = meta
+
+    @classmethod
+    def build(cls, data, salary_thresholds):
+        """Aggregate a frame with PLOT_COLUMNS and a salary_class column"""
+        salaries = data['salary_in_usd'].to_numpy(dtype=np.float64)
+        frame = data[CUBE_DIMS].assign(value=salaries, sq=salaries * salaries)
+        grouped = frame.groupby(CUBE_DIMS, observed=True, sort=False)
+        cells = grouped['value'].agg(['count', 'sum', 'min', 'max'])
+        cells['sumsq'] = grouped['sq'].sum()
+        cells = cells.reset_index()
+
+        classes = data['salary_class'].to_numpy()
+        histograms = {}
+        for salary_class in pd.unique(classes):
+            counts, edges = np.histogram(salaries[classes == salary_class], bins=HISTOGRAM_BINS)
+            histograms[str(salary_class)] = {'counts': counts.tolist(), 'edges': edges.tolist()}
+        meta = {
+            'median': float(np.median(salaries)) if len(salaries) else 0.0,
+            'histograms': histograms,
+            'thresholds': salary_thresholds
+        }
+        return cls(cells, meta)
+
+    @property
+    def thresholds(self):
+        return self.meta['thresholds']
+
+    @property
+    def median(self):
+        return self.meta['median']
+
+    def histogram(self, salary_class):
+        """(counts, bin edges) of one class's salaries, or None if the class is empty"""
+        entry = self.meta['histograms'].get(salary_class)
+        return (np.array(entry['counts']), np.array(entry['edges'])) if entry else None
+
+    def rollup(self, dims):
+        """Measures aggregated to the given dimensions, with mean and std added"""
+        dims = [dims] if isinstance(dims, str) else list(dims)
+        cells = self.cells
+        if dims:
+            grouped = cells.groupby(dims, observed=True)
+            result = grouped[['count', 'sum', 'sumsq']].sum()
+            result['min'] = grouped['min'].min()
+            result['max'] = grouped['max'].max()
+        else:
+            result = pd.DataFrame({
+                'count': [cells['count'].sum()], 'sum': [cells['sum'].sum()], 'sumsq': [cells['sumsq'].sum()],
+                'min': [cells['min'].min()], 'max': [cells['max'].max()]
+            })
+        result['mean'] = result['sum'] / result['count']
+        # Population variance from the moments, clipped against rounding below zero
+        variance = (result['sumsq'] / result['count'] - result['mean'] ** 2).clip(lower=0)
+        result['std'] = np.sqrt(variance)
+        return result
+
+    def totals(self):
+        """Measures over the whole dataset as a dict"""
+        return self.rollup([]).iloc[0].to_dict()
+
+    def mean_by(self, dim):
+        """Average salary per value of one dimension"""
+        return self.rollup(dim)['mean']
+
+    def count_by(self, dim):
+        """Row count per value of one dimension"""
+        return self.rollup(dim)['count']
+
+    def crosstab(self, dim, values=None):
+        """Row counts of dim x salary_class, like pd.crosstab; values restricts the dim's rows"""
+        table = self.rollup([dim, 'salary_class'])['count'].unstack('salary_class', fill_value=0)
+        if values is not None:
+            table = table[table.index.isin(values)]
+        return table.astype(np.int64)
+
+    def save(self, path, signature):
+        """Write the cells as an Arrow file with the signature and meta in its schema metadata"""
+        table = pa.Table.from_pandas(self.cells, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b'cube_signature': signature.encode(),
+            b'cube_meta': json.dumps(self.meta, default=float).encode()
+        })
+        tmp_path = path + '.tmp'
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, signature):
+        """Read a saved cube; None if missing, unreadable or built for other data or another scheme"""
+        if not os.path.exists(path):
+            return None
+        try:
+            table = feather.read_table(path, memory_map=True)
+        except (OSError, pa.ArrowInvalid):
+            return None
+        metadata = table.schema.metadata or {}
+        if metadata.get(b'cube_signature') != signature.encode():
+            return None
+        return cls(table.to_pandas(), json.loads(metadata[b'cube_meta']))
+
+
+def load_or_build_cube(csv_path, salary_scheme, load_data):
+    """Return the persisted cube for the CSV and scheme, building and saving it when stale
+
+    load_data() must return the frame with PLOT_COLUMNS, a salary_class column and
+    the salary thresholds; it is only called when the cube has to be rebuilt.
+    """
+    signature = cube_signature(csv_path, salary_scheme)
+    path = cube_path_for(csv_path)
+    if HAVE_ARROW:
+        cube = SalaryCube.load(path, signature)
+        if cube is not None:
+            return cube, False
+
+    data, thresholds = load_data()
+    cube = SalaryCube.build(data, thresholds)
+    if HAVE_ARROW:
+        try:
+            cube.save(path, signature)
+        except OSError as e:
+            print(f"⚠️  Could not write aggregate cube '{path}': {e}")
+    return cube, True
@@ -0,0 +1,110 @@
+import os
+import numpy as np
+from lazy_imports import LazyModule, module_available
+
+pd = LazyModule('pandas')
+pa = LazyModule('pyarrow')
+ipc = LazyModule('pyarrow.ipc')
+feather = LazyModule('pyarrow.feather')
+
+# Without pyarrow the loader falls back to typed CSV parsing
+HAVE_ARROW = module_available('pyarrow')
+
+# Explicit column types for ds_salaries.csv
+SALARY_SCHEMA = {
+    'work_year': 'int16',
+    'experience_level': 'category',
+    'employment_type': 'category',
+    'job_title': 'category',
+    'salary': 'int32',
+    'salary_currency': 'category',
+    'salary_in_usd': 'int32',
+    'employee_residence': 'category',
+    'remote_ratio': 'int16',
+    'company_location': 'category',
+    'company_size': 'category'
+}
+
+# Column projections for the different consumers of the data
+PLOT_COLUMNS = [
+    'work_year', 'experience_level', 'job_title', 'salary_in_usd',
+    'employee_residence', 'remote_ratio', 'company_size'
+]
+MODEL_COLUMNS = [
+    'work_year', 'experience_level', 'employment_type', 'job_title', 'salary_in_usd',
+    'employee_residence', 'remote_ratio', 'company_location', 'company_size'
+]
+# Raw columns a profile needs for prediction
+INPUT_COLS = [
+    'work_year', 'experience_level', 'employment_type', 'job_title',
+    'employee_residence', 'remote_ratio', 'company_location', 'company_size'
+]
+
+# Salary classes in order of increasing salary
+SALARY_CLASSES = ['Low', 'Medium', 'High']
+
+def salary_class_codes(salaries, low, high):
+    """Vectorized class codes into SALARY_CLASSES: Low < low <= Medium <= high < High
+
+    low and high may be scalars or arrays broadcastable against salaries.
+    """
+    salaries = np.asarray(salaries)
+    return (salaries >= low).astype(np.int8) + (salaries > high)
+
+CACHE_FORMAT_VERSION = '1'
+
+def cache_path_for(csv_path):
+    """Arrow cache file stored alongside the CSV"""
+    return os.path.splitext(csv_path)[0] + '.arrow'
+
+def _csv_signature(csv_path):
+    stat = os.stat(csv_path)
+    return f"{CACHE_FORMAT_VERSION}:{stat.st_size}:{stat.st_mtime_ns}"
+
+def read_csv_typed(csv_path, columns=None, **kwargs):
+    """Parse the CSV with the explicit schema, optionally reading only some columns"""
+    return pd.read_csv(csv_path, usecols=columns, dtype=SALARY_SCHEMA, **kwargs)
+
+def _cache_is_fresh(cache_path, signature):
+    if not os.path.exists(cache_path):
+        return False
+    try:
+        with pa.memory_map(cache_path) as source:
+            metadata = ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return False
+    return metadata.get(b'csv_signature') == signature.encode()
+
+def write_cache(csv_path, cache_path=None):
+    """Convert the CSV into an uncompressed Arrow IPC (Feather v2) file that can be memory-mapped"""
+    cache_path = cache_path or cache_path_for(csv_path)
+    table = pa.Table.from_pandas(read_csv_typed(csv_path), preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b'csv_signature': _csv_signature(csv_path).encode()
+    })
+    # Write to a temporary name first so a crash never leaves a truncated cache
+    tmp_path = cache_path + '.tmp'
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+def load_salaries(csv_path, columns=None, use_cache=True):
+    """Load the salary data with explicit dtypes, reading through the Arrow cache when possible
+
+    The cache is rebuilt whenever the CSV changes; later runs memory-map it and
+    only materialize the requested columns.
+    """
+    if not use_cache or not HAVE_ARROW:
+        return read_csv_typed(csv_path, columns)
+
+    cache_path = cache_path_for(csv_path)
+    if not _cache_is_fresh(cache_path, _csv_signature(csv_path)):
+        try:
+            write_cache(csv_path, cache_path)
+        except OSError as e:
+            print(f"⚠️  Could not write data cache '{cache_path}': {e}")
+            return read_csv_typed(csv_path, columns)
+
+    table = feather.read_table(cache_path, columns=columns, memory_map=True)
+    return table.to_pandas(split_blocks=True)
@@ -0,0 +1,217 @@
+import argparse
+import time
+import numpy as np
+from salary_predictor import SalaryPredictor, needs_scaling
+from salary_data import MODEL_COLUMNS
+
+# Result names the ensembles are added under
+ENSEMBLE_NAMES = {'regression': 'Stacked Ensemble', 'classification': 'Stacked Ensemble Classifier'}
+
+
+class BlendedRegressor:
+    """Weighted average of fitted regressors' salary predictions"""
+
+    def __init__(self, members, weights, scaler=None):
+        # (name, fitted model) pairs; members named as needs_scaling() models get scaler-transformed input
+        self.members = members
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.scaler = scaler
+
+    def _member_outputs(self, X):
+        scaled = None
+        for name, model in self.members:
+            if needs_scaling(name):
+                scaled = self.scaler.transform(X) if scaled is None else scaled
+                yield self._output(model, scaled)
+            else:
+                yield self._output(model, X)
+
+    def _output(self, model, X):
+        return model.predict(X)
+
+    def predict(self, X):
+        return sum(w * output for w, output in zip(self.weights, self._member_outputs(X)))
+
+
+class BlendedClassifier(BlendedRegressor):
+    """Weighted average of fitted classifiers' class probabilities"""
+
+    def __init__(self, members, weights, scaler=None):
+        super().__init__(members, weights, scaler)
+        self.classes_ = members[0][1].classes_
+
+    def _output(self, model, X):
+        return model.predict_proba(X)
+
+    def predict_proba(self, X):
+        return super().predict(X)
+
+    def predict(self, X):
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def _score(task, y, output, classes):
+    """R² of blended salaries, or accuracy of blended probabilities"""
+    y = np.asarray(y)
+    if task == 'regression':
+        return 1 - ((y - output) ** 2).sum() / ((y - y.mean()) ** 2).sum()
+    return (classes[output.argmax(axis=1)] == y).mean()
+
+def _blend(outputs, weights):
+    return sum(weight * outputs[name] for name, weight in weights.items())
+
+def select_members(task, outputs, y, latencies, classes=None, max_members=3, latency_budget_ms=None,
+                   min_gain=0.001, max_steps=25):
+    """Greedy forward selection with replacement over stored holdout outputs, then pruning
+
+    Each step adds (again, to raise its weight) the model whose inclusion scores best,
+    as long as it gains at least min_gain, the ensemble keeps at most max_members
+    distinct models and their summed single-row latency stays within latency_budget_ms.
+    Members whose removal then costs less than min_gain are dropped. Returns
+    ({name: weight}, {name: marginal contribution}).
+    """
+    counts = {}
+    best_score = -np.inf
+    for _ in range(max_steps):
+        used_ms = sum(latencies[name] for name in counts)
+        best = None
+        for name in outputs:
+            if name not in counts and (len(counts) >= max_members or
+                                       (latency_budget_ms is not None and used_ms + latencies[name] > latency_budget_ms)):
+                continue
+            trial = dict(counts, **{name: counts.get(name, 0) + 1})
+            total = sum(trial.values())
+            score = _score(task, y, _blend(outputs, {n: c / total for n, c in trial.items()}), classes)
+            if best is None or score > best[1]:
+                best = (name, score)
+        if best is None or best[1] < best_score + min_gain:
+            break
+        counts[best[0]] = counts.get(best[0], 0) + 1
+        best_score = best[1]
+
+    # Later members can make earlier ones redundant: drop the least useful while it contributes < min_gain
+    contributions = _contributions(task, outputs, y, counts, classes)
+    while len(counts) > 1 and min(contributions.values()) < min_gain:
+        del counts[min(contributions, key=contributions.get)]
+        contributions = _contributions(task, outputs, y, counts, classes)
+    total = sum(counts.values())
+    return {name: count / total for name, count in counts.items()}, contributions
+
+def _contributions(task, outputs, y, counts, classes):
+    """Score lost when each member is left out of the ensemble"""
+    total = sum(counts.values())
+    score = _score(task, y, _blend(outputs, {n: c / total for n, c in counts.items()}), classes)
+    contributions = {}
+    for name in counts:
+        rest = {n: c for n, c in counts.items() if n != name}
+        if not rest:
+            contributions[name] = np.inf
+            continue
+        rest_total = sum(rest.values())
+        contributions[name] = score - _score(task, y, _blend(outputs, {n: c / rest_total for n, c in rest.items()}), classes)
+    return contributions
+
+def cross_fitted_outputs(task, outputs, y, latencies, classes=None, folds=5, **selection):
+    """Blend of each holdout fold with members and weights selected on the other folds (an honest score)"""
+    from sklearn.model_selection import KFold
+    y = np.asarray(y)
+    first = next(iter(outputs.values()))
+    blended = np.zeros_like(first, dtype=np.float64)
+    for fit_idx, score_idx in KFold(n_splits=folds, shuffle=True, random_state=42).split(y):
+        weights, _ = select_members(task, {n: o[fit_idx] for n, o in outputs.items()}, y[fit_idx],
+                                    latencies, classes, **selection)
+        blended[score_idx] = _blend({n: o[score_idx] for n, o in outputs.items()}, weights)
+    return blended
+
+
+def single_row_latency_ms(model, X, repeat=5):
+    """Best-of-repeat wall time of one single-row predict call"""
+    predict = model.predict_proba if hasattr(model, 'predict_proba') else model.predict
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predict(X)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def build_ensemble(predictor, task, latency_budget_ms=None, max_members=3, min_gain=0.001):
+    """Blend trained models of one track from their stored holdout outputs; no model is refitted
+
+    Returns (result entry like fit_and_evaluate's, member table) or None when no model
+    fits the latency budget. The entry's score and predictions are cross-fitted over the holdout.
+    """
+    results = predictor.regression_results if task == 'regression' else predictor.classification_results
+    key = 'predictions' if task == 'regression' else 'probabilities'
+    candidates = {name: r for name, r in results.items()
+                  if name not in ENSEMBLE_NAMES.values() and r.get(key) is not None}
+    if not candidates:
+        return None
+    y_test = np.asarray(predictor.y_test if task == 'regression' else predictor.y_test_class)
+    outputs = {name: np.asarray(r[key], dtype=np.float64) for name, r in candidates.items()}
+    classes = None if task == 'regression' else next(iter(candidates.values()))['model'].classes_
+    latencies = {
+        name: single_row_latency_ms(r['model'], (predictor.X_test_scaled if needs_scaling(name) else predictor.X_test)[:1])
+        for name, r in candidates.items()
+    }
+    if latency_budget_ms is not None:
+        outputs = {name: output for name, output in outputs.items() if latencies[name] <= latency_budget_ms}
+        if not outputs:
+            return None
+
+    selection = dict(max_members=max_members, latency_budget_ms=latency_budget_ms, min_gain=min_gain)
+    weights, contributions = select_members(task, outputs, y_test, latencies, classes, **selection)
+    blended = cross_fitted_outputs(task, outputs, y_test, latencies, classes, **selection)
+    members = [(name, candidates[name]['model']) for name in weights]
+    any_scaled = any(needs_scaling(name) for name in weights)
+    scaler = predictor.scaler if any_scaled else None
+    table = [{'model': name, 'weight': weights[name], 'latency_ms': latencies[name],
+              'contribution': contributions[name]} for name in weights]
+
+    if task == 'regression':
+        model = BlendedRegressor(members, list(weights.values()), scaler)
+        errors = y_test - blended
+        entry = {'MAE': np.abs(errors).mean(), 'RMSE': np.sqrt((errors ** 2).mean()),
+                 'R2': _score(task, y_test, blended, classes), 'model': model, 'predictions': blended}
+    else:
+        model = BlendedClassifier(members, list(weights.values()), scaler)
+        entry = {'Accuracy': _score(task, y_test, blended, classes), 'model': model,
+                 'predictions': classes[blended.argmax(axis=1)], 'probabilities': blended}
+    return entry, table
+
+
+def print_members(task, name, entry, table, best_single):
+    metric = 'R2' if task == 'regression' else 'Accuracy'
+    print(f"\n{name}: {metric} {entry[metric]:.3f} (cross-fitted on the holdout) "
+          f"vs best single model {best_single[0]} {best_single[1]:.3f}")
+    print(f"{'Member':<36} {'Weight':>7} {'Latency ms':>10} {'Contribution':>12}")
+    for row in table:
+        contribution = f"{row['contribution']:>12.4f}" if np.isfinite(row['contribution']) else f"{'(only)':>12}"
+        print(f"{row['model'][:36]:<36} {row['weight']:>7.2f} {row['latency_ms']:>10.3f} {contribution}")
+    print(f"{'Total':<36} {'':>7} {sum(row['latency_ms'] for row in table):>10.3f}")
+
+
+def main():
+    """Train the zoo, then blend its stored holdout predictions into stacked ensembles"""
+    parser = argparse.ArgumentParser(description='Blend the trained salary models into stacked ensembles')
+    parser.add_argument('--data', default='ds_salaries.csv')
+    parser.add_argument('--jobs', type=int, default=-1, help='worker processes for model training (-1 for all cores)')
+    parser.add_argument('--latency-budget-ms', type=float, help='summed single-row predict time allowed for the members')
+    parser.add_argument('--max-members', type=int, default=3)
+    parser.add_argument('--save', action='store_true', help='save the best models (ensembles included) to the artifact store')
+    parser.add_argument('--artifacts', default='model_artifacts')
+    args = parser.parse_args()
+
+    predictor = SalaryPredictor(data_path=args.data, n_jobs=args.jobs, ensemble=True,
+                                ensemble_latency_budget_ms=args.latency_budget_ms,
+                                ensemble_max_members=args.max_members)
+    predictor.load_and_explore_data(MODEL_COLUMNS)
+    predictor.create_salary_classification()
+    predictor.preprocess_data()
+    predictor.define_models()
+    predictor.train_all_models()
+    if args.save:
+        from model_store import ModelArtifactStore
+        predictor.save_artifacts(ModelArtifactStore(args.artifacts))
+
+if __name__ == "__main__":
+    main()
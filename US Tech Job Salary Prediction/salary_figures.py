@@ -0,0 +1,373 @@
+import argparse
+import hashlib
+import json
+import os
+import numpy as np
+from lazy_imports import LazyModule
+
+pd = LazyModule('pandas')
+mpl_style = LazyModule('matplotlib.style')
+mpl_figure = LazyModule('matplotlib.figure')
+
+STYLE = 'seaborn-v0_8'
+CLASS_COLORS = {'Low': 'red', 'Medium': 'orange', 'High': 'green'}
+
+# Records the input hash of every rendered file so unchanged figures are skipped
+MANIFEST_FILE = '.figures_manifest.json'
+
+
+def draw_overview(fig, inputs):
+    """Salary distribution, yearly trend, experience and company size panels"""
+    axes = fig.subplots(2, 2)
+    fig.suptitle('Salary Analysis: Overview', fontsize=18, y=0.98)
+
+    # Plot 1a: Salary distribution
+    ax = axes[0, 0]
+    for salary_class in ['Low', 'Medium', 'High']:
+        histogram = inputs['histograms'].get(salary_class)
+        if histogram is not None:
+            counts, edges = histogram
+            ax.hist(edges[:-1], bins=edges, weights=counts, alpha=0.7, label=salary_class,
+                    color=CLASS_COLORS[salary_class])
+    ax.set_title('Salary Distribution by Classification')
+    ax.set_xlabel('Salary (USD)')
+    ax.set_ylabel('Frequency')
+    ax.legend()
+
+    # Plot 1b: Work year trend
+    ax = axes[0, 1]
+    year_salary = inputs['year_salary']
+    ax.plot(year_salary.index, year_salary.values, marker='o', linewidth=2, markersize=8)
+    ax.set_title('Average Salary Trend Over Years')
+    ax.set_xlabel('Work Year')
+    ax.set_ylabel('Average Salary (USD)')
+    ax.set_xticks(year_salary.index)
+
+    # Plot 1c: Experience level vs salary
+    ax = axes[1, 0]
+    exp_salary = inputs['exp_salary']
+    bars = ax.bar(exp_salary.index, exp_salary.values, color='lightcoral')
+    ax.set_title('Average Salary by Experience Level')
+    ax.set_xlabel('Experience Level')
+    ax.set_ylabel('Average Salary (USD)')
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height, f'${height:,.0f}', ha='center', va='bottom', fontsize=7)
+
+    # Plot 1d: Company size vs salary
+    ax = axes[1, 1]
+    size_salary = inputs['size_salary']
+    bars = ax.bar(size_salary.index, size_salary.values, color='gold')
+    ax.set_title('Average Salary by Company Size')
+    ax.set_xlabel('Company Size')
+    ax.set_ylabel('Average Salary (USD)')
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height, f'${height:,.0f}', ha='center', va='bottom', fontsize=7)
+
+def draw_top_categories(fig, inputs):
+    """Top countries and job titles, remote ratio and class share panels"""
+    axes = fig.subplots(2, 2)
+    fig.suptitle('Salary Analysis: Top Categories', fontsize=18, y=0.98)
+
+    # Plot 2a: Top countries by average salary
+    ax = axes[0, 0]
+    country_salary = inputs['country_salary']
+    ax.bar(range(len(country_salary)), country_salary.values, color='skyblue', alpha=0.7)
+    ax.set_title('Top 10 Countries by Average Salary')
+    ax.set_xlabel('Country')
+    ax.set_ylabel('Average Salary (USD)')
+    ax.set_xticks(range(len(country_salary)))
+    ax.set_xticklabels(country_salary.index, rotation=45, ha='right')
+
+    # Plot 2b: Top job titles
+    ax = axes[0, 1]
+    job_salary = inputs['job_salary']
+    ax.barh(job_salary.index, job_salary.values, color='lightgreen')
+    ax.set_title('Top 10 Highest Paying Job Titles')
+    ax.set_xlabel('Average Salary (USD)')
+    ax.invert_yaxis()
+
+    # Plot 2c: Remote ratio vs salary
+    ax = axes[1, 0]
+    remote_salary = inputs['remote_salary']
+    ax.bar(remote_salary.index.astype(str), remote_salary.values, color='lightblue')
+    ax.set_title('Average Salary by Remote Ratio')
+    ax.set_xlabel('Remote Ratio (%)')
+    ax.set_ylabel('Average Salary (USD)')
+
+    # Plot 2d: Salary classification distribution
+    ax = axes[1, 1]
+    class_counts = inputs['class_counts']
+    class_counts = class_counts[class_counts > 0]
+    if not class_counts.empty:
+        ax.pie(class_counts.values, labels=class_counts.index, autopct='%1.1f%%',
+                colors=[CLASS_COLORS.get(c, '#cccccc') for c in class_counts.index])
+    ax.set_title('Salary Classification Distribution')
+
+def _class_bars(ax, table, rot=0):
+    if not table.empty:
+        table.plot(kind='bar', ax=ax, color=[CLASS_COLORS.get(c, '#cccccc') for c in table.columns], rot=rot)
+    ax.set_ylabel('Count')
+    ax.legend(title='Salary Class')
+
+def draw_classification_dive(fig, inputs):
+    """Salary class counts against experience, company size, job title and remote ratio"""
+    axes = fig.subplots(2, 2)
+    fig.suptitle('Salary Analysis: Classification Deep Dive', fontsize=18, y=0.98)
+
+    # Plot 3a: Experience level vs classification
+    ax = axes[0, 0]
+    _class_bars(ax, inputs['exp_class'])
+    ax.set_title('Experience Level vs Salary Classification')
+    ax.set_xlabel('Experience Level')
+
+    # Plot 3b: Company size vs classification
+    ax = axes[0, 1]
+    _class_bars(ax, inputs['size_class'])
+    ax.set_title('Company Size vs Salary Classification')
+    ax.set_xlabel('Company Size')
+
+    # Plot 3c: Top job titles vs classification
+    ax = axes[1, 0]
+    _class_bars(ax, inputs['job_class'], rot=45)
+    ax.set_title('Top 10 Job Titles vs Classification')
+    ax.set_xlabel('Job Title')
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment('right')
+
+    # Plot 3d: Remote ratio vs classification
+    ax = axes[1, 1]
+    _class_bars(ax, inputs['remote_class'])
+    ax.set_title('Remote Ratio vs Salary Classification')
+    ax.set_xlabel('Remote Ratio (%)')
+
+def _value_labels(ax, bars, offset, fmt):
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width + offset, bar.get_y() + bar.get_height()/2, fmt.format(width),
+                ha='left', va='center', fontsize=9)
+
+def draw_model_comparison(fig, inputs):
+    """R², RMSE and accuracy of every model, and the best regressor's predictions"""
+    axes = fig.subplots(2, 2)
+    fig.suptitle('Model Performance Comparison', fontsize=20, y=0.98)
+    reg_results_df = inputs['regression'].sort_values('R2', ascending=True)
+    class_results_df = inputs['classification'].sort_values('Accuracy', ascending=True)
+
+    # Plot 1: Regression models R² comparison
+    ax = axes[0, 0]
+    bars = ax.barh(reg_results_df.index, reg_results_df['R2'], color='skyblue', alpha=0.8)
+    ax.set_title('Regression Models - R² Scores', fontsize=14)
+    ax.set_xlabel('R² Score', fontsize=12)
+    ax.set_ylabel('Models', fontsize=12)
+    ax.tick_params(axis='y', labelsize=10)
+    ax.grid(True, axis='x', linestyle='--', alpha=0.6)
+    _value_labels(ax, bars, 0.005, '{:.3f}')
+
+    # Plot 2: Regression models RMSE comparison
+    ax = axes[0, 1]
+    reg_results_df_rmse = inputs['regression'].sort_values('RMSE', ascending=False)
+    bars = ax.barh(reg_results_df_rmse.index, reg_results_df_rmse['RMSE'], color='lightgreen', alpha=0.8)
+    ax.set_title('Regression Models - RMSE', fontsize=14)
+    ax.set_xlabel('RMSE (USD)', fontsize=12)
+    ax.set_ylabel('') # No label to avoid clutter
+    ax.tick_params(axis='y', labelsize=10)
+    ax.grid(True, axis='x', linestyle='--', alpha=0.6)
+    _value_labels(ax, bars, 500, '${:,.0f}')
+
+    # Plot 3: Classification models accuracy comparison
+    ax = axes[1, 0]
+    bars = ax.barh(class_results_df.index, class_results_df['Accuracy'], color='lightcoral', alpha=0.8)
+    ax.set_title('Classification Models - Accuracy', fontsize=14)
+    ax.set_xlabel('Accuracy', fontsize=12)
+    ax.set_ylabel('Models', fontsize=12)
+    ax.tick_params(axis='y', labelsize=10)
+    ax.grid(True, axis='x', linestyle='--', alpha=0.6)
+    _value_labels(ax, bars, 0.005, '{:.3f}')
+
+    # Plot 4: Best regression model predictions vs actual
+    ax = axes[1, 1]
+    best_reg_name = reg_results_df.index[-1]
+    y_test, best_reg_pred = inputs['y_test'], inputs['best_predictions']
+    ax.scatter(y_test, best_reg_pred, alpha=0.5, color='royalblue')
+    ax.plot([y_test.min(), y_test.max()], [y_test.min(), y_test.max()], 'r--', lw=2)
+    ax.set_title(f'Best Model: {best_reg_name}\nPredictions vs Actual', fontsize=14)
+    ax.set_xlabel('Actual Salary (USD)', fontsize=12)
+    ax.set_ylabel('Predicted Salary (USD)', fontsize=12)
+    ax.grid(True, linestyle='--', alpha=0.6)
+
+
+# Figure name -> (output file stem, figure size, draw function)
+FIGURES = {
+    'overview': ('salary_overview_analysis', (15, 11), draw_overview),
+    'top_categories': ('top_categories_analysis', (16, 11), draw_top_categories),
+    'classification': ('classification_deep_dive', (17, 13), draw_classification_dive),
+    'model_comparison': ('model_comparison', (18, 16), draw_model_comparison)
+}
+
+
+def figure_inputs(predictor, name):
+    """The precomputed aggregates a figure is drawn from, or None if they are not available"""
+    if name == 'model_comparison':
+        if not predictor.regression_results or not predictor.classification_results:
+            return None
+        metrics = lambda results, keys: pd.DataFrame({n: {k: r[k] for k in keys} for n, r in results.items()}).T
+        regression = metrics(predictor.regression_results, ['R2', 'RMSE'])
+        best_name = regression['R2'].idxmax()
+        return {
+            'regression': regression,
+            'classification': metrics(predictor.classification_results, ['Accuracy']),
+            'y_test': np.asarray(predictor.y_test),
+            'best_predictions': np.asarray(predictor.regression_results[best_name]['predictions'])
+        }
+
+    cube = predictor.load_cube()
+    if name == 'overview':
+        return {
+            'histograms': {c: cube.histogram(c) for c in CLASS_COLORS if cube.histogram(c) is not None},
+            'year_salary': cube.mean_by('work_year'),
+            'exp_salary': cube.mean_by('experience_level').sort_values(ascending=False),
+            'size_salary': cube.mean_by('company_size')
+        }
+    if name == 'top_categories':
+        return {
+            'country_salary': cube.mean_by('employee_residence').sort_values(ascending=False).head(10),
+            'job_salary': cube.mean_by('job_title').sort_values(ascending=False).head(10),
+            'remote_salary': cube.mean_by('remote_ratio'),
+            'class_counts': cube.count_by('salary_class').sort_values(ascending=False)
+        }
+    if name == 'classification':
+        top_jobs = cube.count_by('job_title').sort_values(ascending=False).head(10).index
+        return {
+            'exp_class': cube.crosstab('experience_level'),
+            'size_class': cube.crosstab('company_size'),
+            'job_class': cube.crosstab('job_title', top_jobs),
+            'remote_class': cube.crosstab('remote_ratio')
+        }
+    raise ValueError(f"Unknown figure '{name}'; choose from {', '.join(FIGURES)}")
+
+def draw_figure(fig, name, inputs):
+    """Draw a figure into fig with the repo's plot style"""
+    with mpl_style.context(STYLE):
+        FIGURES[name][2](fig, inputs)
+        fig.tight_layout(pad=3.0, rect=[0, 0, 1, 0.96])
+    return fig
+
+
+def _update_digest(digest, value):
+    if isinstance(value, dict):
+        for key in sorted(value, key=str):
+            digest.update(repr(key).encode())
+            _update_digest(digest, value[key])
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _update_digest(digest, item)
+    elif isinstance(value, (pd.Series, pd.DataFrame)):
+        digest.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(str(value.dtype).encode() + value.tobytes())
+    else:
+        digest.update(repr(value).encode())
+
+def inputs_hash(inputs, dpi, fmt):
+    """Content hash of a figure's inputs and render settings"""
+    digest = hashlib.sha256()
+    _update_digest(digest, (inputs, dpi, fmt))
+    return digest.hexdigest()[:16]
+
+def _render_worker(name, inputs, path, dpi, fmt):
+    """Draw and save one figure on the Agg backend, without pyplot or show()"""
+    import matplotlib
+    matplotlib.use('Agg')
+    fig = mpl_figure.Figure(figsize=FIGURES[name][1])
+    draw_figure(fig, name, inputs)
+    fig.savefig(path, dpi=dpi, format=fmt, bbox_inches='tight')
+    return name, path
+
+def _load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def render_figures(predictor, names=None, output_dir='.', dpi=300, fmt='png', n_jobs=None, force=False):
+    """Render figures headlessly in parallel worker processes
+
+    A figure is skipped when its file exists and its inputs and settings hash to the
+    value recorded in the output directory's manifest, unless force is set.
+    Returns {name: 'rendered' | 'unchanged' | 'unavailable'}.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    manifest = _load_manifest(manifest_path)
+    status, pending = {}, []
+    for name in names or list(FIGURES):
+        inputs = figure_inputs(predictor, name)
+        if inputs is None:
+            status[name] = 'unavailable'
+            continue
+        path = os.path.join(output_dir, f"{FIGURES[name][0]}.{fmt}")
+        digest = inputs_hash(inputs, dpi, fmt)
+        if not force and manifest.get(path) == digest and os.path.exists(path):
+            status[name] = 'unchanged'
+            continue
+        pending.append((name, inputs, path, digest))
+
+    n_jobs = min(predictor._resolve_n_jobs(n_jobs), len(pending))
+    if n_jobs > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [executor.submit(_render_worker, name, inputs, path, dpi, fmt)
+                       for name, inputs, path, _ in pending]
+            for future in futures:
+                future.result()
+    else:
+        for name, inputs, path, _ in pending:
+            _render_worker(name, inputs, path, dpi, fmt)
+
+    for name, _, path, digest in pending:
+        manifest[path] = digest
+        status[name] = 'rendered'
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return status
+
+
+def main():
+    """Render the salary figures without a display"""
+    from salary_predictor import SalaryPredictor
+    parser = argparse.ArgumentParser(description='Render the salary figures headlessly from the aggregate cube')
+    parser.add_argument('--data', default='ds_salaries.csv')
+    parser.add_argument('--figures', default=','.join(name for name in FIGURES if name != 'model_comparison'),
+                        help=f"comma-separated figures ({', '.join(FIGURES)}); model_comparison needs trained models")
+    parser.add_argument('--output-dir', default='.')
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--format', default='png', choices=['png', 'svg'])
+    parser.add_argument('--jobs', type=int, default=-1, help='worker processes (-1 for all cores)')
+    parser.add_argument('--force', action='store_true', help='render even when the inputs are unchanged')
+    parser.add_argument('--train', action='store_true', help='train the models first so model_comparison can be drawn')
+    args = parser.parse_args()
+
+    predictor = SalaryPredictor(data_path=args.data, n_jobs=args.jobs)
+    names = [name.strip() for name in args.figures.split(',') if name.strip()]
+    if args.train:
+        from salary_data import MODEL_COLUMNS
+        predictor.load_and_explore_data(MODEL_COLUMNS)
+        predictor.create_salary_classification()
+        predictor.preprocess_data()
+        predictor.define_models()
+        predictor.train_all_models()
+        if 'model_comparison' not in names:
+            names.append('model_comparison')
+
+    status = render_figures(predictor, names, args.output_dir, args.dpi, args.format, args.jobs, args.force)
+    icons = {'rendered': '✅', 'unchanged': '⏭️ ', 'unavailable': '⚠️ '}
+    for name, state in status.items():
+        print(f"{icons[state]} {FIGURES[name][0]}.{args.format}: {state}")
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,261 @@
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier, GradientBoostingRegressor, ExtraTreesRegressor, ExtraTreesClassifier
-from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet, LogisticRegression
-from sklearn.svm import SVR, SVC
-from sklearn.tree import DecisionTreeRegressor, DecisionTreeClassifier
-from sklearn.neighbors import KNeighborsRegressor, KNeighborsClassifier
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score, classification_report, confusion_matrix
+import importlib
+import os
+import time
+import json
+from lazy_imports import LazyModule
+from model_store import ModelArtifactStore
+from prediction_cache import PredictionCache
+from salary_cube import load_or_build_cube
+from salary_figures import FIGURES, draw_figure, figure_inputs, render_figures
+from instrumentation import Instrumentation, instrumented
+from prediction_intervals import ConformalIntervals
+from feature_encoding import (ENCODINGS, OTHER_CATEGORY, bucket_rare_labels, default_position,
+                              fit_target_encoder, target_values, native_categorical_mask,
+                              NATIVE_CATEGORICAL_LIMIT)
+from salary_data import load_salaries, salary_class_codes, INPUT_COLS, MODEL_COLUMNS, PLOT_COLUMNS, SALARY_CLASSES
 import warnings
 warnings.filterwarnings('ignore')
 
+# Heavy libraries are imported on first use so the menu comes up immediately;
+# scikit-learn names are imported inside the functions that need them
+pd = LazyModule('pandas')
+plt = LazyModule('matplotlib.pyplot')
+joblib = LazyModule('joblib')
+
+# Module of every estimator class used in the model zoo
+MODEL_REGISTRY = {
+    'LinearRegression': 'sklearn.linear_model',
+    'Ridge': 'sklearn.linear_model',
+    'Lasso': 'sklearn.linear_model',
+    'ElasticNet': 'sklearn.linear_model',
+    'LogisticRegression': 'sklearn.linear_model',
+    'DecisionTreeRegressor': 'sklearn.tree',
+    'DecisionTreeClassifier': 'sklearn.tree',
+    'RandomForestRegressor': 'sklearn.ensemble',
+    'RandomForestClassifier': 'sklearn.ensemble',
+    'ExtraTreesRegressor': 'sklearn.ensemble',
+    'ExtraTreesClassifier': 'sklearn.ensemble',
+    'GradientBoostingRegressor': 'sklearn.ensemble',
+    'HistGradientBoostingRegressor': 'sklearn.ensemble',
+    'HistGradientBoostingClassifier': 'sklearn.ensemble',
+    'KNeighborsRegressor': 'sklearn.neighbors',
+    'KNeighborsClassifier': 'sklearn.neighbors',
+    'SVR': 'sklearn.svm',
+    'SVC': 'sklearn.svm',
+    'IVFNeighborsRegressor': 'neighbor_index',
+    'IVFNeighborsClassifier': 'neighbor_index',
+    'ApproximateSVR': 'approximate_svm',
+    'ApproximateSVC': 'approximate_svm',
+    'SGDRegressor': 'sklearn.linear_model',
+    'SGDClassifier': 'sklearn.linear_model',
+    'SalaryThresholdClassifier': 'joint_models'
+}
+
+def model_class(class_name):
+    """Resolve an estimator class from MODEL_REGISTRY, importing its module on first use"""
+    return getattr(importlib.import_module(MODEL_REGISTRY[class_name]), class_name)
+
+# Ordinal encodings for the low-cardinality categorical columns
+ORDINAL_MAPPINGS = {
+    'experience_level': {'EN': 1, 'MI': 2, 'SE': 3, 'EX': 4},
+    'employment_type': {'PT': 1, 'FT': 2, 'CT': 3, 'FL': 4},
+    'company_size': {'S': 1, 'M': 2, 'L': 3}
+}
+
+# High-cardinality columns encoded with a fitted LabelEncoder
+LABEL_ENCODED_COLS = ['job_title', 'employee_residence', 'company_location']
+
+# Threshold schemes for the salary classes: fixed USD cut-offs, dataset quantiles,
+# or quantiles computed separately for each value of the 'by' column
+SALARY_SCHEMES = {
+    'fixed': {'type': 'fixed', 'low': 100000, 'high': 160000},
+    'quantile': {'type': 'quantile', 'low': 1 / 3, 'high': 2 / 3},
+    'country': {'type': 'quantile', 'low': 1 / 3, 'high': 2 / 3, 'by': 'employee_residence'}
+}
+
+# The four SVM entries of the model zoo, which can be swapped for kernel approximations
+SVM_MODELS = ['SVR (RBF)', 'SVR (Linear)', 'SVC (RBF)', 'SVC (Linear)']
+
+# How the models are trained; 'streaming' fits SGD models out of core and the tree models on a sample
+TRAINING_MODES = ('in-memory', 'streaming')
+
+# Zoo models kept by streaming training, which fits them on a reservoir sample of the stream
+STREAMING_TREE_TYPES = ('DecisionTree', 'RandomForest', 'ExtraTrees', 'GradientBoosting', 'HistGradientBoosting')
+
+# Classifiers that joint training replaces with salary_thresholds applied to a regressor of the same family
+JOINT_FAMILIES = {
+    'Decision Tree Classifier': 'Decision Tree',
+    'Random Forest Classifier': 'Random Forest',
+    'Extra Trees Classifier': 'Extra Trees',
+    'Hist Gradient Boosting Classifier': 'Hist Gradient Boosting'
+}
+
+# Model input columns, in the order the models are trained on
+FEATURE_COLS = [
+    'work_year', 'experience_level_encoded', 'employment_type_encoded',
+    'job_title_encoded', 'employee_residence_encoded', 'remote_ratio',
+    'company_location_encoded', 'company_size_encoded'
+]
+
+
+def needs_scaling(model_name):
+    """Return True if the named model is trained on standardized features"""
+    return 'SVR' in model_name or 'SVC' in model_name or 'K-Neighbors' in model_name
+
+
+def profile_key(profile):
+    """Normalized, hashable form of a raw profile: INPUT_COLS order, ints for numbers, strings otherwise"""
+    return tuple(int(profile[col]) if col in ('work_year', 'remote_ratio') else str(profile[col])
+                 for col in INPUT_COLS)
+
+
+def _config_params(model):
+    """A model's parameters for the artifact key, nested estimators included
+    
+    categorical_features is left out: the histogram boosting mask follows from the encoding
+    and the label counts of the data, which the key already covers, and a fresh predictor
+    checking the key has not read the data yet.
+    """
+    return {name: _config_params(value) if hasattr(value, 'get_params') else value
+            for name, value in model.get_params(deep=False).items() if name != 'categorical_features'}
+
+
+def predict_overrides_proba(model):
+    """Whether a classifier's predict can disagree with the argmax of its predict_proba, and must be used
+    
+    True for Platt-scaled SVC probabilities (probability=True) and for models that set a
+    predict_overrides_proba flag, like the joint classifiers whose probabilities are tree votes.
+    """
+    return bool(getattr(model, 'predict_overrides_proba', False) or getattr(model, 'probability', False))
+
+
+def fit_and_evaluate(task, model, X_train, y_train, X_test, y_test, instrumentation=None, name=None, **fit_params):
+    """Fit a single model and compute its test-set metrics, as 'fit' and 'predict' stages if instrumented"""
+    with instrumented(instrumentation, 'fit', model=name, task=task):
+        model.fit(X_train, y_train, **fit_params)
+    with instrumented(instrumentation, 'predict', model=name, task=task):
+        return evaluate_model(task, model, X_test, y_test)
+
+
+def evaluate_model(task, model, X_test, y_test):
+    """Compute the test-set metrics of an already fitted model"""
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    y_pred = model.predict(X_test)
+    
+    if task == 'regression':
+        return {
+            'MAE': mean_absolute_error(y_test, y_pred),
+            'RMSE': np.sqrt(mean_squared_error(y_test, y_pred)),
+            'R2': r2_score(y_test, y_pred),
+            'model': model,
+            'predictions': y_pred
+        }
+    
+    y_pred_proba = model.predict_proba(X_test) if hasattr(model, 'predict_proba') else None
+    return {
+        'Accuracy': (y_pred == y_test).mean(),
+        'model': model,
+        'predictions': y_pred,
+        'probabilities': y_pred_proba
+    }
+
+
+# Per-process cache of the memory-mapped training arrays
+_shared_arrays = {}
+
+def _load_shared(path, columns=None):
+    """Memory-map a dumped array once per worker process"""
+    if path not in _shared_arrays:
+        array = joblib.load(path, mmap_mode='r')
+        if columns is not None:
+            array = pd.DataFrame(array, columns=columns, copy=False)
+        _shared_arrays[path] = array
+    return _shared_arrays[path]
+
+def _train_model_worker(task, name, model, paths, n_train, columns, instrumentation_config=None):
+    """Process-pool entry point: fit one model on the shared arrays
+    
+    With instrumentation_config, the worker's stage records are returned in result['stages'].
+    """
+    target = 'y_train' if task == 'regression' else 'y_train_class'
+    truth = 'y_test' if task == 'regression' else 'y_test_class'
+    if needs_scaling(name):
+        features = _load_shared(paths['features_scaled'])
+    else:
+        features = _load_shared(paths['features'], columns)
+    # Training rows come first in the feature store, so both splits are slices
+    X_train, X_test = features[:n_train], features[n_train:]
+    instrumentation = Instrumentation(**instrumentation_config) if instrumentation_config else None
+    result = fit_and_evaluate(task, model, X_train, _load_shared(paths[target]),
+                              X_test, _load_shared(paths[truth]), instrumentation, name)
+    if instrumentation is not None:
+        result['stages'] = instrumentation.records
+    return task, name, result
+
+def _cross_validate_fold(task, name, model, X, y, train_idx, test_idx):
+    """Fit a fresh copy of a model on one CV fold and return its score and compute time"""
+    from sklearn.base import clone
+    from sklearn.metrics import r2_score
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+    start = time.perf_counter()
+    estimator = clone(model)
+    if needs_scaling(name):
+        # Scale inside the fold so the held-out part doesn't leak into the scaler
+        estimator = make_pipeline(StandardScaler(), estimator)
+    estimator.fit(X[train_idx], y[train_idx])
+    y_pred = estimator.predict(X[test_idx])
+    if task == 'regression':
+        score = r2_score(y[test_idx], y_pred)
+    else:
+        score = (y_pred == y[test_idx]).mean()
+    return task, name, score, time.perf_counter() - start
+
+
 class SalaryPredictor:
-    def __init__(self, data_path='ds_salaries.csv'):
+    def __init__(self, data_path='ds_salaries.csv', n_jobs=1, selection='holdout', cv_folds=5,
+                 tuned_params_path='best_params.json', salary_scheme='fixed', kernel_approximation=(),
+                 prediction_cache=None, instrumentation=None, encoding='label', min_category_count=1,
+                 max_categories=None, joint_training=False, ensemble=False, ensemble_latency_budget_ms=None,
+                 ensemble_max_members=3, interval_coverage=0.9, training_mode='in-memory'):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"encoding must be one of {ENCODINGS}, not '{encoding}'")
+        if training_mode not in TRAINING_MODES:
+            raise ValueError(f"training_mode must be one of {TRAINING_MODES}, not '{training_mode}'")
+        if training_mode == 'streaming' and (joint_training or ensemble):
+            raise ValueError("joint_training and ensemble need the full data; use training_mode='in-memory'")
+        if joint_training and selection == 'cv':
+            raise ValueError("joint_training derives classes from the holdout-trained regressors; use selection='holdout'")
+        if ensemble and selection == 'cv':
+            raise ValueError("ensembles are blended from holdout predictions; use selection='holdout'")
         self.data_path = data_path
+        # Name of a SALARY_SCHEMES entry, or a scheme dict, used for the salary_class column
+        self.salary_scheme = salary_scheme
+        # Hyperparameters found by hyperparameter_search.py override the defaults in define_models
+        self.tuned_params_path = tuned_params_path
+        self.n_jobs = n_jobs
+        # 'holdout' picks the best models by test-split score, 'cv' by k-fold cross-validation
+        self.selection = selection
+        self.cv_folds = cv_folds
+        # SVM_MODELS entries to train as Nyström/linear approximations ('all' for every one)
+        self.kernel_approximation = SVM_MODELS if kernel_approximation == 'all' else list(kernel_approximation)
+        # 'in-memory' for train_all_models, 'streaming' for streaming_training.train_streaming; part of
+        # the artifact key, so a predictor only loads models trained the way it asks for
+        self.training_mode = training_mode
+        # Classify with the JOINT_FAMILIES regressors' predicted salaries instead of separate tree fits
+        self.joint_training = joint_training
+        # Blend the trained models' holdout predictions into stacked ensembles (salary_ensemble.py) before
+        # picking the best models; members must fit in the summed single-row latency budget
+        self.ensemble = ensemble
+        self.ensemble_latency_budget_ms = ensemble_latency_budget_ms
+        self.ensemble_max_members = ensemble_max_members
+        # Target coverage of the salary intervals, conformal-calibrated on the holdout for the best regressor
+        self.interval_coverage = interval_coverage
+        self.prediction_intervals = None
         self.data = None
+        # Aggregate cube the summary and plots are answered from (salary_cube.SalaryCube)
+        self.cube = None
         self.X_train = None
         self.X_test = None
         self.y_train = None
@@ -24,24 +263,58 @@ class SalaryPredictor:
         self.y_train_class = None
         self.y_test_class = None
         self.label_encoders = {}
-        self.scaler = StandardScaler()
+        # Labels added after training by incremental_refresh, {column: {label: code}}; their codes
+        # follow the encoder's, and the LabelEncoder itself is left untouched (its classes_ stay sorted)
+        self.appended_labels = {}
+        # 'label' codes or out-of-fold 'target' encoding of LABEL_ENCODED_COLS (then fitted in target_encoder)
+        self.encoding = encoding
+        self.target_encoder = None
+        # Labels rarer than min_category_count, or beyond the max_categories most frequent, share one 'Other' code
+        self.min_category_count = min_category_count
+        self.max_categories = max_categories
+        # float32 feature store (training rows first) and its lazily scaled copy
+        self.features = None
+        self.n_train = 0
+        self._features_scaled = None
+        # Fitted in preprocess_data, or restored with the models
+        self.scaler = None
         self.regression_models = {}
         self.classification_models = {}
         self.regression_results = {}
         self.classification_results = {}
+        self.cv_results = {}
         self.best_regression_model = None
         self.best_classification_model = None
+        self.best_regression_name = None
+        self.best_classification_name = None
+        self.best_model_scores = {}
         self.salary_thresholds = {}
+        self._lookup_tables = None
+        # Identifies the current best models; cached predictions of other versions are dropped
+        self.model_version = None
+        # Optional PredictionCache in front of predict_salary_and_classification
+        self.prediction_cache = prediction_cache
+        # Optional instrumentation.Instrumentation timing the public methods and every model fit/predict
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.wrap(self)
+        
+    def load_and_explore_data(self, columns=None):
+        """Load and explore the dataset
         
-    def load_and_explore_data(self):
-        """Load and explore the dataset"""
+        The data is read with explicit dtypes through a memory-mapped Arrow cache
+        next to the CSV; columns limits loading to the columns a caller needs.
+        """
         print("Loading dataset...")
-        self.data = pd.read_csv(self.data_path)
+        self.data = load_salaries(self.data_path, columns=columns)
+        self.cube = None
         
         print(f"Dataset shape: {self.data.shape}")
         print(f"Columns: {list(self.data.columns)}")
-        print(f"Unique countries: {self.data['employee_residence'].nunique()}")
-        print(f"Unique job titles: {self.data['job_title'].nunique()}")
+        if 'employee_residence' in self.data:
+            print(f"Unique countries: {self.data['employee_residence'].nunique()}")
+        if 'job_title' in self.data:
+            print(f"Unique job titles: {self.data['job_title'].nunique()}")
         
         # Show salary statistics
         print(f"\nSalary statistics (USD):")
@@ -52,197 +325,116 @@ class SalaryPredictor:
         
         return self.data
     
-    def create_salary_classification(self):
-        """Create salary classification (Low/Medium/High)"""
+    def _resolve_scheme(self, scheme):
+        """Compute (low, high, by) thresholds of a scheme; per-group thresholds are dicts"""
+        spec = SALARY_SCHEMES[scheme] if isinstance(scheme, str) else scheme
+        if spec['type'] == 'fixed':
+            return spec['low'], spec['high'], None
+        
+        salaries = self.data['salary_in_usd']
+        if 'by' not in spec:
+            low, high = salaries.quantile([spec['low'], spec['high']])
+            return low, high, None
+        
+        table = salaries.groupby(self.data[spec['by']], observed=True).quantile([spec['low'], spec['high']]).unstack()
+        return table[spec['low']].to_dict(), table[spec['high']].to_dict(), spec['by']
+    
+    def create_salary_classification(self, schemes=None):
+        """Create salary classification (Low/Medium/High)
+        
+        The first scheme (default: self.salary_scheme) fills 'salary_class'; every
+        further scheme is stored as 'salary_class_<name>'. All schemes are binned
+        together in one vectorized pass and stored as compact categoricals.
+        """
         print("\nCreating salary classification...")
         
-        # Use fixed thresholds for classification
-        low_threshold = 100000
-        high_threshold = 160000
+        schemes = list(schemes) if schemes else [self.salary_scheme]
+        names = [scheme if isinstance(scheme, str) else scheme.get('name', f'custom_{i}')
+                 for i, scheme in enumerate(schemes)]
         
-        def classify_salary(salary):
-            if salary < low_threshold:
-                return 'Low'
-            elif salary <= high_threshold:
-                return 'Medium'
+        salaries = self.data['salary_in_usd'].to_numpy()
+        lows = np.empty((len(salaries), len(schemes)))
+        highs = np.empty((len(salaries), len(schemes)))
+        resolved = []
+        for j, scheme in enumerate(schemes):
+            low, high, by = self._resolve_scheme(scheme)
+            if by is None:
+                lows[:, j], highs[:, j] = low, high
             else:
-                return 'High'
+                groups = self.data[by]
+                lows[:, j] = groups.map(low).to_numpy(dtype=float)
+                highs[:, j] = groups.map(high).to_numpy(dtype=float)
+            resolved.append((low, high, by))
         
-        self.data['salary_class'] = self.data['salary_in_usd'].apply(classify_salary)
+        # One pass over the salaries for all schemes
+        codes = salary_class_codes(salaries[:, None], lows, highs)
+        for j, name in enumerate(names):
+            column = 'salary_class' if j == 0 else f'salary_class_{name}'
+            self.data[column] = pd.Categorical.from_codes(codes[:, j], categories=SALARY_CLASSES)
         
-        # Store thresholds for later use
+        # Store thresholds of the primary scheme for later use
+        low_threshold, high_threshold, by = resolved[0]
         self.salary_thresholds = {
             'Low': low_threshold,
             'Medium': high_threshold,
             'High': self.data['salary_in_usd'].max()
         }
+        if by is not None:
+            self.salary_thresholds['by'] = by
         
         # Show classification distribution
         class_dist = self.data['salary_class'].value_counts()
-        print(f"\nSalary Classification Distribution:")
-        print(f"Low (<${low_threshold:,}): {class_dist.get('Low', 0)} ({class_dist.get('Low', 0)/len(self.data)*100:.1f}%)")
-        print(f"Medium (${low_threshold:,}-${high_threshold:,}): {class_dist.get('Medium', 0)} ({class_dist.get('Medium', 0)/len(self.data)*100:.1f}%)")
-        print(f"High (>${high_threshold:,}): {class_dist.get('High', 0)} ({class_dist.get('High', 0)/len(self.data)*100:.1f}%)")
+        print(f"\nSalary Classification Distribution ({names[0]} thresholds):")
+        if by is None:
+            print(f"Low (<${low_threshold:,.0f}): {class_dist.get('Low', 0)} ({class_dist.get('Low', 0)/len(self.data)*100:.1f}%)")
+            print(f"Medium (${low_threshold:,.0f}-${high_threshold:,.0f}): {class_dist.get('Medium', 0)} ({class_dist.get('Medium', 0)/len(self.data)*100:.1f}%)")
+            print(f"High (>${high_threshold:,.0f}): {class_dist.get('High', 0)} ({class_dist.get('High', 0)/len(self.data)*100:.1f}%)")
+        else:
+            for class_name in SALARY_CLASSES:
+                print(f"{class_name} (per {by} quantiles): {class_dist.get(class_name, 0)} ({class_dist.get(class_name, 0)/len(self.data)*100:.1f}%)")
         
         return self.data
     
-    def create_overview_plot(self):
-        """Generates and saves the salary overview plot."""
-        plt.style.use('seaborn-v0_8')
-        colors = {'Low': 'red', 'Medium': 'orange', 'High': 'green'}
-        fig, axes = plt.subplots(2, 2, figsize=(15, 11))
-        fig.suptitle('Salary Analysis: Overview', fontsize=18, y=0.98)
-        
-        # Plot 1a: Salary distribution
-        ax = axes[0, 0]
-        for salary_class in ['Low', 'Medium', 'High']:
-            subset = self.data[self.data['salary_class'] == salary_class]
-            if not subset.empty:
-                ax.hist(subset['salary_in_usd'], bins=30, alpha=0.7, label=salary_class, color=colors[salary_class])
-        ax.set_title('Salary Distribution by Classification')
-        ax.set_xlabel('Salary (USD)')
-        ax.set_ylabel('Frequency')
-        ax.legend()
-
-        # Plot 1b: Work year trend
-        ax = axes[0, 1]
-        year_salary = self.data.groupby('work_year')['salary_in_usd'].mean()
-        ax.plot(year_salary.index, year_salary.values, marker='o', linewidth=2, markersize=8)
-        ax.set_title('Average Salary Trend Over Years')
-        ax.set_xlabel('Work Year')
-        ax.set_ylabel('Average Salary (USD)')
-        ax.set_xticks(year_salary.index)
-
-        # Plot 1c: Experience level vs salary
-        ax = axes[1, 0]
-        exp_salary = self.data.groupby('experience_level')['salary_in_usd'].mean().sort_values(ascending=False)
-        bars = ax.bar(exp_salary.index, exp_salary.values, color='lightcoral')
-        ax.set_title('Average Salary by Experience Level')
-        ax.set_xlabel('Experience Level')
-        ax.set_ylabel('Average Salary (USD)')
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height, f'${height:,.0f}', ha='center', va='bottom', fontsize=7)
-
-        # Plot 1d: Company size vs salary
-        ax = axes[1, 1]
-        size_salary = self.data.groupby('company_size')['salary_in_usd'].mean()
-        bars = ax.bar(size_salary.index, size_salary.values, color='gold')
-        ax.set_title('Average Salary by Company Size')
-        ax.set_xlabel('Company Size')
-        ax.set_ylabel('Average Salary (USD)')
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height, f'${height:,.0f}', ha='center', va='bottom', fontsize=7)
-        
-        fig.tight_layout(pad=3.0, rect=[0, 0, 1, 0.96])
-        plt.savefig('salary_overview_analysis.png', dpi=300, bbox_inches='tight')
+    def load_cube(self):
+        """Make the aggregate cube available, reading it from disk or building it from the data"""
+        if self.cube is not None:
+            return self.cube
+        
+        def load_data():
+            if self.data is None or 'salary_class' not in self.data:
+                self.load_and_explore_data(PLOT_COLUMNS)
+                self.create_salary_classification()
+            return self.data, self.salary_thresholds
+        
+        start = time.perf_counter()
+        self.cube, built = load_or_build_cube(self.data_path, self.salary_scheme, load_data)
+        if not self.salary_thresholds:
+            self.salary_thresholds = self.cube.thresholds
+        action = 'Built' if built else 'Loaded'
+        print(f"🧊 {action} aggregate cube ({len(self.cube.cells):,} cells) in {time.perf_counter() - start:.3f}s")
+        return self.cube
+    
+    def _show_figure(self, name):
+        """Draw one of salary_figures.FIGURES with pyplot, save it at 300 dpi and show it"""
+        fig = plt.figure(figsize=FIGURES[name][1])
+        draw_figure(fig, name, figure_inputs(self, name))
+        filename = f"{FIGURES[name][0]}.png"
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
         plt.show()
         plt.close(fig)
-        print("✅ Saved 'salary_overview_analysis.png'")
+        return filename
+    
+    def create_overview_plot(self):
+        """Generates and saves the salary overview plot."""
+        print(f"✅ Saved '{self._show_figure('overview')}'")
 
     def create_top_categories_plot(self):
         """Generates and saves the top categories plot."""
-        plt.style.use('seaborn-v0_8')
-        colors = {'Low': 'red', 'Medium': 'orange', 'High': 'green'}
-        fig, axes = plt.subplots(2, 2, figsize=(16, 11))
-        fig.suptitle('Salary Analysis: Top Categories', fontsize=18, y=0.98)
-
-        # Plot 2a: Top countries by average salary
-        ax = axes[0, 0]
-        country_salary = self.data.groupby('employee_residence')['salary_in_usd'].mean().sort_values(ascending=False).head(10)
-        ax.bar(range(len(country_salary)), country_salary.values, color='skyblue', alpha=0.7)
-        ax.set_title('Top 10 Countries by Average Salary')
-        ax.set_xlabel('Country')
-        ax.set_ylabel('Average Salary (USD)')
-        ax.set_xticks(range(len(country_salary)))
-        ax.set_xticklabels(country_salary.index, rotation=45, ha='right')
-
-        # Plot 2b: Top job titles
-        ax = axes[0, 1]
-        job_salary = self.data.groupby('job_title')['salary_in_usd'].mean().sort_values(ascending=False).head(10)
-        ax.barh(job_salary.index, job_salary.values, color='lightgreen')
-        ax.set_title('Top 10 Highest Paying Job Titles')
-        ax.set_xlabel('Average Salary (USD)')
-        ax.invert_yaxis()
-
-        # Plot 2c: Remote ratio vs salary
-        ax = axes[1, 0]
-        remote_salary = self.data.groupby('remote_ratio')['salary_in_usd'].mean()
-        ax.bar(remote_salary.index.astype(str), remote_salary.values, color='lightblue')
-        ax.set_title('Average Salary by Remote Ratio')
-        ax.set_xlabel('Remote Ratio (%)')
-        ax.set_ylabel('Average Salary (USD)')
-
-        # Plot 2d: Salary classification distribution
-        ax = axes[1, 1]
-        class_counts = self.data['salary_class'].value_counts()
-        if not class_counts.empty:
-            ax.pie(class_counts.values, labels=class_counts.index, autopct='%1.1f%%', 
-                    colors=[colors.get(c, '#cccccc') for c in class_counts.index])
-        ax.set_title('Salary Classification Distribution')
-
-        fig.tight_layout(pad=3.0, rect=[0, 0, 1, 0.96])
-        plt.savefig('top_categories_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
-        plt.close(fig)
-        print("✅ Saved 'top_categories_analysis.png'")
+        print(f"✅ Saved '{self._show_figure('top_categories')}'")
 
     def create_classification_dive_plot(self):
         """Generates and saves the classification deep dive plot."""
-        plt.style.use('seaborn-v0_8')
-        colors = {'Low': 'red', 'Medium': 'orange', 'High': 'green'}
-        fig, axes = plt.subplots(2, 2, figsize=(17, 13))
-        fig.suptitle('Salary Analysis: Classification Deep Dive', fontsize=18, y=0.98)
-
-        # Plot 3a: Experience level vs classification
-        ax = axes[0, 0]
-        exp_class = pd.crosstab(self.data['experience_level'], self.data['salary_class'])
-        if not exp_class.empty:
-            exp_class.plot(kind='bar', ax=ax, color=[colors.get(c, '#cccccc') for c in exp_class.columns], rot=0)
-        ax.set_title('Experience Level vs Salary Classification')
-        ax.set_xlabel('Experience Level')
-        ax.set_ylabel('Count')
-        ax.legend(title='Salary Class')
-
-        # Plot 3b: Company size vs classification
-        ax = axes[0, 1]
-        size_class = pd.crosstab(self.data['company_size'], self.data['salary_class'])
-        if not size_class.empty:
-            size_class.plot(kind='bar', ax=ax, color=[colors.get(c, '#cccccc') for c in size_class.columns], rot=0)
-        ax.set_title('Company Size vs Salary Classification')
-        ax.set_xlabel('Company Size')
-        ax.set_ylabel('Count')
-        ax.legend(title='Salary Class')
-
-        # Plot 3c: Top job titles vs classification
-        ax = axes[1, 0]
-        top_jobs = self.data['job_title'].value_counts().head(10).index
-        job_class_data = self.data[self.data['job_title'].isin(top_jobs)]
-        job_class = pd.crosstab(job_class_data['job_title'], job_class_data['salary_class'])
-        if not job_class.empty:
-            job_class.plot(kind='bar', ax=ax, color=[colors.get(c, '#cccccc') for c in job_class.columns])
-        ax.set_title('Top 10 Job Titles vs Classification')
-        ax.set_xlabel('Job Title')
-        ax.set_ylabel('Count')
-        ax.legend(title='Salary Class')
-        plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
-
-        # Plot 3d: Remote ratio vs classification
-        ax = axes[1, 1]
-        remote_class = pd.crosstab(self.data['remote_ratio'], self.data['salary_class'])
-        if not remote_class.empty:
-            remote_class.plot(kind='bar', ax=ax, color=[colors.get(c, '#cccccc') for c in remote_class.columns], rot=0)
-        ax.set_title('Remote Ratio vs Salary Classification')
-        ax.set_xlabel('Remote Ratio (%)')
-        ax.set_ylabel('Count')
-        ax.legend(title='Salary Class')
-
-        fig.tight_layout(pad=3.0, rect=[0, 0, 1, 0.96])
-        plt.savefig('classification_deep_dive.png', dpi=300, bbox_inches='tight')
-        plt.show()
-        plt.close(fig)
-        print("✅ Saved 'classification_deep_dive.png'")
+        print(f"✅ Saved '{self._show_figure('classification')}'")
         
     def create_comprehensive_visualizations(self):
         """Create all comprehensive visualizations."""
@@ -254,289 +446,710 @@ class SalaryPredictor:
     def preprocess_data(self):
         """Preprocess the data for machine learning"""
         print("\nPreprocessing data...")
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import LabelEncoder, StandardScaler
         
-        df = self.data.copy()
-        
-        # Feature engineering
-        exp_mapping = {'EN': 1, 'MI': 2, 'SE': 3, 'EX': 4}
-        emp_mapping = {'PT': 1, 'FT': 2, 'CT': 3, 'FL': 4}
-        size_mapping = {'S': 1, 'M': 2, 'L': 3}
-        
-        df['experience_level_encoded'] = df['experience_level'].map(exp_mapping)
-        df['employment_type_encoded'] = df['employment_type'].map(emp_mapping)
-        df['company_size_encoded'] = df['company_size'].map(size_mapping)
-        
-        # Encode categorical variables
-        categorical_cols = ['job_title', 'employee_residence', 'company_location']
-        for col in categorical_cols:
-            le = LabelEncoder()
-            df[f'{col}_encoded'] = le.fit_transform(df[col])
-            self.label_encoders[col] = le
-        
-        # Select features
-        feature_cols = [
-            'work_year', 'experience_level_encoded', 'employment_type_encoded',
-            'job_title_encoded', 'employee_residence_encoded', 'remote_ratio',
-            'company_location_encoded', 'company_size_encoded'
-        ]
+        # Fit the label encoders; every feature is then encoded through the lookup tables
+        for col in LABEL_ENCODED_COLS:
+            labels = self.data[col]
+            if self.buckets_rare_labels:
+                labels, n_bucketed = bucket_rare_labels(labels, self.min_category_count, self.max_categories)
+                if n_bucketed:
+                    print(f"   {col}: {n_bucketed} rare labels bucketed into '{OTHER_CATEGORY}'")
+            self.label_encoders[col] = LabelEncoder().fit(labels)
+        self.appended_labels = {}
+        self.target_encoder = None
+        self._lookup_tables = None
         
-        X = df[feature_cols]
-        y_regression = df['salary_in_usd']
-        y_classification = df['salary_class']
+        # Same rows as train_test_split on the full frame, stored train-first in one float32
+        # matrix so the splits are views instead of copies
+        train_idx, test_idx = train_test_split(np.arange(len(self.data)), test_size=0.2, random_state=42)
+        order = np.concatenate([train_idx, test_idx])
+        self.n_train = len(train_idx)
+        self.features = np.empty((len(order), len(FEATURE_COLS)), dtype=np.float32)
+        for j, (col, codes) in enumerate(self._encoded_columns(self.data)):
+            self.features[:, j] = codes[order]
+        self._features_scaled = None
         
-        # Split data
-        self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
-            X, y_regression, test_size=0.2, random_state=42
-        )
+        if self.encoding == 'target':
+            # Out-of-fold encodings for the training rows, encodings fitted on all of them for the test rows
+            columns = [FEATURE_COLS.index(f'{col}_encoded') for col in LABEL_ENCODED_COLS]
+            codes = self.features[:, columns].astype(np.int64)
+            salaries = self.data['salary_in_usd'].to_numpy(dtype=np.float64)[train_idx]
+            self.target_encoder, encoded_train = fit_target_encoder(codes[:self.n_train], salaries)
+            self.features[:self.n_train, columns] = encoded_train
+            self.features[self.n_train:, columns] = self.target_encoder.transform(codes[self.n_train:])
+            self._lookup_tables = None
         
-        # Split classification data with same indices
-        _, _, self.y_train_class, self.y_test_class = train_test_split(
-            X, y_classification, test_size=0.2, random_state=42
-        )
+        index = self.data.index[order]
+        X = pd.DataFrame(self.features, index=index, columns=FEATURE_COLS, copy=False)
+        y_regression = self.data['salary_in_usd'].iloc[order]
+        y_classification = self.data['salary_class'].iloc[order]
+        self.X_train, self.X_test = X.iloc[:self.n_train], X.iloc[self.n_train:]
+        self.y_train, self.y_test = y_regression.iloc[:self.n_train], y_regression.iloc[self.n_train:]
+        self.y_train_class, self.y_test_class = y_classification.iloc[:self.n_train], y_classification.iloc[self.n_train:]
         
-        # Scale features
-        self.X_train_scaled = self.scaler.fit_transform(self.X_train)
-        self.X_test_scaled = self.scaler.transform(self.X_test)
+        # Only the statistics are computed here; the scaled matrix is built on first use
+        self.scaler = StandardScaler().fit(self.X_train)
         
         print(f"Training set: {self.X_train.shape[0]} samples")
         print(f"Test set: {self.X_test.shape[0]} samples")
+        print(f"Feature store: {self.features.nbytes / 1024:,.0f} KB ({self.features.dtype}, train/test as views)")
         
         return X, y_regression, y_classification
     
+    @property
+    def buckets_rare_labels(self):
+        return self.min_category_count > 1 or self.max_categories is not None
+    
+    @property
+    def X_train_scaled(self):
+        """Standardized training features, for the models that need scaling"""
+        if self.features is None:
+            return self.scaler.transform(self.X_train)
+        return self._scaled_features()[:self.n_train]
+    
+    @property
+    def X_test_scaled(self):
+        """Standardized test features, for the models that need scaling"""
+        if self.features is None:
+            return self.scaler.transform(self.X_test)
+        return self._scaled_features()[self.n_train:]
+    
+    def _scaled_features(self):
+        """Scale the feature store once, in float32, on first use"""
+        if self._features_scaled is None:
+            scaled = self.features - self.scaler.mean_.astype(np.float32)
+            scaled /= self.scaler.scale_.astype(np.float32)
+            self._features_scaled = scaled
+        return self._features_scaled
+    
     def define_models(self):
         """Define all machine learning models"""
         print("\nDefining machine learning models...")
         
+        # The histogram boosting models split label codes as unordered categories
+        hist_params = dict(categorical_features=self.native_categorical_features(), max_iter=500,
+                           early_stopping=True, random_state=42)
+        
         # Regression models for exact salary prediction
         self.regression_models = {
-            'Linear Regression': LinearRegression(),
-            'Ridge Regression': Ridge(alpha=1.0),
-            'Lasso Regression': Lasso(alpha=0.1),
-            'Elastic Net': ElasticNet(alpha=0.1, l1_ratio=0.5),
-            'Decision Tree': DecisionTreeRegressor(random_state=42, max_depth=10),
-            'Random Forest': RandomForestRegressor(n_estimators=100, random_state=42),
-            'Extra Trees': ExtraTreesRegressor(n_estimators=100, random_state=42),
-            'Gradient Boosting': GradientBoostingRegressor(n_estimators=100, random_state=42),
-            'K-Neighbors': KNeighborsRegressor(n_neighbors=5),
-            'SVR (RBF)': SVR(kernel='rbf', C=100, gamma='scale'),
-            'SVR (Linear)': SVR(kernel='linear', C=100)
+            'Linear Regression': model_class('LinearRegression')(),
+            'Ridge Regression': model_class('Ridge')(alpha=1.0),
+            'Lasso Regression': model_class('Lasso')(alpha=0.1),
+            'Elastic Net': model_class('ElasticNet')(alpha=0.1, l1_ratio=0.5),
+            'Decision Tree': model_class('DecisionTreeRegressor')(random_state=42, max_depth=10),
+            'Random Forest': model_class('RandomForestRegressor')(n_estimators=100, random_state=42),
+            'Extra Trees': model_class('ExtraTreesRegressor')(n_estimators=100, random_state=42),
+            'Gradient Boosting': model_class('GradientBoostingRegressor')(n_estimators=100, random_state=42),
+            'Hist Gradient Boosting': model_class('HistGradientBoostingRegressor')(**hist_params),
+            'K-Neighbors': model_class('KNeighborsRegressor')(n_neighbors=5),
+            'K-Neighbors (IVF)': model_class('IVFNeighborsRegressor')(n_neighbors=5, n_probe=8),
+            'SVR (RBF)': self.make_svm('SVR (RBF)', kernel='rbf', C=100, gamma='scale'),
+            'SVR (Linear)': self.make_svm('SVR (Linear)', kernel='linear', C=100)
         }
         
         # Classification models for salary classification (Low/Medium/High)
         self.classification_models = {
-            'Logistic Regression': LogisticRegression(random_state=42, max_iter=1000),
-            'Decision Tree Classifier': DecisionTreeClassifier(random_state=42, max_depth=10),
-            'Random Forest Classifier': RandomForestClassifier(n_estimators=100, random_state=42),
-            'Extra Trees Classifier': ExtraTreesClassifier(n_estimators=100, random_state=42),
-            'K-Neighbors Classifier': KNeighborsClassifier(n_neighbors=5),
-            'SVC (RBF)': SVC(kernel='rbf', C=100, gamma='scale', probability=True),
-            'SVC (Linear)': SVC(kernel='linear', C=100, probability=True)
+            'Logistic Regression': model_class('LogisticRegression')(random_state=42, max_iter=1000),
+            'Decision Tree Classifier': model_class('DecisionTreeClassifier')(random_state=42, max_depth=10),
+            'Random Forest Classifier': model_class('RandomForestClassifier')(n_estimators=100, random_state=42),
+            'Extra Trees Classifier': model_class('ExtraTreesClassifier')(n_estimators=100, random_state=42),
+            'Hist Gradient Boosting Classifier': model_class('HistGradientBoostingClassifier')(**hist_params),
+            'K-Neighbors Classifier': model_class('KNeighborsClassifier')(n_neighbors=5),
+            'K-Neighbors Classifier (IVF)': model_class('IVFNeighborsClassifier')(n_neighbors=5, n_probe=8),
+            'SVC (RBF)': self.make_svm('SVC (RBF)', kernel='rbf', C=100, gamma='scale'),
+            'SVC (Linear)': self.make_svm('SVC (Linear)', kernel='linear', C=100)
         }
         
+        self.apply_tuned_params()
+        if self.training_mode == 'streaming':
+            self.define_streaming_models()
+        if self.joint_training:
+            self.define_joint_classifiers()
+        
         print(f"Regression models: {len(self.regression_models)}")
         print(f"Classification models: {len(self.classification_models)}")
     
-    def train_all_models(self):
-        """Train all regression and classification models"""
+    def define_streaming_models(self):
+        """Keep the STREAMING_TREE_TYPES models and add the SGD models streaming training fits chunk by chunk"""
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        regression_trees = {name: model for name, model in self.regression_models.items()
+                            if type(model).__name__.startswith(STREAMING_TREE_TYPES)}
+        classification_trees = {name: model for name, model in self.classification_models.items()
+                                if type(model).__name__.startswith(STREAMING_TREE_TYPES)}
+        self.regression_models = {
+            'SGD Regressor': make_pipeline(StandardScaler(), model_class('SGDRegressor')(random_state=42)),
+            **regression_trees
+        }
+        self.classification_models = {
+            'SGD Classifier': make_pipeline(StandardScaler(),
+                                            model_class('SGDClassifier')(loss='log_loss', random_state=42)),
+            **classification_trees
+        }
+    
+    def define_joint_classifiers(self):
+        """Replace the JOINT_FAMILIES classifiers with class thresholds on their regressors' salaries"""
+        for name, regressor_name in JOINT_FAMILIES.items():
+            if name in self.classification_models and regressor_name in self.regression_models:
+                self.classification_models[name] = model_class('SalaryThresholdClassifier')(
+                    self.regression_models[regressor_name])
+    
+    def make_svm(self, name, **params):
+        """Build an SVM entry: exact SVR/SVC, or its kernel approximation if selected for this name"""
+        approximate = name in self.kernel_approximation
+        if name.startswith('SVR'):
+            return model_class('ApproximateSVR' if approximate else 'SVR')(**params)
+        if approximate:
+            return model_class('ApproximateSVC')(**params)
+        return model_class('SVC')(probability=True, **params)
+    
+    def apply_tuned_params(self):
+        """Override model hyperparameters with the winners saved by hyperparameter_search.py"""
+        if not self.tuned_params_path or not os.path.exists(self.tuned_params_path):
+            return 0
+        with open(self.tuned_params_path) as f:
+            tuned = json.load(f)
+        
+        applied = 0
+        for task, models in (('regression', self.regression_models), ('classification', self.classification_models)):
+            for name, params in tuned.get(task, {}).items():
+                if name in models and params:
+                    models[name].set_params(**params)
+                    applied += 1
+        if applied:
+            print(f"Applied tuned hyperparameters to {applied} models from '{self.tuned_params_path}'")
+        return applied
+    
+    def native_categorical_features(self):
+        """Mask of the label-encoded columns histogram boosting splits as categories, or None
+        
+        A column with more than NATIVE_CATEGORICAL_LIMIT labels is split as ordered codes instead.
+        """
+        if self.encoding != 'label':
+            return None
+        too_many = [col for col in LABEL_ENCODED_COLS
+                    if col in self.label_encoders and len(self.label_encoders[col].classes_) > NATIVE_CATEGORICAL_LIMIT]
+        if too_many:
+            print(f"⚠️  {', '.join(too_many)}: more than {NATIVE_CATEGORICAL_LIMIT} labels, split as ordered codes "
+                  f"by histogram boosting (set max_categories to keep native splits)")
+        return native_categorical_mask(FEATURE_COLS, [col for col in LABEL_ENCODED_COLS if col not in too_many])
+    
+    def train_all_models(self, n_jobs=None):
+        """Train all regression and classification models
+        
+        n_jobs > 1 (or -1 for all cores) fans the models out over a process pool.
+        """
         print("\n" + "="*60)
         print("TRAINING ALL MACHINE LEARNING MODELS")
         print("="*60)
         
+        n_jobs = self._resolve_n_jobs(n_jobs)
+        # Joint classifiers need their fitted regressors, so they are scored after the zoo has trained
+        if self.joint_training and 'by' in self.salary_thresholds:
+            raise ValueError("joint training needs the global thresholds of a 'fixed' or 'quantile' salary scheme")
+        order = list(self.classification_models)
+        derived = {name: self.classification_models.pop(name) for name in order
+                   if self.joint_training and name in JOINT_FAMILIES}
+        regression_models, classification_models = self.regression_models, self.classification_models
+        if self.selection == 'cv':
+            # Halve the candidates by cross-validation first; only the survivors are fitted on the full training set
+            best = self.cross_validate_models(n_jobs=n_jobs)
+            regression_models, classification_models = (
+                {name: model for name, model in models.items() if self.cv_results[task][name]['pruned_after'] is None}
+                for task, models in (('regression', regression_models), ('classification', classification_models)))
+        if n_jobs > 1:
+            self._train_models_parallel(n_jobs, regression_models, classification_models)
+        else:
+            self._train_models_sequential(regression_models, classification_models)
+        if derived:
+            self._evaluate_joint_classifiers(derived, order)
+        if self.ensemble:
+            self.build_ensembles()
+        
+        # Find best models
+        if self.selection == 'cv':
+            self.select_best_models(*best)
+        else:
+            self.select_best_models()
+        
+        if self.instrumentation is not None:
+            self.instrumentation.print_summary()
+        return self.regression_results, self.classification_results
+    
+    def _evaluate_joint_classifiers(self, derived, order):
+        """Attach each joint classifier to its trained regressor and score it; no tree is fitted again"""
+        print("\n🔗 DERIVING CLASSES FROM THE REGRESSORS' PREDICTED SALARIES")
+        print("-" * 50)
+        
+        for name, model in derived.items():
+            model.set_params(regressor=self.regression_models[JOINT_FAMILIES[name]])
+            result = fit_and_evaluate('classification', model, self.X_train, self.y_train_class,
+                                      self.X_test, self.y_test_class, self.instrumentation, name,
+                                      low=self.salary_thresholds['Low'], high=self.salary_thresholds['Medium'])
+            self.classification_results[name] = result
+            print(f"{name} (from {JOINT_FAMILIES[name]}): Accuracy: {result['Accuracy']:.3f}")
+        
+        self.classification_results = {name: self.classification_results[name] for name in order}
+        self.classification_models = {name: r['model'] for name, r in self.classification_results.items()}
+    
+    def build_ensembles(self):
+        """Add a stacked ensemble of the trained models to each track's results; nothing is refitted"""
+        from salary_ensemble import ENSEMBLE_NAMES, build_ensemble, print_members
+        
+        print("\n🧩 STACKING THE TRAINED MODELS (from their stored holdout predictions)")
+        print("-" * 50)
+        
+        for task, results, metric in (('regression', self.regression_results, 'R2'),
+                                      ('classification', self.classification_results, 'Accuracy')):
+            name = ENSEMBLE_NAMES[task]
+            results.pop(name, None)
+            best_single = max(((n, r[metric]) for n, r in results.items()), key=lambda item: item[1])
+            built = build_ensemble(self, task, self.ensemble_latency_budget_ms, self.ensemble_max_members)
+            if built is None:
+                print(f"{name}: no model fits the {self.ensemble_latency_budget_ms} ms latency budget")
+                continue
+            entry, table = built
+            results[name] = entry
+            print_members(task, name, entry, table, best_single)
+    
+    def select_best_models(self, best_regression_name=None, best_classification_name=None):
+        """Set the best models, by holdout score unless names are given
+        
+        The salary intervals are calibrated on holdout rows the regressor choice did not
+        see. When the regressor is picked here, even holdout rows rank the candidates and
+        odd rows calibrate the winner. A winner picked on the same rows would have its
+        smallest errors there, and its intervals would cover less than promised.
+        """
+        calibration = np.ones(len(self.y_test), dtype=bool)
+        if best_regression_name is None:
+            from sklearn.metrics import r2_score
+            calibration = np.arange(len(self.y_test)) % 2 == 1
+            y_selection = np.asarray(self.y_test)[~calibration]
+            best_regression_name = max(self.regression_results.keys(), key=lambda x: r2_score(
+                y_selection, np.asarray(self.regression_results[x]['predictions'])[~calibration]))
+        if best_classification_name is None:
+            best_classification_name = max(self.classification_results.keys(), key=lambda x: self.classification_results[x]['Accuracy'])
+        
+        self.best_regression_model = self.regression_results[best_regression_name]['model']
+        self.best_classification_model = self.classification_results[best_classification_name]['model']
+        self.best_regression_name = best_regression_name
+        self.best_classification_name = best_classification_name
+        self.model_version = f"trained-{time.time_ns()}"
+        self.best_model_scores = {
+            'R2': self.regression_results[best_regression_name]['R2'],
+            'Accuracy': self.classification_results[best_classification_name]['Accuracy']
+        }
+        self.prediction_intervals = ConformalIntervals.calibrate(
+            np.asarray(self.regression_results[best_regression_name]['predictions'])[calibration],
+            np.asarray(self.y_test)[calibration], self.interval_coverage)
+        
+        print(f"\n🏆 BEST MODELS{' (by cross-validation)' if self.selection == 'cv' else ''}:")
+        print(f"   Regression (Exact Salary): {best_regression_name} (R²: {self.regression_results[best_regression_name]['R2']:.3f})")
+        print(f"   Classification (Low/Med/High): {best_classification_name} (Accuracy: {self.classification_results[best_classification_name]['Accuracy']:.3f})")
+        print(f"   Salary intervals: {self.interval_coverage:.0%} conformal, calibrated in "
+              f"{len(self.prediction_intervals.lower_offsets)} predicted-salary bins of {calibration.sum()} holdout rows")
+    
+    def _resolve_n_jobs(self, n_jobs=None):
+        """Turn an n_jobs setting (None, -1, k) into a concrete worker count"""
+        n_jobs = self.n_jobs if n_jobs is None else n_jobs
+        if n_jobs is None:
+            return 1
+        if n_jobs < 0:
+            return os.cpu_count() or 1
+        return max(1, n_jobs)
+    
+    def cross_validate_models(self, cv=None, n_jobs=None, keep_fraction=0.5, min_candidates=2):
+        """K-fold model selection that halves the candidate set after each fold round
+        
+        All surviving models of both tracks run the same fold in parallel; after each
+        round only the best keep_fraction (by running mean score) go on to the next fold.
+        Models are cloned per fold, so none needs to be fitted yet; cv_results records
+        which ones were pruned. Returns the names of the best regression and
+        classification models.
+        """
+        from joblib import Parallel, delayed
+        from sklearn.model_selection import KFold, StratifiedKFold
+        
+        cv = cv or self.cv_folds
+        n_jobs = self._resolve_n_jobs(n_jobs)
+        
+        print(f"\n🔁 {cv}-FOLD CROSS-VALIDATED MODEL SELECTION (successive halving)")
+        print("-" * 50)
+        
+        X = np.asarray(self.X_train)
+        tracks = {
+            'regression': (self.regression_models, np.asarray(self.y_train),
+                           KFold(n_splits=cv, shuffle=True, random_state=42)),
+            'classification': (self.classification_models, np.asarray(self.y_train_class),
+                               StratifiedKFold(n_splits=cv, shuffle=True, random_state=42))
+        }
+        folds = {task: list(splitter.split(X, y)) for task, (_, y, splitter) in tracks.items()}
+        survivors = {task: list(models) for task, (models, _, _) in tracks.items()}
+        self.cv_results = {
+            task: {name: {'scores': [], 'time': 0.0, 'pruned_after': None} for name in models}
+            for task, (models, _, _) in tracks.items()
+        }
+        
+        with Parallel(n_jobs=n_jobs) as parallel:
+            for fold in range(cv):
+                jobs = [
+                    delayed(_cross_validate_fold)(task, name, tracks[task][0][name], X, tracks[task][1], *folds[task][fold])
+                    for task in tracks for name in survivors[task]
+                ]
+                for task, name, score, seconds in parallel(jobs):
+                    self.cv_results[task][name]['scores'].append(score)
+                    self.cv_results[task][name]['time'] += seconds
+                
+                print(f"Fold {fold + 1}/{cv}: scored {len(jobs)} models")
+                if fold == cv - 1:
+                    break
+                
+                # Successive halving: drop the weaker half before the next fold
+                for task in tracks:
+                    ranked = sorted(survivors[task], key=lambda n: np.mean(self.cv_results[task][n]['scores']), reverse=True)
+                    keep = max(min_candidates, int(np.ceil(len(ranked) * keep_fraction)))
+                    for name in ranked[keep:]:
+                        self.cv_results[task][name]['pruned_after'] = fold + 1
+                    survivors[task] = ranked[:keep]
+        
+        for task_results in self.cv_results.values():
+            for entry in task_results.values():
+                entry['mean'] = float(np.mean(entry['scores']))
+                entry['std'] = float(np.std(entry['scores']))
+                entry['folds'] = len(entry['scores'])
+        
+        best = []
+        for task, metric in (('regression', 'R²'), ('classification', 'Accuracy')):
+            print(f"\n{'Model':<28} {'Mean ' + metric:>12} {'Std':>8} {'Folds':>6} {'Time (s)':>9}")
+            ranked = sorted(self.cv_results[task].items(), key=lambda item: (item[1]['folds'], item[1]['mean']), reverse=True)
+            for name, entry in ranked:
+                print(f"{name:<28} {entry['mean']:>12.3f} {entry['std']:>8.3f} {entry['folds']:>6} {entry['time']:>9.2f}")
+            best.append(ranked[0][0])
+        
+        total = sum(entry['time'] for task_results in self.cv_results.values() for entry in task_results.values())
+        print(f"\nTotal CV compute time: {total:.1f}s")
+        return best[0], best[1]
+    
+    def _train_models_sequential(self, regression_models, classification_models):
+        """Train the given models of the zoo one model at a time in this process"""
         # Train regression models
         print("\n📊 TRAINING REGRESSION MODELS (Exact Salary Prediction)")
         print("-" * 50)
         
         self.regression_results = {}
-        for name, model in self.regression_models.items():
+        for name, model in regression_models.items():
             print(f"Training {name}...")
             
             # Use scaled data for SVR and KNN, regular data for others
-            if 'SVR' in name or 'K-Neighbors' in name:
-                model.fit(self.X_train_scaled, self.y_train)
-                y_pred = model.predict(self.X_test_scaled)
+            if needs_scaling(name):
+                result = fit_and_evaluate('regression', model, self.X_train_scaled, self.y_train,
+                                          self.X_test_scaled, self.y_test, self.instrumentation, name)
             else:
-                model.fit(self.X_train, self.y_train)
-                y_pred = model.predict(self.X_test)
-            
-            # Calculate metrics
-            mae = mean_absolute_error(self.y_test, y_pred)
-            rmse = np.sqrt(mean_squared_error(self.y_test, y_pred))
-            r2 = r2_score(self.y_test, y_pred)
-            
-            self.regression_results[name] = {
-                'MAE': mae,
-                'RMSE': rmse,
-                'R2': r2,
-                'model': model,
-                'predictions': y_pred
-            }
+                result = fit_and_evaluate('regression', model, self.X_train, self.y_train,
+                                          self.X_test, self.y_test, self.instrumentation, name)
             
-            print(f"  MAE: ${mae:,.0f}, RMSE: ${rmse:,.0f}, R²: {r2:.3f}")
+            self.regression_results[name] = result
+            print(f"  MAE: ${result['MAE']:,.0f}, RMSE: ${result['RMSE']:,.0f}, R²: {result['R2']:.3f}")
         
         # Train classification models
         print("\n🏷️  TRAINING CLASSIFICATION MODELS (Low/Medium/High)")
         print("-" * 50)
         
         self.classification_results = {}
-        for name, model in self.classification_models.items():
+        for name, model in classification_models.items():
             print(f"Training {name}...")
             
             # Use scaled data for SVC and KNN, regular data for others
-            if 'SVC' in name or 'K-Neighbors' in name:
-                model.fit(self.X_train_scaled, self.y_train_class)
-                y_pred = model.predict(self.X_test_scaled)
-                y_pred_proba = model.predict_proba(self.X_test_scaled) if hasattr(model, 'predict_proba') else None
+            if needs_scaling(name):
+                result = fit_and_evaluate('classification', model, self.X_train_scaled, self.y_train_class,
+                                          self.X_test_scaled, self.y_test_class, self.instrumentation, name)
             else:
-                model.fit(self.X_train, self.y_train_class)
-                y_pred = model.predict(self.X_test)
-                y_pred_proba = model.predict_proba(self.X_test) if hasattr(model, 'predict_proba') else None
+                result = fit_and_evaluate('classification', model, self.X_train, self.y_train_class,
+                                          self.X_test, self.y_test_class, self.instrumentation, name)
             
-            # Calculate metrics
-            accuracy = (y_pred == self.y_test_class).mean()
-            
-            self.classification_results[name] = {
-                'Accuracy': accuracy,
-                'model': model,
-                'predictions': y_pred,
-                'probabilities': y_pred_proba
-            }
-            
-            print(f"  Accuracy: {accuracy:.3f}")
+            self.classification_results[name] = result
+            print(f"  Accuracy: {result['Accuracy']:.3f}")
+    
+    def _train_models_parallel(self, n_jobs, regression_models, classification_models):
+        """Train the given models of the zoo on a process pool sharing memory-mapped arrays"""
+        import tempfile
+        from concurrent.futures import ProcessPoolExecutor, as_completed
         
-        # Find best models
-        best_regression_name = max(self.regression_results.keys(), key=lambda x: self.regression_results[x]['R2'])
-        best_classification_name = max(self.classification_results.keys(), key=lambda x: self.classification_results[x]['Accuracy'])
+        print(f"\n⚡ TRAINING {len(regression_models) + len(classification_models)} MODELS ON {n_jobs} WORKERS")
+        print("-" * 50)
         
-        self.best_regression_model = self.regression_results[best_regression_name]['model']
-        self.best_classification_model = self.classification_results[best_classification_name]['model']
+        arrays = {
+            'features': self.features if self.features is not None else np.vstack([self.X_train, self.X_test]),
+            'y_train': np.asarray(self.y_train),
+            'y_test': np.asarray(self.y_test),
+            'y_train_class': np.asarray(self.y_train_class),
+            'y_test_class': np.asarray(self.y_test_class)
+        }
+        if any(needs_scaling(name) for name in list(regression_models) + list(classification_models)):
+            arrays['features_scaled'] = np.vstack([self.X_train_scaled, self.X_test_scaled]) \
+                if self.features is None else self._scaled_features()
+        n_train = len(self.X_train)
+        columns = list(self.X_train.columns) if hasattr(self.X_train, 'columns') else None
         
-        print(f"\n🏆 BEST MODELS:")
-        print(f"   Regression (Exact Salary): {best_regression_name} (R²: {self.regression_results[best_regression_name]['R2']:.3f})")
-        print(f"   Classification (Low/Med/High): {best_classification_name} (Accuracy: {self.classification_results[best_classification_name]['Accuracy']:.3f})")
+        tasks = [('regression', name, model) for name, model in regression_models.items()]
+        tasks += [('classification', name, model) for name, model in classification_models.items()]
+        # Slowest (SVM) fits first so they don't end up as stragglers
+        tasks.sort(key=lambda task: not needs_scaling(task[1]))
         
-        return self.regression_results, self.classification_results
+        results = {'regression': {}, 'classification': {}}
+        with tempfile.TemporaryDirectory(prefix='salary_predictor_') as shared_dir:
+            # Dump each array once; workers memory-map it instead of receiving a pickled copy per task
+            paths = {}
+            for key, array in arrays.items():
+                paths[key] = os.path.join(shared_dir, f'{key}.joblib')
+                joblib.dump(array, paths[key])
+            
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                instrumentation_config = self.instrumentation.config() if self.instrumentation is not None else None
+                futures = [executor.submit(_train_model_worker, task, name, model, paths, n_train, columns,
+                                           instrumentation_config)
+                           for task, name, model in tasks]
+                for future in as_completed(futures):
+                    task, name, result = future.result()
+                    stages = result.pop('stages', None)
+                    if stages:
+                        self.instrumentation.add_records(stages)
+                    results[task][name] = result
+                    if task == 'regression':
+                        print(f"✔ {name}: MAE: ${result['MAE']:,.0f}, RMSE: ${result['RMSE']:,.0f}, R²: {result['R2']:.3f}")
+                    else:
+                        print(f"✔ {name}: Accuracy: {result['Accuracy']:.3f}")
+        
+        # Keep the model-definition order regardless of completion order
+        self.regression_results = {name: results['regression'][name] for name in regression_models}
+        self.classification_results = {name: results['classification'][name] for name in classification_models}
+        # Fitted copies come back from the workers; models left out (pruned by CV) stay as defined
+        self.regression_models.update({name: r['model'] for name, r in self.regression_results.items()})
+        self.classification_models.update({name: r['model'] for name, r in self.classification_results.items()})
+    
+    def model_config(self):
+        """Describe everything besides the data that determines the trained artifacts"""
+        return {
+            'features': FEATURE_COLS,
+            'encoding': {'type': self.encoding, 'min_category_count': self.min_category_count,
+                         'max_categories': self.max_categories},
+            'salary_scheme': SALARY_SCHEMES.get(self.salary_scheme, self.salary_scheme) if isinstance(self.salary_scheme, str) else self.salary_scheme,
+            'selection': self.selection if self.selection != 'cv' else f'cv-{self.cv_folds}',
+            'training_mode': self.training_mode,
+            'interval_coverage': self.interval_coverage,
+            'ensemble': {'latency_budget_ms': self.ensemble_latency_budget_ms,
+                         'max_members': self.ensemble_max_members} if self.ensemble else None,
+            'regression_models': {name: _config_params(model) for name, model in self.regression_models.items()},
+            'classification_models': {name: _config_params(model) for name, model in self.classification_models.items()}
+        }
+    
+    def save_artifacts(self, store, config=None):
+        """Persist the best models and preprocessing state to an artifact store
+        
+        config overrides model_config() for models updated after they were defined.
+        """
+        key = store.make_key(self.data_path, config or self.model_config())
+        store.save(key, {
+            'best_regression_model': self.best_regression_model,
+            'best_classification_model': self.best_classification_model,
+            'label_encoders': self.label_encoders,
+            'appended_labels': self.appended_labels,
+            'target_encoder': self.target_encoder,
+            'scaler': self.scaler,
+            'salary_thresholds': self.salary_thresholds,
+            'prediction_intervals': self.prediction_intervals
+        }, metadata={
+            'best_regression_name': self.best_regression_name,
+            'best_classification_name': self.best_classification_name,
+            'best_model_scores': self.best_model_scores
+        })
+        # Models saved under the same data and config hash score identically, so the key is their version
+        self.model_version = key
+        print(f"💾 Saved trained models to '{store.root}' ({key})")
+        return key
+    
+    def load_artifacts(self, store):
+        """Load the best models from an artifact store; False if the data or config changed"""
+        if not self.regression_models:
+            self.define_models()
+        key = store.make_key(self.data_path, self.model_config())
+        if not store.exists(key):
+            return False
+        
+        artifacts = store.load(key)
+        self.best_regression_model = artifacts['best_regression_model']
+        self.best_classification_model = artifacts['best_classification_model']
+        self.label_encoders = artifacts['label_encoders']
+        self.appended_labels = artifacts.get('appended_labels') or {}
+        self.target_encoder = artifacts['target_encoder']
+        self.scaler = artifacts['scaler']
+        self.salary_thresholds = artifacts['salary_thresholds']
+        self.prediction_intervals = artifacts.get('prediction_intervals')
+        self.best_regression_name = artifacts.metadata['best_regression_name']
+        self.best_classification_name = artifacts.metadata['best_classification_name']
+        self.best_model_scores = artifacts.metadata['best_model_scores']
+        self._lookup_tables = None
+        self.model_version = key
+        print(f"⚡ Loaded trained models from '{store.root}' ({key})")
+        return True
     
     def create_model_comparison_plot(self):
         """Create model comparison visualization"""
         print("\nCreating model comparison plot...")
-        
-        plt.style.use('seaborn-v0_8')
-        fig, axes = plt.subplots(2, 2, figsize=(18, 16))
-        fig.suptitle('Model Performance Comparison', fontsize=20, y=0.98)
-
-        # Sort models for better visualization
-        reg_results_df = pd.DataFrame(self.regression_results).T.sort_values('R2', ascending=True)
-        class_results_df = pd.DataFrame(self.classification_results).T.sort_values('Accuracy', ascending=True)
-
-        # Plot 1: Regression models R² comparison
-        ax = axes[0, 0]
-        bars = ax.barh(reg_results_df.index, reg_results_df['R2'], color='skyblue', alpha=0.8)
-        ax.set_title('Regression Models - R² Scores', fontsize=14)
-        ax.set_xlabel('R² Score', fontsize=12)
-        ax.set_ylabel('Models', fontsize=12)
-        ax.tick_params(axis='y', labelsize=10)
-        ax.grid(True, axis='x', linestyle='--', alpha=0.6)
-        
-        # Add value labels
-        for bar in bars:
-            width = bar.get_width()
-            ax.text(width + 0.005, bar.get_y() + bar.get_height()/2, f'{width:.3f}', 
-                    ha='left', va='center', fontsize=9)
-
-        # Plot 2: Regression models RMSE comparison
-        ax = axes[0, 1]
-        reg_results_df_rmse = pd.DataFrame(self.regression_results).T.sort_values('RMSE', ascending=False)
-        bars = ax.barh(reg_results_df_rmse.index, reg_results_df_rmse['RMSE'], color='lightgreen', alpha=0.8)
-        ax.set_title('Regression Models - RMSE', fontsize=14)
-        ax.set_xlabel('RMSE (USD)', fontsize=12)
-        ax.set_ylabel('') # No label to avoid clutter
-        ax.tick_params(axis='y', labelsize=10)
-        ax.grid(True, axis='x', linestyle='--', alpha=0.6)
-
-        # Add value labels
-        for bar in bars:
-            width = bar.get_width()
-            ax.text(width + 500, bar.get_y() + bar.get_height()/2, f'${width:,.0f}', 
-                    ha='left', va='center', fontsize=9)
-
-        # Plot 3: Classification models accuracy comparison
-        ax = axes[1, 0]
-        bars = ax.barh(class_results_df.index, class_results_df['Accuracy'], color='lightcoral', alpha=0.8)
-        ax.set_title('Classification Models - Accuracy', fontsize=14)
-        ax.set_xlabel('Accuracy', fontsize=12)
-        ax.set_ylabel('Models', fontsize=12)
-        ax.tick_params(axis='y', labelsize=10)
-        ax.grid(True, axis='x', linestyle='--', alpha=0.6)
-        
-        # Add value labels
-        for bar in bars:
-            width = bar.get_width()
-            ax.text(width + 0.005, bar.get_y() + bar.get_height()/2, f'{width:.3f}', 
-                    ha='left', va='center', fontsize=9)
-        
-        # Plot 4: Best regression model predictions vs actual
-        ax = axes[1, 1]
-        best_reg_name = reg_results_df.index[-1]
-        best_reg_pred = self.regression_results[best_reg_name]['predictions']
-        
-        ax.scatter(self.y_test, best_reg_pred, alpha=0.5, color='royalblue')
-        ax.plot([self.y_test.min(), self.y_test.max()], [self.y_test.min(), self.y_test.max()], 'r--', lw=2)
-        ax.set_title(f'Best Model: {best_reg_name}\nPredictions vs Actual', fontsize=14)
-        ax.set_xlabel('Actual Salary (USD)', fontsize=12)
-        ax.set_ylabel('Predicted Salary (USD)', fontsize=12)
-        ax.grid(True, linestyle='--', alpha=0.6)
-        
-        fig.tight_layout(pad=3.0, rect=[0, 0, 1, 0.96])
-        plt.savefig('model_comparison.png', dpi=300, bbox_inches='tight')
-        plt.show()
-        plt.close(fig)
+        self._show_figure('model_comparison')
 
+    def _get_lookup_tables(self):
+        """Precompute per-column (label index, value array, unseen value) lookups from the fitted encoders"""
+        if self._lookup_tables is None:
+            tables = {}
+            for col, mapping in ORDINAL_MAPPINGS.items():
+                tables[col] = (pd.Index(list(mapping.keys())), np.array(list(mapping.values()), dtype=np.int64), -1)
+            for col, le in self.label_encoders.items():
+                if self.target_encoder is not None:
+                    values = target_values(self.target_encoder, LABEL_ENCODED_COLS.index(col), len(le.classes_))
+                    fallback = self.target_encoder.target_mean_
+                else:
+                    values, fallback = np.arange(len(le.classes_), dtype=np.int64), -1
+                # Unseen (and bucketed) labels share the 'Other' value when there is one
+                position = default_position(le.classes_)
+                unseen = values[position] if position >= 0 else fallback
+                appended = self.appended_labels.get(col, {})
+                labels = pd.Index(le.classes_)
+                if appended:
+                    labels = labels.append(pd.Index(list(appended), dtype=labels.dtype))
+                    values = np.concatenate([values, np.fromiter(appended.values(), dtype=values.dtype)])
+                tables[col] = (labels, values, unseen)
+            self._lookup_tables = tables
+        return self._lookup_tables
+    
+    def _encoded_columns(self, frame):
+        """Yield (feature name, encoded values) for each of FEATURE_COLS"""
+        tables = self._get_lookup_tables()
+        for col in FEATURE_COLS:
+            if col in ('work_year', 'remote_ratio'):
+                yield col, frame[col].to_numpy(dtype=np.int64)
+            else:
+                labels, values, unseen = tables[col.removesuffix('_encoded')]
+                positions = labels.get_indexer(frame[col.removesuffix('_encoded')])
+                yield col, np.where(positions >= 0, values[positions], unseen)
+    
+    def encode_features(self, frame):
+        """Encode raw profile columns into the model feature matrix, a whole column at a time
+        
+        Labels that were not seen during training are encoded as -1, or as the 'Other'
+        bucket / the mean salary when bucketing / target encoding is used.
+        """
+        return pd.DataFrame(dict(self._encoded_columns(frame)), index=frame.index)[FEATURE_COLS]
+    
+    def _predict_frame(self, frame):
+        """Score a frame of raw profiles with one predict/predict_proba call per model"""
+        X = self.encode_features(frame)
+        X_scaled = None
+        if needs_scaling(self.best_regression_name) or needs_scaling(self.best_classification_name):
+            X_scaled = self.scaler.transform(X)
+        
+        reg_input = X_scaled if needs_scaling(self.best_regression_name) else X
+        predicted_salary = self.best_regression_model.predict(reg_input)
+        
+        cls_input = X_scaled if needs_scaling(self.best_classification_name) else X
+        class_probs = self.best_classification_model.predict_proba(cls_input)
+        if predict_overrides_proba(self.best_classification_model):
+            predicted_class = self.best_classification_model.predict(cls_input)
+        else:
+            predicted_class = self.best_classification_model.classes_[class_probs.argmax(axis=1)]
+        
+        return predicted_salary, predicted_class, class_probs
+    
     def predict_salary_and_classification(self, **kwargs):
         """Predict salary and classification for a single data point."""
+        cache = self.prediction_cache
+        if cache is not None:
+            key = profile_key(kwargs)
+            cached = cache.get(key, self.model_version)
+            if cached is not None:
+                return cached
         
-        # Create a DataFrame from the input
-        input_data = pd.DataFrame([kwargs])
-        
-        # Feature engineering
-        exp_mapping = {'EN': 1, 'MI': 2, 'SE': 3, 'EX': 4}
-        emp_mapping = {'PT': 1, 'FT': 2, 'CT': 3, 'FL': 4}
-        size_mapping = {'S': 1, 'M': 2, 'L': 3}
-        
-        input_data['experience_level_encoded'] = input_data['experience_level'].map(exp_mapping)
-        input_data['employment_type_encoded'] = input_data['employment_type'].map(emp_mapping)
-        input_data['company_size_encoded'] = input_data['company_size'].map(size_mapping)
-        
-        # Encode categorical variables using stored label encoders
-        for col in self.label_encoders:
-            le = self.label_encoders[col]
-            # Handle unseen labels by assigning a default value (e.g., -1 or a new code)
-            input_data[f'{col}_encoded'] = input_data[col].apply(lambda x: le.transform([x])[0] if x in le.classes_ else -1)
-
-        # Ensure all feature columns are present
-        feature_cols = [
-            'work_year', 'experience_level_encoded', 'employment_type_encoded',
-            'job_title_encoded', 'employee_residence_encoded', 'remote_ratio',
-            'company_location_encoded', 'company_size_encoded'
-        ]
+        predicted_salary, predicted_class, class_probs = self._predict_frame(pd.DataFrame([kwargs]))
+        result = (predicted_salary[0], predicted_class[0], class_probs[0])
+        if cache is not None:
+            cache.put(key, result, self.model_version)
+        return result
+    
+    def salary_interval(self, predicted_salary):
+        """(low, high) salary interval arrays at interval_coverage, or None before calibration"""
+        if self.prediction_intervals is None:
+            return None
+        return self.prediction_intervals.interval(predicted_salary)
+    
+    def save_prediction_cache(self):
+        """Persist the prediction cache, if it has a path, and report its counters"""
+        cache = self.prediction_cache
+        if cache is None or cache.hits + cache.misses == 0:
+            return
+        stats = cache.stats()
+        print(f"🗃️  Prediction cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate), {stats['evictions']} evictions, {stats['size']} entries")
+        if cache.path:
+            cache.save()
+    
+    def predict_batch(self, source, output_path=None, chunksize=100000):
+        """Predict salary and classification for many profiles at once
         
-        final_input = input_data[feature_cols]
-
-        # Use scaled data for appropriate models
-        if 'SVR' in self.best_regression_model.__class__.__name__ or 'KNeighbors' in self.best_regression_model.__class__.__name__:
-             final_input_scaled = self.scaler.transform(final_input)
-             predicted_salary = self.best_regression_model.predict(final_input_scaled)[0]
-        else:
-            predicted_salary = self.best_regression_model.predict(final_input)[0]
-
-        if 'SVC' in self.best_classification_model.__class__.__name__ or 'KNeighbors' in self.best_classification_model.__class__.__name__:
-            final_input_scaled = self.scaler.transform(final_input)
-            predicted_class = self.best_classification_model.predict(final_input_scaled)[0]
-            class_probs = self.best_classification_model.predict_proba(final_input_scaled)[0]
+        source is a DataFrame or a CSV path (read in chunks). Without output_path
+        the predictions are returned as a DataFrame; otherwise they are streamed to
+        a CSV or, for .parquet/.pq paths, a Parquet file and the row count is returned.
+        """
+        if isinstance(source, pd.DataFrame):
+            chunks = (source.iloc[start:start + chunksize] for start in range(0, len(source), chunksize))
         else:
-            predicted_class = self.best_classification_model.predict(final_input)[0]
-            class_probs = self.best_classification_model.predict_proba(final_input)[0]
-            
-        return predicted_salary, predicted_class, class_probs
+            chunks = pd.read_csv(source, chunksize=chunksize)
+        
+        classes = self.best_classification_model.classes_
+        parquet = output_path is not None and output_path.lower().endswith(('.parquet', '.pq'))
+        writer = None
+        scored = []
+        total_rows = 0
+        
+        try:
+            for chunk in chunks:
+                predicted_salary, predicted_class, class_probs = self._predict_frame(chunk)
+                out = chunk.copy()
+                out['predicted_salary'] = predicted_salary
+                interval = self.salary_interval(predicted_salary)
+                if interval is not None:
+                    out['salary_low'], out['salary_high'] = interval
+                out['predicted_class'] = predicted_class
+                for i, class_name in enumerate(classes):
+                    out[f'prob_{class_name}'] = class_probs[:, i]
+                
+                if output_path is None:
+                    scored.append(out)
+                elif parquet:
+                    try:
+                        import pyarrow as pa
+                        import pyarrow.parquet as pq
+                    except ImportError:
+                        raise ImportError("Writing Parquet output requires pyarrow (pip install pyarrow)")
+                    if writer is None:
+                        table = pa.Table.from_pandas(out, preserve_index=False)
+                        writer = pq.ParquetWriter(output_path, table.schema)
+                    else:
+                        table = pa.Table.from_pandas(out, schema=writer.schema, preserve_index=False)
+                    writer.write_table(table)
+                else:
+                    out.to_csv(output_path, mode='w' if total_rows == 0 else 'a',
+                               header=total_rows == 0, index=False)
+                total_rows += len(out)
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        if output_path is None:
+            return pd.concat(scored) if scored else pd.DataFrame()
+        print(f"✅ Wrote {total_rows:,} predictions to '{output_path}'")
+        return total_rows
 
     def run_example_predictions(self):
         """Run example predictions on a few profiles."""
@@ -568,12 +1181,12 @@ class SalaryPredictor:
             print(f"   Location: {profile['employee_residence']} (Company: {profile['company_location']}, Size: {profile['company_size']})")
             
             predicted_salary, predicted_class, class_probs = self.predict_salary_and_classification(**profile)
-            
-            confidence_range = predicted_salary * 0.15
+            interval = self.salary_interval(predicted_salary)
             
             print(f"\n   📊 PREDICTION:")
             print(f"   💰 Predicted Salary: ${predicted_salary:,.0f}")
-            print(f"   📈 Est. Range: ${predicted_salary - confidence_range:,.0f} - ${predicted_salary + confidence_range:,.0f}")
+            if interval is not None:
+                print(f"   📈 {self.prediction_intervals.coverage:.0%} Interval: ${interval[0]:,.0f} - ${interval[1]:,.0f}")
             print(f"   🏷️  Salary Class: {predicted_class}")
             
             classes = self.best_classification_model.classes_
@@ -587,61 +1200,64 @@ class SalaryPredictor:
         print("\n" + "="*80)
         print("COMPREHENSIVE SALARY ANALYSIS SUMMARY")
         print("="*80)
+        cube = self.load_cube()
+        totals = cube.totals()
         
         # Overall statistics
         print(f"\n📊 OVERALL STATISTICS:")
-        print(f"Total jobs analyzed: {len(self.data):,}")
-        print(f"Average salary: ${self.data['salary_in_usd'].mean():,.0f}")
-        print(f"Median salary: ${self.data['salary_in_usd'].median():,.0f}")
-        print(f"Salary range: ${self.data['salary_in_usd'].min():,.0f} - ${self.data['salary_in_usd'].max():,.0f}")
+        print(f"Total jobs analyzed: {totals['count']:,.0f}")
+        print(f"Average salary: ${totals['mean']:,.0f}")
+        print(f"Median salary: ${cube.median:,.0f}")
+        print(f"Salary range: ${totals['min']:,.0f} - ${totals['max']:,.0f}")
         
         # Salary classification thresholds
         print(f"\n🏷️  SALARY CLASSIFICATION THRESHOLDS:")
-        print(f"   Low: < $100,000")
-        print(f"   Medium: $100,000 - $160,000")
-        print(f"   High: > $160,000")
+        if 'by' in self.salary_thresholds:
+            print(f"   Low / Medium / High: quantiles computed per {self.salary_thresholds['by']}")
+        else:
+            print(f"   Low: < ${self.salary_thresholds['Low']:,.0f}")
+            print(f"   Medium: ${self.salary_thresholds['Low']:,.0f} - ${self.salary_thresholds['Medium']:,.0f}")
+            print(f"   High: > ${self.salary_thresholds['Medium']:,.0f}")
         
         # Classification distribution
-        class_dist = self.data['salary_class'].value_counts()
+        class_dist = cube.count_by('salary_class')
+        total = totals['count']
         print(f"\n📊 CLASSIFICATION DISTRIBUTION:")
-        print(f"   Low: {class_dist.get('Low', 0)} jobs ({class_dist.get('Low', 0)/len(self.data)*100:.1f}%)")
-        print(f"   Medium: {class_dist.get('Medium', 0)} jobs ({class_dist.get('Medium', 0)/len(self.data)*100:.1f}%)")
-        print(f"   High: {class_dist.get('High', 0)} jobs ({class_dist.get('High', 0)/len(self.data)*100:.1f}%)")
+        print(f"   Low: {class_dist.get('Low', 0)} jobs ({class_dist.get('Low', 0)/total*100:.1f}%)")
+        print(f"   Medium: {class_dist.get('Medium', 0)} jobs ({class_dist.get('Medium', 0)/total*100:.1f}%)")
+        print(f"   High: {class_dist.get('High', 0)} jobs ({class_dist.get('High', 0)/total*100:.1f}%)")
         
         # Top paying countries
-        country_avg = self.data.groupby('employee_residence')['salary_in_usd'].mean().sort_values(ascending=False)
+        country_avg = cube.mean_by('employee_residence').sort_values(ascending=False)
         print(f"\n🌍 TOP 5 HIGHEST PAYING COUNTRIES:")
         for i, (country, salary) in enumerate(country_avg.head(5).items(), 1):
             print(f"{i}. {country}: ${salary:,.0f}")
         
         # Top paying job titles
-        job_avg = self.data.groupby('job_title')['salary_in_usd'].mean().sort_values(ascending=False)
+        job_avg = cube.mean_by('job_title').sort_values(ascending=False)
         print(f"\n💼 TOP 5 HIGHEST PAYING JOB TITLES:")
         for i, (job, salary) in enumerate(job_avg.head(5).items(), 1):
             print(f"{i}. {job}: ${salary:,.0f}")
         
         # Experience level analysis
-        exp_avg = self.data.groupby('experience_level')['salary_in_usd'].mean().sort_values(ascending=False)
+        exp_avg = cube.mean_by('experience_level').sort_values(ascending=False)
         print(f"\n📈 SALARY BY EXPERIENCE LEVEL:")
         exp_names = {'EN': 'Entry Level', 'MI': 'Mid Level', 'SE': 'Senior Level', 'EX': 'Executive Level'}
         for level, salary in exp_avg.items():
             print(f"   {exp_names[level]}: ${salary:,.0f}")
         
         # Company size analysis
-        size_avg = self.data.groupby('company_size')['salary_in_usd'].mean().sort_values(ascending=False)
+        size_avg = cube.mean_by('company_size').sort_values(ascending=False)
         print(f"\n🏢 SALARY BY COMPANY SIZE:")
         size_names = {'S': 'Small (<50)', 'M': 'Medium (50-250)', 'L': 'Large (>250)'}
         for size, salary in size_avg.items():
             print(f"   {size_names[size]}: ${salary:,.0f}")
         
-        # Model performance summary
-        if hasattr(self, 'regression_results') and self.regression_results:
-            best_reg_name = max(self.regression_results.keys(), key=lambda x: self.regression_results[x]['R2'])
-            best_class_name = max(self.classification_results.keys(), key=lambda x: self.classification_results[x]['Accuracy'])
-            
+        # Model performance summary (also available when the models came from the artifact store)
+        if self.best_model_scores:
             print(f"\n🤖 MODEL PERFORMANCE:")
-            print(f"   Best Regression Model: {best_reg_name} (R²: {self.regression_results[best_reg_name]['R2']:.3f})")
-            print(f"   Best Classification Model: {best_class_name} (Accuracy: {self.classification_results[best_class_name]['Accuracy']:.3f})")
+            print(f"   Best Regression Model: {self.best_regression_name} (R²: {self.best_model_scores['R2']:.3f})")
+            print(f"   Best Classification Model: {self.best_classification_name} (Accuracy: {self.best_model_scores['Accuracy']:.3f})")
         
         print("\n" + "="*80)
     
@@ -651,10 +1267,8 @@ class SalaryPredictor:
         print("INTERACTIVE SALARY PREDICTION")
         print("="*50)
         
-        # Get available options
-        job_titles = sorted(self.data['job_title'].unique())
-        residences = sorted(self.data['employee_residence'].unique())
-        locations = sorted(self.data['company_location'].unique())
+        # Get available options (the encoders know them even when no data was loaded)
+        job_titles = sorted(self._get_lookup_tables()['job_title'][0])
         
         print("\nAvailable job titles:")
         for i, title in enumerate(job_titles[:20]):  # Show first 20
@@ -705,11 +1319,12 @@ class SalaryPredictor:
                     company_size=company_size
                 )
                 
-                confidence_range = predicted_salary * 0.15
+                interval = self.salary_interval(predicted_salary)
                 
                 print(f"\n📊 PREDICTION RESULTS:")
                 print(f"💰 Predicted Salary: ${predicted_salary:,.0f}")
-                print(f"📈 Estimated Range: ${predicted_salary - confidence_range:,.0f} - ${predicted_salary + confidence_range:,.0f}")
+                if interval is not None:
+                    print(f"📈 {self.prediction_intervals.coverage:.0%} Prediction Interval: ${interval[0]:,.0f} - ${interval[1]:,.0f}")
                 print(f"🏷️  Salary Classification: {predicted_class}")
                 
                 # Show classification probabilities
@@ -730,13 +1345,38 @@ class SalaryPredictor:
             except Exception as e:
                 print(f"Unexpected error: {e}. Please try again.")
 
+def ensure_trained_models(predictor, store):
+    """Make the best models available, retraining only when the data or config changed"""
+    if predictor.best_regression_model is not None:
+        return
+    if predictor.load_artifacts(store):
+        return
+    
+    if predictor.training_mode == 'streaming':
+        from streaming_training import train_streaming
+        train_streaming(predictor)
+        predictor.save_artifacts(store)
+        return
+    
+    if predictor.X_train is None:
+        print("\n📊 Loading and preprocessing data...")
+        predictor.load_and_explore_data(MODEL_COLUMNS)
+        predictor.create_salary_classification()
+        predictor.preprocess_data()
+        predictor.define_models()
+    
+    print("Training models...")
+    predictor.train_all_models()
+    predictor.save_artifacts(store)
+
 def main():
     """Main function to run the complete salary prediction system"""
     print("Complete US Tech Job Salary Prediction System")
     print("="*60)
     
     # Initialize predictor
-    predictor = SalaryPredictor()
+    predictor = SalaryPredictor(n_jobs=-1, prediction_cache=PredictionCache(path='prediction_cache.json'))
+    store = ModelArtifactStore()
     
     while True:
         print("\n" + "="*60)
@@ -744,40 +1384,30 @@ def main():
         print("="*60)
         print("1. 📋 Display Analysis Summary")
         print("2. 📊 Create comprehensive visualizations")
-        print("3. 🤖 Train & Compare All 18 Models")
+        print("3. 🤖 Train & Compare All 22 Models")
         print("4. 🎯 Show Example Predictions")
         print("5. 💬 Predict Your Salary")
+        print("6. 📦 Batch Predict a CSV File")
         print("0. ❌ Exit")
         print("="*60)
         
         try:
-            choice = input("\nEnter your choice (0-5): ").strip()
+            choice = input("\nEnter your choice (0-6): ").strip()
             
             if choice == '0':
+                predictor.save_prediction_cache()
                 print("\n👋 Goodbye!")
                 break
                 
             elif choice == '1':
-                # Load and train models if not already done
-                if predictor.X_train is None:
-                    print("\n📊 Loading and preprocessing data...")
-                    predictor.load_and_explore_data()
-                    predictor.create_salary_classification()
-                    predictor.preprocess_data()
-                    predictor.define_models()
-                
-                if not predictor.regression_results:
-                    print("Training models for summary...")
-                    predictor.train_all_models()
+                # The summary is answered from the aggregate cube; the raw data is only read to (re)build it
+                predictor.load_cube()
+                ensure_trained_models(predictor, store)
                 print("\n📋 Generating comprehensive summary...")
                 predictor.print_comprehensive_summary()
                 
             elif choice == '2':
-                # Load data if not already loaded
-                if predictor.data is None:
-                    print("\n📊 Loading data...")
-                    predictor.load_and_explore_data()
-                    predictor.create_salary_classification()
+                predictor.load_cube()
                 
                 while True:
                     print("\n" + "-"*40)
@@ -786,10 +1416,11 @@ def main():
                     print("1. Salary Overview Analysis")
                     print("2. Top Categories Analysis")
                     print("3. Classification Deep Dive")
+                    print("4. Render All Figures (headless, in parallel)")
                     print("0. Back to Main Menu")
                     print("-"*40)
                     
-                    viz_choice = input("Enter your choice (0-3): ").strip()
+                    viz_choice = input("Enter your choice (0-4): ").strip()
 
                     if viz_choice == '0':
                         break
@@ -802,58 +1433,56 @@ def main():
                     elif viz_choice == '3':
                         print("\n📊 Creating Classification Deep Dive plot...")
                         predictor.create_classification_dive_plot()
+                    elif viz_choice == '4':
+                        print("\n📊 Rendering figures in the background...")
+                        status = render_figures(predictor)
+                        for name, state in status.items():
+                            if state != 'unavailable':
+                                print(f"✅ {FIGURES[name][0]}.png: {state}")
                     else:
-                        print("❌ Invalid choice. Please enter a number between 0-3.")
+                        print("❌ Invalid choice. Please enter a number between 0-4.")
                 
             elif choice == '3':
                 # Load and preprocess data if not already done
                 if predictor.X_train is None:
                     print("\n📊 Loading and preprocessing data...")
-                    predictor.load_and_explore_data()
+                    predictor.load_and_explore_data(MODEL_COLUMNS)
                     predictor.create_salary_classification()
                     predictor.preprocess_data()
                     predictor.define_models()
                 
                 print("\n🤖 Training all ML models...")
                 reg_results, class_results = predictor.train_all_models()
+                predictor.save_artifacts(store)
                 predictor.create_model_comparison_plot()
                 print("✅ Model training completed! Check 'model_comparison.png'")
                 
             elif choice == '4':
-                # Load and train models if not already done
-                if predictor.X_train is None:
-                    print("\n📊 Loading and preprocessing data...")
-                    predictor.load_and_explore_data()
-                    predictor.create_salary_classification()
-                    predictor.preprocess_data()
-                    predictor.define_models()
-                
-                if not predictor.best_regression_model:
-                    print("Training models...")
-                    predictor.train_all_models()
+                # Load persisted models, or train them if not already done
+                ensure_trained_models(predictor, store)
                 print("\n🎯 Running example predictions...")
                 predictor.run_example_predictions()
                 
             elif choice == '5':
-                # Load and train models if not already done
-                if predictor.X_train is None:
-                    print("\n📊 Loading and preprocessing data...")
-                    predictor.load_and_explore_data()
-                    predictor.create_salary_classification()
-                    predictor.preprocess_data()
-                    predictor.define_models()
-                
-                if not predictor.best_regression_model:
-                    print("Training models...")
-                    predictor.train_all_models()
+                # Load persisted models, or train them if not already done
+                ensure_trained_models(predictor, store)
                 print("\n💬 Starting interactive prediction...")
                 predictor.interactive_prediction()
                 
+            elif choice == '6':
+                ensure_trained_models(predictor, store)
+                input_path = input("Input CSV path: ").strip()
+                output_path = input("Output path (.csv or .parquet) [predictions.csv]: ").strip() or "predictions.csv"
+                print("\n📦 Scoring profiles in batches...")
+                predictor.predict_batch(input_path, output_path)
+                
             else:
-                print("❌ Invalid choice. Please enter a number between 0-5.")
+                print("❌ Invalid choice. Please enter a number between 0-6.")
                 
         except KeyboardInterrupt:
-            print("\n\n👋 Goodbye!")
+            print()
+            predictor.save_prediction_cache()
+            print("\n👋 Goodbye!")
             break
         except Exception as e:
             print(f"❌ Error: {e}")
@@ -0,0 +1,125 @@
+import json
+import numpy as np
+
+# Rows scored per block, bounding the (rows x trees) traversal arrays
+BLOCK_ROWS = 8192
+
+
+def _softmax(raw):
+    raw = raw - raw.max(axis=1, keepdims=True)
+    exp = np.exp(raw)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+def _sigmoid(raw):
+    p = 1.0 / (1.0 + np.exp(-raw[:, 0]))
+    return np.column_stack([1.0 - p, p])
+
+def _one_vs_rest(raw):
+    p = 1.0 / (1.0 + np.exp(-raw))
+    return p / p.sum(axis=1, keepdims=True)
+
+OUTPUTS = {'identity': lambda raw: raw, 'softmax': _softmax, 'sigmoid': _sigmoid, 'ovr': _one_vs_rest}
+
+
+class CompiledModel:
+    """Linear model or tree ensemble reduced to flat arrays"""
+
+    def __init__(self, spec, arrays):
+        self.kind = spec['kind']
+        self.output = OUTPUTS[spec['output']]
+        self.arrays = arrays
+        self.depth = spec.get('depth', 0)
+        self.dtype = np.dtype(spec.get('dtype', 'float32'))
+
+    def raw(self, X):
+        a = self.arrays
+        if self.kind == 'linear':
+            return X @ a['coef'].T + a['intercept']
+        # Trees compare float32 features against their thresholds, as scikit-learn does (histogram boosting: float64)
+        X = X.astype(self.dtype)
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(a['roots'], (len(X), len(a['roots'])))
+        categorical = 'category' in a
+        # Leaves point at themselves, so every tree can take the same number of steps
+        for _ in range(self.depth):
+            x = X[rows, a['feature'][node]]
+            go_left = x <= a['threshold'][node]
+            if categorical:
+                # Category nodes look the code up in their row of left_categories (row 0: numeric node);
+                # NaN, fractions and codes outside the table go where the node sends missing values
+                category = a['category'][node]
+                width = a['left_categories'].shape[1]
+                in_table = (x >= 0) & (x < width) & (x == np.floor(x))
+                code = np.where(in_table, x, 0).astype(np.intp)
+                missing = a['missing_left'][node]
+                go_left = np.where(category > 0, np.where(in_table, a['left_categories'][category, code], missing),
+                                   np.where(np.isnan(x), missing, go_left))
+            node = np.where(go_left, a['left'][node], a['right'][node])
+        return a['base'] + a['weight'] * a['value'][node].sum(axis=1)
+
+    def predict(self, X):
+        return np.concatenate([self.output(self.raw(X[i:i + BLOCK_ROWS])) for i in range(0, len(X), BLOCK_ROWS)]) \
+            if len(X) else np.empty((0, 1))
+
+
+class SalaryRuntime:
+    """Score salary profiles with models exported by model_export.export_runtime
+    
+    Needs only NumPy: scikit-learn, pandas and the training code are never imported.
+    """
+
+    def __init__(self, path='salary_runtime.npz'):
+        with np.load(path) as data:
+            meta = json.loads(str(data['metadata']))
+            arrays = {key: data[key] for key in data.files if key != 'metadata'}
+        self.features = meta['features']
+        self.encoders = meta['encoders']
+        # Value of labels missing from an encoder; archives without it used -1
+        self.defaults = meta.get('defaults', {})
+        self.classes = meta['classes']
+        self.model_names = meta['model_names']
+        # Conformal interval offsets per predicted-salary bin (prediction_intervals.py); older archives have none
+        self.intervals = meta.get('intervals')
+        self.models = {
+            task: CompiledModel(meta['models'][task], {key.split('/', 1)[1]: value for key, value in arrays.items()
+                                                       if key.startswith(task + '/')})
+            for task in ('regression', 'classification')
+        }
+
+    def encode(self, profiles):
+        """Feature matrix for a list of profile dicts; unseen labels get the encoder's default value"""
+        X = np.empty((len(profiles), len(self.features)), dtype=np.float64)
+        for j, feature in enumerate(self.features):
+            lookup = self.encoders.get(feature)
+            default = self.defaults.get(feature, -1)
+            column = feature[:-len('_encoded')] if lookup is not None else feature
+            for i, profile in enumerate(profiles):
+                value = profile[column]
+                X[i, j] = lookup.get(str(value), default) if lookup is not None else float(value)
+        return X
+
+    def predict_many(self, profiles):
+        X = self.encode(profiles)
+        salaries = self.models['regression'].predict(X)[:, 0]
+        probabilities = self.models['classification'].predict(X)
+        results = [
+            {
+                'predicted_salary': float(salary),
+                'predicted_class': self.classes[int(probs.argmax())],
+                'class_probabilities': dict(zip(self.classes, map(float, probs)))
+            }
+            for salary, probs in zip(salaries, probabilities)
+        ]
+        if self.intervals is not None:
+            for result, low, high in zip(results, *self.salary_interval(salaries)):
+                result['salary_interval'] = [float(low), float(high)]
+        return results
+
+    def salary_interval(self, salaries):
+        """(low, high) arrays: the predicted salaries plus their bin's calibrated offsets"""
+        bins = np.searchsorted(self.intervals['edges'], salaries, side='right')
+        low = salaries + np.asarray(self.intervals['lower_offsets'])[bins]
+        return np.maximum(low, 0.0), salaries + np.asarray(self.intervals['upper_offsets'])[bins]
+
+    def predict(self, **profile):
+        return self.predict_many([profile])[0]
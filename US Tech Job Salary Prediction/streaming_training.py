@@ -0,0 +1,222 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from model_store import ModelArtifactStore
+from salary_data import MODEL_COLUMNS, read_csv_typed
+from salary_predictor import (SalaryPredictor, LABEL_ENCODED_COLS, FEATURE_COLS, SALARY_CLASSES,
+                              SALARY_SCHEMES, salary_class_codes, fit_and_evaluate, evaluate_model)
+
+# Bytes held per sampled row: float32 features, int32 salary, int8 class code
+ROW_BYTES = len(FEATURE_COLS) * 4 + 4 + 1
+
+
+class Reservoir:
+    """Fixed-size uniform sample of a stream (Algorithm R, vectorized per chunk)"""
+
+    def __init__(self, capacity, n_features, rng):
+        self.capacity = capacity
+        self.rng = rng
+        self.seen = 0
+        self.size = 0
+        self.X = np.empty((capacity, n_features), dtype=np.float32)
+        self.salary = np.empty(capacity, dtype=np.int32)
+        self.classes = np.empty(capacity, dtype=np.int8)
+
+    def add(self, X, salary, classes):
+        n = len(X)
+        # Fill the free slots first
+        free = min(self.capacity - self.size, n)
+        if free:
+            self.X[self.size:self.size + free] = X[:free]
+            self.salary[self.size:self.size + free] = salary[:free]
+            self.classes[self.size:self.size + free] = classes[:free]
+            self.size += free
+        # Row t (1-based) replaces a random slot with probability capacity / t
+        if free < n:
+            t = self.seen + np.arange(free + 1, n + 1)
+            slots = (self.rng.random(n - free) * t).astype(np.int64)
+            keep = slots < self.capacity
+            # Fancy assignment applies in order, so later rows win as in the sequential algorithm
+            self.X[slots[keep]] = X[free:][keep]
+            self.salary[slots[keep]] = salary[free:][keep]
+            self.classes[slots[keep]] = classes[free:][keep]
+        self.seen += n
+
+    def frames(self):
+        """Return the sample as (feature frame, salary series, class series)"""
+        X = pd.DataFrame(self.X[:self.size], columns=FEATURE_COLS)
+        salary = pd.Series(self.salary[:self.size], name='salary_in_usd')
+        classes = pd.Series(pd.Categorical.from_codes(self.classes[:self.size], categories=SALARY_CLASSES),
+                            name='salary_class')
+        return X, salary, classes
+
+
+def _chunks(path, chunksize):
+    return read_csv_typed(path, MODEL_COLUMNS, chunksize=chunksize)
+
+def _holdout_mask(start, n, holdout_every):
+    """Deterministically route every holdout_every-th row of the stream to the holdout set"""
+    return (np.arange(start, start + n) % holdout_every) == 0
+
+def build_vocabulary(predictor, path, chunksize):
+    """Pass 1: collect the label vocabularies and fit the label encoders without loading the data"""
+    vocab = {col: set() for col in LABEL_ENCODED_COLS}
+    rows = 0
+    for chunk in _chunks(path, chunksize):
+        for col in LABEL_ENCODED_COLS:
+            vocab[col].update(chunk[col].dropna().unique().tolist())
+        rows += len(chunk)
+
+    predictor.label_encoders = {}
+    for col in LABEL_ENCODED_COLS:
+        le = LabelEncoder()
+        # Same codes LabelEncoder.fit would assign on the full column
+        le.classes_ = np.array(sorted(vocab[col]), dtype=object)
+        predictor.label_encoders[col] = le
+    predictor.appended_labels = {}
+    predictor._lookup_tables = None
+    return rows
+
+def train_streaming(predictor, chunksize=100000, memory_budget_mb=256, epochs=3, holdout_every=5,
+                    max_holdout_rows=200000, random_state=42):
+    """Train on a CSV larger than memory, one chunk at a time
+
+    Pass 1 builds the label vocabularies; pass 2 fits the scaler, the target
+    statistics and reservoir samples for training and holdout; the following
+    passes train SGD linear models with partial_fit. Tree models from the zoo are
+    fitted on the training reservoir, whose size is set by memory_budget_mb. The
+    models are those define_models gives for training_mode='streaming'.
+    """
+    scheme = SALARY_SCHEMES[predictor.salary_scheme] if isinstance(predictor.salary_scheme, str) else predictor.salary_scheme
+    if scheme['type'] != 'fixed':
+        raise ValueError("Streaming training needs a fixed salary_scheme; quantile thresholds require the full data")
+    if predictor.encoding != 'label' or predictor.buckets_rare_labels:
+        raise ValueError("Streaming training needs plain label encoding; target encoding and bucketing require the full data")
+    low, high = scheme['low'], scheme['high']
+    rng = np.random.default_rng(random_state)
+    path = predictor.data_path
+    start_time = time.perf_counter()
+
+    print("\n" + "="*60)
+    print("STREAMING (OUT-OF-CORE) TRAINING")
+    print("="*60)
+
+    # Pass 1: vocabularies
+    rows = build_vocabulary(predictor, path, chunksize)
+    print(f"Pass 1: vocabularies built from {rows:,} rows "
+          f"({', '.join(f'{c}: {len(le.classes_)}' for c, le in predictor.label_encoders.items())})")
+    # Defined once the vocabularies are known, so histogram boosting gets the categorical mask they allow
+    predictor.training_mode = 'streaming'
+    predictor.define_models()
+    regression_models = dict(predictor.regression_models)
+    classification_models = dict(predictor.classification_models)
+
+    # Pass 2: scaler, target statistics and reservoirs
+    capacity = max(1000, int(memory_budget_mb * 1024 * 1024 // ROW_BYTES))
+    train_sample = Reservoir(min(capacity, rows), len(FEATURE_COLS), rng)
+    holdout_sample = Reservoir(min(max_holdout_rows, rows), len(FEATURE_COLS), rng)
+    scaler = StandardScaler()
+    salary_sum, salary_sq, train_rows, salary_max = 0.0, 0.0, 0, 0
+    offset = 0
+    for chunk in _chunks(path, chunksize):
+        X = predictor.encode_features(chunk).to_numpy(dtype=np.float32)
+        salary = chunk['salary_in_usd'].to_numpy()
+        classes = salary_class_codes(salary, low, high)
+        holdout = _holdout_mask(offset, len(chunk), holdout_every)
+        offset += len(chunk)
+
+        train = ~holdout
+        if train.any():
+            scaler.partial_fit(X[train])
+            salary_sum += float(salary[train].sum())
+            salary_sq += float((salary[train].astype(np.float64) ** 2).sum())
+            train_rows += int(train.sum())
+            train_sample.add(X[train], salary[train], classes[train])
+        if holdout.any():
+            holdout_sample.add(X[holdout], salary[holdout], classes[holdout])
+        salary_max = max(salary_max, int(salary.max()))
+    salary_mean = salary_sum / train_rows
+    salary_std = np.sqrt(max(salary_sq / train_rows - salary_mean ** 2, 1.0))
+    print(f"Pass 2: {train_rows:,} training rows, reservoir of {train_sample.size:,} "
+          f"(~{train_sample.size * ROW_BYTES / 1024 / 1024:.0f} MB), holdout sample of {holdout_sample.size:,}")
+
+    # Passes 3+: incremental linear models on standardized features and targets
+    sgd_regressor = clone(regression_models['SGD Regressor'][-1])
+    sgd_classifier = clone(classification_models['SGD Classifier'][-1])
+    class_labels = np.array(sorted(SALARY_CLASSES), dtype=object)
+    for epoch in range(epochs):
+        offset = 0
+        for chunk in _chunks(path, chunksize):
+            train = ~_holdout_mask(offset, len(chunk), holdout_every)
+            offset += len(chunk)
+            if not train.any():
+                continue
+            order = rng.permutation(int(train.sum()))
+            X = scaler.transform(predictor.encode_features(chunk[train]).to_numpy(dtype=np.float32))[order]
+            salary = chunk['salary_in_usd'].to_numpy()[train][order]
+            labels = np.asarray(SALARY_CLASSES, dtype=object)[salary_class_codes(salary, low, high)]
+            sgd_regressor.partial_fit(X, (salary - salary_mean) / salary_std)
+            sgd_classifier.partial_fit(X, labels, classes=class_labels)
+        print(f"Pass {epoch + 3}: SGD epoch {epoch + 1}/{epochs} done")
+
+    # Undo the target standardization so the regressor predicts dollars directly
+    sgd_regressor.coef_ = sgd_regressor.coef_ * salary_std
+    sgd_regressor.intercept_ = sgd_regressor.intercept_ * salary_std + salary_mean
+
+    regression_models['SGD Regressor'] = make_pipeline(scaler, sgd_regressor)
+    classification_models['SGD Classifier'] = make_pipeline(scaler, sgd_classifier)
+
+    # Evaluate everything on the holdout sample; trees are fitted on the reservoir
+    predictor.X_train, predictor.y_train, predictor.y_train_class = train_sample.frames()
+    predictor.X_test, predictor.y_test, predictor.y_test_class = holdout_sample.frames()
+    predictor.scaler = scaler
+    predictor.salary_thresholds = {'Low': low, 'Medium': high, 'High': salary_max}
+
+    # SGD models were fitted by the passes above; the tree models are fitted here
+    for task, models, y_train, y_test, results in (
+            ('regression', regression_models, predictor.y_train, predictor.y_test, {}),
+            ('classification', classification_models, predictor.y_train_class, predictor.y_test_class, {})):
+        for name, model in models.items():
+            print(f"Evaluating {name}...")
+            if name.startswith('SGD'):
+                results[name] = evaluate_model(task, model, predictor.X_test, y_test)
+            else:
+                results[name] = fit_and_evaluate(task, model, predictor.X_train, y_train, predictor.X_test, y_test,
+                                                 predictor.instrumentation, name)
+            if task == 'regression':
+                print(f"  MAE: ${results[name]['MAE']:,.0f}, RMSE: ${results[name]['RMSE']:,.0f}, R²: {results[name]['R2']:.3f}")
+            else:
+                print(f"  Accuracy: {results[name]['Accuracy']:.3f}")
+        if task == 'regression':
+            predictor.regression_results = results
+        else:
+            predictor.classification_results = results
+
+    predictor.regression_models = regression_models
+    predictor.classification_models = classification_models
+    predictor.select_best_models()
+    print(f"\nStreaming training finished in {time.perf_counter() - start_time:.1f}s")
+    return predictor.regression_results, predictor.classification_results
+
+
+def main():
+    """Train the salary models on a CSV that does not fit in memory"""
+    parser = argparse.ArgumentParser(description='Out-of-core streaming training')
+    parser.add_argument('data', help='salary CSV with the ds_salaries.csv columns')
+    parser.add_argument('--chunksize', type=int, default=100000)
+    parser.add_argument('--memory-mb', type=float, default=256, help='memory budget of the tree-model sample')
+    parser.add_argument('--epochs', type=int, default=3, help='SGD passes over the data')
+    parser.add_argument('--artifacts', default='model_artifacts')
+    args = parser.parse_args()
+
+    predictor = SalaryPredictor(data_path=args.data, training_mode='streaming')
+    train_streaming(predictor, args.chunksize, args.memory_mb, args.epochs)
+    # Saved under the streaming key; prediction_server.py and model_export.py load it with --streamed
+    predictor.save_artifacts(ModelArtifactStore(args.artifacts))
+
+if __name__ == "__main__":
+    main()
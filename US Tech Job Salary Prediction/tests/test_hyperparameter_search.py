@@ -0,0 +1,40 @@
+import contextlib
+import io
+import os
+from sklearn.linear_model import Ridge
+from hyperparameter_search import TrialCache, search_hyperparameters
+from salary_data import MODEL_COLUMNS
+from salary_predictor import SalaryPredictor
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ds_salaries.csv')
+
+
+def test_trial_key_covers_the_row_subsample():
+    key = TrialCache.make_key(Ridge(), {'alpha': 1.0}, 'data', 200, 3, 'rows', 42)
+    assert key == TrialCache.make_key(Ridge(), {'alpha': 1.0}, 'data', 200, 3, 'rows', 42)
+    assert key != TrialCache.make_key(Ridge(), {'alpha': 1.0}, 'data', 200, 3, 'other rows', 42)
+    assert key != TrialCache.make_key(Ridge(), {'alpha': 1.0}, 'data', 200, 3, 'rows', 7)
+
+
+def search(predictor, cache, random_state):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        best = search_hyperparameters(predictor, ['Ridge Regression'], n_candidates=4, n_jobs=1,
+                                      cache_path=cache, random_state=random_state)
+    return best, output.getvalue()
+
+
+def test_search_reuses_trials_only_for_the_same_random_state(tmp_path):
+    predictor = SalaryPredictor(data_path=DATA, tuned_params_path=None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.load_and_explore_data(MODEL_COLUMNS)
+        predictor.create_salary_classification()
+        predictor.preprocess_data()
+        predictor.define_models()
+    cache = str(tmp_path / 'search_cache.jsonl')
+    first, _ = search(predictor, cache, 0)
+    again, output = search(predictor, cache, 0)
+    assert ' 0 new trials' in output and ' 0 from cache' not in output
+    assert again == first
+    _, output = search(predictor, cache, 1)
+    assert ' 0 new trials' not in output
@@ -0,0 +1,52 @@
+import contextlib
+import io
+import os
+import shutil
+import joblib
+import numpy as np
+import pandas as pd
+from model_store import ModelArtifactStore
+from salary_predictor import SalaryPredictor
+from incremental_refresh import refresh_models
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ds_salaries.csv')
+
+
+def append_rows(path, frame):
+    with open(path, 'a', newline='') as f:
+        frame.to_csv(f, header=False, index=False)
+
+
+def refresh(path, store, state, **options):
+    predictor = SalaryPredictor(data_path=path, tuned_params_path=None, kernel_approximation='all')
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        drifted = refresh_models(predictor, store, state, **options)
+    return predictor, drifted, output.getvalue()
+
+
+def test_refresh_warm_starts_histogram_boosting(tmp_path):
+    path = str(tmp_path / 'salaries.csv')
+    shutil.copy(DATA, path)
+    store = ModelArtifactStore(str(tmp_path / 'artifacts'))
+    state = str(tmp_path / 'refresh_state.joblib')
+    refresh(path, store, state)
+
+    # Every model counts as drifted with a negative threshold
+    rows = pd.read_csv(DATA).sample(200, random_state=0)
+    append_rows(path, rows)
+    fitted = joblib.load(state)['regression_models']['Hist Gradient Boosting'].n_iter_
+    predictor, drifted, output = refresh(path, store, state, drift_threshold=-1.0, add_estimators=5)
+    assert 'Hist Gradient Boosting' in drifted['regression']
+    assert '🔁 Hist Gradient Boosting: warm-started' in output
+    model = predictor.regression_models['Hist Gradient Boosting']
+    assert model.warm_start and model.max_iter == fitted + 5
+    assert fitted <= model.n_iter_ <= fitted + 5
+    assert set(predictor.X_train.dtypes) == {np.dtype(np.float32)}
+    assert set(predictor.X_test.dtypes) == {np.dtype(np.float32)}
+
+    # 3755 + 200 rows: the single appended row is held out, too few to score
+    append_rows(path, rows.head(1))
+    predictor, drifted, output = refresh(path, store, state, drift_threshold=-1.0)
+    assert 'drift check skipped' in output
+    assert drifted == {'regression': [], 'classification': []}
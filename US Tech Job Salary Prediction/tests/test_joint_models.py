@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+from joint_models import SalaryThresholdClassifier
+
+PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_unpickling_does_not_import_the_training_module():
+    code = "import joint_models, sys; print('salary_predictor' in sys.modules)"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=PROJECT).stdout
+    assert output.strip() == 'False'
+
+
+def test_fit_needs_every_salary_class():
+    X = np.arange(20, dtype=np.float64).reshape(-1, 1)
+    salaries = X[:, 0] * 10000
+    regressor = DecisionTreeRegressor().fit(X, salaries)
+    classifier = SalaryThresholdClassifier(regressor)
+    with pytest.raises(ValueError, match='missing'):
+        classifier.fit(X, np.where(salaries < 100000, 'Low', 'Medium'), low=100000, high=160000)
+
+    labels = np.array(['Low', 'Medium', 'High'], dtype=object)[[0] * 10 + [1] * 7 + [2] * 3]
+    classifier.fit(X, labels, low=100000, high=160000)
+    assert list(classifier.predict([[5], [12], [19]])) == ['Low', 'Medium', 'High']
@@ -0,0 +1,52 @@
+import asyncio
+from load_generator import run_load
+
+PROFILE = {'work_year': 2023, 'experience_level': 'SE', 'employment_type': 'FT', 'job_title': 'Data Scientist',
+           'employee_residence': 'US', 'remote_ratio': 0, 'company_location': 'US', 'company_size': 'M'}
+
+
+async def closing_server(reader, writer):
+    """Answer 200 on keep-alive, then close the connection after every second request with a 400"""
+    served = 0
+    try:
+        while True:
+            headers = {}
+            if not await reader.readline():
+                break
+            while (line := await reader.readline()) not in (b'\r\n', b''):
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+            await reader.readexactly(int(headers['content-length']))
+            served += 1
+            status, connection = ('200 OK', 'keep-alive') if served % 2 else ('400 Bad Request', 'close')
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Length: 2\r\nConnection: {connection}\r\n\r\n{{}}".encode())
+            await writer.drain()
+            if connection == 'close':
+                break
+    finally:
+        writer.close()
+
+
+def test_workers_reconnect_after_connection_close():
+    async def scenario():
+        server = await asyncio.start_server(closing_server, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await run_load('127.0.0.1', port, [PROFILE], concurrency=2, duration=0.3)
+
+    latencies, errors, _ = asyncio.run(scenario())
+    assert len(latencies) > 2
+    assert errors and all(error.startswith('HTTP/1.1 400') for error in errors)
+
+
+def test_failed_workers_are_reported_without_losing_results():
+    async def scenario():
+        server = await asyncio.start_server(closing_server, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        return await run_load('127.0.0.1', port, [PROFILE], concurrency=2, duration=0.1)
+
+    latencies, errors, _ = asyncio.run(scenario())
+    assert latencies == []
+    assert len(errors) == 2 and all(error.startswith('worker stopped') for error in errors)
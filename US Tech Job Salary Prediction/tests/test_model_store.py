@@ -0,0 +1,63 @@
+import contextlib
+import io
+import os
+import pandas as pd
+import model_store
+from model_store import ModelArtifactStore, file_digest
+from salary_data import MODEL_COLUMNS
+from salary_predictor import SalaryPredictor, FEATURE_COLS
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ds_salaries.csv')
+
+REGRESSORS = ['Ridge Regression', 'Hist Gradient Boosting']
+CLASSIFIERS = ['Logistic Regression', 'Hist Gradient Boosting Classifier']
+
+
+def define_small_zoo(predictor):
+    predictor.define_models()
+    predictor.regression_models = {name: predictor.regression_models[name] for name in REGRESSORS}
+    predictor.classification_models = {name: predictor.classification_models[name] for name in CLASSIFIERS}
+
+
+def test_high_cardinality_artifacts_load_on_a_fresh_predictor(tmp_path):
+    # 300 job titles is over the 254-label limit of native categorical splits
+    frame = pd.read_csv(DATA)
+    frame['job_title'] = [f'Title {i % 300}' for i in range(len(frame))]
+    path = str(tmp_path / 'salaries.csv')
+    frame.to_csv(path, index=False)
+    store = ModelArtifactStore(str(tmp_path / 'artifacts'))
+
+    predictor = SalaryPredictor(data_path=path, tuned_params_path=None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.load_and_explore_data(MODEL_COLUMNS)
+        predictor.create_salary_classification()
+        predictor.preprocess_data()
+        define_small_zoo(predictor)
+        mask = predictor.regression_models['Hist Gradient Boosting'].categorical_features
+        assert not mask[FEATURE_COLS.index('job_title_encoded')]
+        assert mask[FEATURE_COLS.index('company_location_encoded')]
+        predictor.train_all_models()
+        predictor.select_best_models('Hist Gradient Boosting', 'Hist Gradient Boosting Classifier')
+        key = predictor.save_artifacts(store)
+
+    fresh = SalaryPredictor(data_path=path, tuned_params_path=None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        define_small_zoo(fresh)
+        assert fresh.load_artifacts(store)
+    assert fresh.model_version == key
+    assert fresh.best_regression_name == 'Hist Gradient Boosting'
+
+
+def test_file_digest_is_reused_until_the_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / 'salaries.csv'
+    path.write_text('work_year,salary_in_usd\n2023,100000\n')
+    digest = file_digest(str(path))
+
+    def no_reads(*args, **kwargs):
+        raise AssertionError('the unchanged file was read again')
+    monkeypatch.setattr(model_store, 'open', no_reads, raising=False)
+    assert file_digest(str(path)) == digest
+
+    monkeypatch.undo()
+    path.write_text('work_year,salary_in_usd\n2023,100000\n2024,120000\n')
+    assert file_digest(str(path)) != digest
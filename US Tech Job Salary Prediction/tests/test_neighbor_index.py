@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from neighbor_index import IVFIndex, IVFNeighborsRegressor
+
+
+def _exact(X, Q, k):
+    d = ((Q[:, None, :] - X[None, :, :]) ** 2).sum(axis=2)
+    return np.sort(d, axis=1)[:, :k], np.argsort(d, axis=1, kind='stable')[:, :k]
+
+
+def test_probing_every_list_is_exact_search():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2000, 6)).astype(np.float32)
+    Q = rng.normal(size=(300, 6)).astype(np.float32)
+    index = IVFIndex(n_lists=40, random_state=0).build(X)
+    distances, indices = index.search(Q, 10, n_probe=40)
+    expected_d, expected_i = _exact(X, Q, 10)
+    np.testing.assert_allclose(distances ** 2, expected_d, rtol=1e-4, atol=1e-4)
+    assert np.mean(indices == expected_i) > 0.999
+
+
+def test_results_are_sorted_and_valid_with_small_probes():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(500, 3)).astype(np.float32)
+    index = IVFIndex(n_lists=50, random_state=0).build(X)
+    # Lists average 10 points, so k=25 forces the probe to widen
+    distances, indices = index.search(X[:50], 25, n_probe=1)
+    assert np.all(np.diff(distances, axis=1) >= 0)
+    assert np.all((indices >= 0) & (indices < len(X)))
+    assert all(len(set(row)) == 25 for row in indices)
+    # Every training point is its own nearest neighbour
+    np.testing.assert_array_equal(indices[:, 0], np.arange(50))
+
+
+def test_k_larger_than_the_index_is_rejected():
+    rng = np.random.default_rng(2)
+    model = IVFNeighborsRegressor(n_neighbors=5).fit(rng.normal(size=(3, 2)), np.arange(3.0))
+    with pytest.raises(ValueError):
+        model.predict(rng.normal(size=(2, 2)))
@@ -0,0 +1,60 @@
+import numpy as np
+import prediction_cache
+from prediction_cache import PredictionCache
+
+
+def _value(salary):
+    return np.float64(salary), 'Medium', np.array([0.2, 0.3, 0.5])
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = PredictionCache(max_size=2)
+    cache.put(('a',), _value(1), 'v1')
+    cache.put(('b',), _value(2), 'v1')
+    assert cache.get(('a',), 'v1') is not None  # 'a' is now the most recently used
+    cache.put(('c',), _value(3), 'v1')
+    assert cache.get(('b',), 'v1') is None
+    assert cache.get(('a',), 'v1')[0] == 1
+    assert cache.get(('c',), 'v1')[0] == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(prediction_cache.time, 'time', lambda: now[0])
+    cache = PredictionCache(ttl_seconds=60)
+    cache.put(('a',), _value(1), 'v1')
+    now[0] += 59
+    assert cache.get(('a',), 'v1') is not None
+    now[0] += 2
+    assert cache.get(('a',), 'v1') is None
+    assert cache.stats()['expirations'] == 1
+    assert len(cache) == 0
+
+
+def test_a_new_model_version_drops_every_entry():
+    cache = PredictionCache()
+    cache.put(('a',), _value(1), 'v1')
+    cache.put(('b',), _value(2), 'v1')
+    assert cache.get(('a',), 'v2') is None
+    assert len(cache) == 0
+    assert cache.stats()['invalidations'] == 1
+    cache.put(('a',), _value(3), 'v2')
+    assert cache.get(('a',), 'v2')[0] == 3
+
+
+def test_saved_entries_keep_their_order_and_version(tmp_path):
+    path = str(tmp_path / 'cache.json')
+    cache = PredictionCache(max_size=3, path=path)
+    for i, key in enumerate('abc'):
+        cache.put((key, 2023), _value(i), 'v1')
+    cache.get(('a', 2023), 'v1')
+    cache.save()
+
+    restored = PredictionCache(max_size=2, path=path)
+    # Only the two most recently used fit; 'b' was the least recently used
+    assert restored.get(('b', 2023), 'v1') is None
+    salary, label, probs = restored.get(('a', 2023), 'v1')
+    assert (salary, label) == (0, 'Medium')
+    np.testing.assert_allclose(probs, [0.2, 0.3, 0.5])
+    assert restored.get(('a', 2023), 'v2') is None
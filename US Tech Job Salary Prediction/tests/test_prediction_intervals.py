@@ -0,0 +1,73 @@
+import numpy as np
+from prediction_intervals import ConformalIntervals
+
+
+def _heteroscedastic(n, rng):
+    """Salaries whose errors grow with the predicted salary"""
+    predicted = rng.uniform(40000, 300000, n)
+    return predicted, predicted + rng.normal(0, 0.1 * predicted)
+
+
+def test_coverage_reaches_target_on_new_rows():
+    rng = np.random.default_rng(0)
+    intervals = ConformalIntervals.calibrate(*_heteroscedastic(2000, rng), coverage=0.9, n_bins=5)
+    assert intervals.coverage_on(*_heteroscedastic(20000, rng)) >= 0.89
+
+
+def test_bins_follow_the_error_scale():
+    rng = np.random.default_rng(1)
+    intervals = ConformalIntervals.calibrate(*_heteroscedastic(5000, rng), coverage=0.9, n_bins=5)
+    widths = intervals.upper_offsets - intervals.lower_offsets
+    assert len(widths) == 5
+    assert np.all(np.diff(widths) > 0)
+
+
+def test_edges_sit_between_distinct_predictions():
+    # Tree models repeat predictions; no prediction may coincide with an edge
+    rng = np.random.default_rng(2)
+    predicted = rng.choice([50000.0, 80000.0, 120000.0, 200000.0], size=1000)
+    actual = predicted + rng.normal(0, 10000, 1000)
+    intervals = ConformalIntervals.calibrate(predicted, actual, n_bins=4, min_bin_size=50)
+    assert np.all(np.diff(intervals.edges) > 0)
+    assert not np.isin(predicted, intervals.edges).any()
+    assert set(intervals.edges) <= {65000.0, 100000.0, 160000.0}
+
+
+def test_bins_need_min_bin_size_rows():
+    rng = np.random.default_rng(3)
+    intervals = ConformalIntervals.calibrate(*_heteroscedastic(120, rng), n_bins=5, min_bin_size=50)
+    assert len(intervals.edges) == 1
+    assert sum(intervals.bin_sizes) == 120
+
+
+def test_interval_is_clipped_at_zero_and_round_trips():
+    intervals = ConformalIntervals([100000.0], [-80000.0, -50000.0], [20000.0, 60000.0], 0.9)
+    low, high = intervals.interval([50000.0, 150000.0])
+    np.testing.assert_allclose(low, [0.0, 100000.0])
+    np.testing.assert_allclose(high, [70000.0, 210000.0])
+    restored = ConformalIntervals(**{k: v for k, v in intervals.to_dict().items()})
+    np.testing.assert_allclose(restored.interval([150000.0]), intervals.interval([150000.0]))
+
+
+def test_intervals_are_calibrated_on_rows_the_selection_did_not_see():
+    import contextlib
+    import io
+    import pandas as pd
+    from salary_predictor import SalaryPredictor
+    rng = np.random.default_rng(5)
+    actual = rng.uniform(40000, 300000, 1000)
+    even = np.arange(1000) % 2 == 0
+    # 'Lucky' is exact on the even rows and far off on the odd ones; 'Steady' is close everywhere
+    lucky = np.where(even, actual, actual + rng.normal(0, 50000, 1000))
+    steady = actual + rng.normal(0, 10000, 1000)
+    predictor = SalaryPredictor(tuned_params_path=None)
+    predictor.y_test = pd.Series(actual)
+    predictor.regression_results = {name: {'R2': 0.0, 'model': None, 'predictions': predictions}
+                                    for name, predictions in (('Lucky', lucky), ('Steady', steady))}
+    predictor.classification_results = {'Classifier': {'Accuracy': 1.0, 'model': None}}
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.select_best_models()
+    assert predictor.best_regression_name == 'Lucky'
+    assert sum(predictor.prediction_intervals.bin_sizes) == 500
+    # Calibrated on the odd rows, the intervals still cover them
+    assert predictor.prediction_intervals.coverage_on(lucky[~even], actual[~even]) >= 0.89
@@ -0,0 +1,41 @@
+import asyncio
+from types import SimpleNamespace
+import numpy as np
+from prediction_server import MicroBatcher
+
+
+class StubPredictor:
+    """Scores a frame of profiles, failing the whole call when any job title is 'Bad'"""
+    best_classification_model = SimpleNamespace(classes_=np.array(['High', 'Low', 'Medium']))
+
+    def __init__(self):
+        self.calls = []
+
+    def _predict_frame(self, frame):
+        self.calls.append(len(frame))
+        if (frame['job_title'] == 'Bad').any():
+            raise ValueError('cannot score job title Bad')
+        n = len(frame)
+        return np.full(n, 100000.0), np.array(['Low'] * n), np.tile([0.1, 0.8, 0.1], (n, 1))
+
+    def salary_interval(self, predicted_salary):
+        return None
+
+
+def test_one_bad_row_only_fails_its_own_request():
+    predictor = StubPredictor()
+
+    async def scenario():
+        batcher = MicroBatcher(predictor, max_batch_size=8, max_wait_ms=50)
+        task = asyncio.create_task(batcher.run())
+        try:
+            return await asyncio.gather(*(batcher.submit({'job_title': title}) for title in ('A', 'Bad', 'C')),
+                                        return_exceptions=True)
+        finally:
+            task.cancel()
+
+    good, bad, other = asyncio.run(scenario())
+    assert good['predicted_salary'] == other['predicted_salary'] == 100000.0
+    assert isinstance(bad, ValueError)
+    # One batched call, then one call per row
+    assert predictor.calls == [3, 1, 1, 1]
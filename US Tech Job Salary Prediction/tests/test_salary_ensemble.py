@@ -0,0 +1,60 @@
+import numpy as np
+from salary_ensemble import select_members, BlendedRegressor
+
+
+def _outputs(rng, n=2000):
+    y = rng.normal(100000, 30000, n)
+    noise_a, noise_b = rng.normal(0, 20000, n), rng.normal(0, 20000, n)
+    return y, {'a': y + noise_a, 'b': y + noise_b, 'bad': y + rng.normal(0, 80000, n)}
+
+
+def test_independent_errors_are_blended_equally():
+    rng = np.random.default_rng(0)
+    y, outputs = _outputs(rng)
+    weights, contributions = select_members('regression', outputs, y, {'a': 1, 'b': 1, 'bad': 1})
+    assert set(weights) == {'a', 'b'}
+    assert abs(weights['a'] - 0.5) < 0.15
+    assert abs(sum(weights.values()) - 1) < 1e-12
+    assert all(c >= 0.001 for c in contributions.values())
+
+
+def test_a_perfect_model_is_used_alone():
+    rng = np.random.default_rng(1)
+    y, outputs = _outputs(rng)
+    outputs['perfect'] = y.copy()
+    weights, _ = select_members('regression', outputs, y, dict.fromkeys(outputs, 1.0))
+    assert weights == {'perfect': 1.0}
+
+
+def test_latency_budget_and_member_limit_are_respected():
+    rng = np.random.default_rng(2)
+    y, outputs = _outputs(rng)
+    latencies = {'a': 2.0, 'b': 2.0, 'bad': 0.5}
+    weights, _ = select_members('regression', outputs, y, latencies, latency_budget_ms=3.0)
+    assert sum(latencies[name] for name in weights) <= 3.0
+    weights, _ = select_members('regression', outputs, y, latencies, max_members=1)
+    assert len(weights) == 1
+
+
+def test_classification_blends_probabilities():
+    rng = np.random.default_rng(3)
+    classes = np.array(['High', 'Low', 'Medium'], dtype=object)
+    codes = rng.integers(0, 3, 1000)
+    y = classes[codes]
+    truth = np.eye(3)[codes]
+    outputs = {'good': 0.6 * truth + 0.4 * rng.dirichlet(np.ones(3), 1000),
+               'random': rng.dirichlet(np.ones(3), 1000)}
+    weights, _ = select_members('classification', outputs, y, {'good': 1, 'random': 1}, classes)
+    assert weights == {'good': 1.0}
+
+
+def test_blended_regressor_averages_member_predictions():
+    class Constant:
+        def __init__(self, value):
+            self.value = value
+
+        def predict(self, X):
+            return np.full(len(X), self.value)
+
+    model = BlendedRegressor([('Random Forest', Constant(100.0)), ('Gradient Boosting', Constant(200.0))], [0.25, 0.75])
+    np.testing.assert_allclose(model.predict(np.zeros((3, 2))), 175.0)
@@ -0,0 +1,79 @@
+import contextlib
+import io
+import os
+import numpy as np
+import pytest
+from salary_data import MODEL_COLUMNS, load_salaries
+from salary_predictor import SalaryPredictor, INPUT_COLS
+from model_export import export_runtime
+from salary_runtime import SalaryRuntime
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ds_salaries.csv')
+
+REGRESSORS = ['Ridge Regression', 'Decision Tree', 'Random Forest', 'Gradient Boosting', 'Hist Gradient Boosting']
+CLASSIFIERS = ['Logistic Regression', 'Decision Tree Classifier', 'Random Forest Classifier',
+               'Hist Gradient Boosting Classifier']
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    predictor = SalaryPredictor(data_path=DATA, tuned_params_path=None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.load_and_explore_data(MODEL_COLUMNS)
+        predictor.create_salary_classification()
+        predictor.preprocess_data()
+        predictor.define_models()
+        predictor.regression_models = {name: predictor.regression_models[name] for name in REGRESSORS}
+        predictor.classification_models = {name: predictor.classification_models[name] for name in CLASSIFIERS}
+        for models in (predictor.regression_models, predictor.classification_models):
+            for model in models.values():
+                if 'n_estimators' in model.get_params():
+                    model.set_params(n_estimators=20)
+        predictor.train_all_models()
+    return predictor
+
+
+@pytest.mark.parametrize('regressor, classifier', list(zip(REGRESSORS, CLASSIFIERS + CLASSIFIERS[-1:])))
+def test_runtime_matches_the_predictor(predictor, regressor, classifier, tmp_path):
+    with contextlib.redirect_stdout(io.StringIO()):
+        predictor.select_best_models(regressor, classifier)
+    path = export_runtime(predictor, str(tmp_path / 'runtime.npz'))
+    runtime = SalaryRuntime(path)
+
+    profiles = load_salaries(DATA, INPUT_COLS).head(500).astype(object)
+    # An unseen job title takes the encoder's default value in both
+    profiles.loc[profiles.index[0], 'job_title'] = 'Chief Salary Officer'
+    salaries, classes, probabilities = predictor._predict_frame(profiles)
+    results = runtime.predict_many(profiles.to_dict('records'))
+
+    np.testing.assert_allclose([r['predicted_salary'] for r in results], salaries, rtol=1e-9, atol=1e-6)
+    assert [r['predicted_class'] for r in results] == [str(c) for c in classes]
+    order = [str(c) for c in predictor.best_classification_model.classes_]
+    np.testing.assert_allclose([[r['class_probabilities'][c] for c in order] for r in results], probabilities,
+                               atol=1e-9)
+    low, high = predictor.prediction_intervals.interval(salaries)
+    np.testing.assert_allclose([r['salary_interval'] for r in results], np.column_stack([low, high]), atol=1e-6)
+
+
+@pytest.mark.parametrize('task', ['regression', 'binary', 'multiclass'])
+def test_histogram_boosting_categorical_splits_compile_exactly(task):
+    from sklearn.ensemble import HistGradientBoostingRegressor, HistGradientBoostingClassifier
+    from model_export import compile_model
+    from salary_runtime import CompiledModel
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, 40, 3000)
+    codes = codes[codes != 5]
+    X = np.column_stack([rng.random(len(codes)), codes, rng.integers(0, 4, len(codes))]).astype(np.float64)
+    salary = (codes % 7) * 5 + 3 * X[:, 0] + rng.random(len(codes))
+    if task == 'regression':
+        model = HistGradientBoostingRegressor(categorical_features=[False, True, False], max_iter=50).fit(X, salary)
+        expected = model.predict
+    else:
+        labels = codes % 3 == 0 if task == 'binary' else np.array(['High', 'Low', 'Medium'])[codes % 3]
+        model = HistGradientBoostingClassifier(categorical_features=[False, True, True], max_iter=50).fit(X, labels)
+        expected = model.predict_proba
+    # Code 5 was never seen, -1 is the unseen-label code, and NaN, fractions and huge codes are missing too
+    queries = np.vstack([X[:300], [[0.5, 5, 1], [0.5, -1, 2], [0.5, np.nan, 1], [0.5, 300, 1], [0.5, 2.5, 0]]])
+    compiled = CompiledModel(*compile_model('Hist Gradient Boosting', model, None))
+    output = compiled.predict(queries)
+    np.testing.assert_allclose(output[:, 0] if task == 'regression' else output, expected(queries), atol=1e-9)
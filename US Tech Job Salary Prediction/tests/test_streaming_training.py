@@ -0,0 +1,35 @@
+import contextlib
+import io
+import os
+import pandas as pd
+from model_store import ModelArtifactStore
+from salary_predictor import SalaryPredictor, FEATURE_COLS
+from streaming_training import train_streaming
+
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ds_salaries.csv')
+
+
+def test_streaming_fits_histogram_boosting_over_the_category_limit(tmp_path):
+    # 300 job titles is over the 254-label limit of native categorical splits
+    frame = pd.read_csv(DATA)
+    frame['job_title'] = [f'Title {i % 300}' for i in range(len(frame))]
+    path = str(tmp_path / 'salaries_feed.csv')
+    frame.to_csv(path, index=False)
+    store = ModelArtifactStore(str(tmp_path / 'artifacts'))
+
+    predictor = SalaryPredictor(data_path=path, tuned_params_path=None, training_mode='streaming')
+    with contextlib.redirect_stdout(io.StringIO()):
+        regression_results, classification_results = train_streaming(predictor, chunksize=1000, epochs=1)
+        key = predictor.save_artifacts(store)
+    model = predictor.regression_models['Hist Gradient Boosting']
+    assert not model.categorical_features[FEATURE_COLS.index('job_title_encoded')]
+    assert model.n_iter_ > 0
+    assert {'SGD Regressor', 'Hist Gradient Boosting'} <= set(regression_results)
+    assert {'SGD Classifier', 'Hist Gradient Boosting Classifier'} <= set(classification_results)
+
+    # Only a predictor that asks for streamed models loads them
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert not SalaryPredictor(data_path=path, tuned_params_path=None).load_artifacts(store)
+        streamed = SalaryPredictor(data_path=path, tuned_params_path=None, training_mode='streaming')
+        assert streamed.load_artifacts(store)
+    assert streamed.model_version == key